@@ -1,9 +1,18 @@
 # backend/app.py
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import DB and models
-from db import Base, engine
+from db import Base, async_engine, pool_status
+from cache import report_cache
+from auth.dependencies import require_role
+from auth.principals import principal_cache
+from auth.jwt_handler import token_cache
+from auth.hashing import HashPoolBusy, hash_pool
+from auth.revocation import revocation_list
+from pagination import NEXT_CURSOR_HEADER
+from crud import search as crud_search
 import models  # ensure models are imported so tables are registered
 
 # Import routes
@@ -45,14 +54,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 
 # ===== Database Init =====
 @app.on_event("startup")
-def on_startup():
-    """Create database tables if they don't exist."""
-    Base.metadata.create_all(bind=engine)
+async def on_startup():
+    """Create database tables (and the product search index) if they don't exist."""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(crud_search.ensure_search_index)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Stop the password hashing pool."""
+    hash_pool.shutdown()
+
+
+# ===== Errors =====
+@app.exception_handler(HashPoolBusy)
+async def hash_pool_busy(request: Request, exc: HashPoolBusy):
+    """Login storm backpressure: shed load instead of queueing without bound."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
 
 
 # ===== Register Routers =====
@@ -71,7 +100,7 @@ app.include_router(reports.router, prefix=api_prefix)
 
 # ===== Root Health Check =====
 @app.get("/", tags=["Health"])
-def root():
+async def root():
     return {
         "status": "ok",
         "message": "Inventory Management System API is running 🚀",
@@ -79,3 +108,30 @@ def root():
         "redoc_url": "/api/v1/redoc",
         "version": "1.0.0",
     }
+
+
+# Internals (pool sizes, cache and revocation counters): employer only
+@app.get("/health/db", tags=["Health"])
+async def db_health(current_user=Depends(require_role(["employer"]))):
+    """Database engine + connection pool statistics. Roles: Employer only."""
+    return pool_status()
+
+
+@app.get("/health/cache", tags=["Health"])
+async def cache_health(current_user=Depends(require_role(["employer"]))):
+    """Report cache size and hit / miss / coalesced counters. Roles: Employer only."""
+    return report_cache.stats()
+
+
+@app.get("/health/auth", tags=["Health"])
+async def auth_health(current_user=Depends(require_role(["employer"]))):
+    """
+    Principal / verified-token caches, token revocation list and password hashing pool backpressure.
+    Roles: Employer only.
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "revocations": revocation_list.stats(),
+        "hash_pool": hash_pool.stats(),
+    }
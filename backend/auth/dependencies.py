@@ -1,23 +1,43 @@
 # backend/auth/dependencies.py
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 import models
 from db import get_db
 from auth.jwt_handler import decode_access_token
+from auth.principals import AUTH_TRUST_JWT_ROLE, Principal, principal_cache
+from auth.revocation import revocation_list
 
 # OAuth2 scheme → expects "Authorization: Bearer <token>"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+# ===== Principal lookup =====
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """Principal for an employee id: principal cache first, then one PK read."""
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        generation = principal_cache.generation()
+        employee = await db.get(models.Employee, user_id)
+        if employee is None:
+            return None
+        principal = Principal.from_employee(employee)
+        principal_cache.put(principal, generation)
+    return principal
+
+
 # ===== Strict: Require a valid token =====
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> models.Employee:
-    """Extract and validate the current user from a JWT access token."""
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """
+    Extract and validate the current user from a JWT access token.
+    Revoked tokens are rejected from the in-memory revocation list. No DB
+    round-trip on a principal cache hit, or with AUTH_TRUST_JWT_ROLE (opt-in).
+    """
     try:
         payload = decode_access_token(token)
     except Exception:
@@ -27,15 +47,25 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    await revocation_list.sync(db)
+    if revocation_list.is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     user_id: int = payload.get("sub") if payload else None
-    if user_id is None:
+    if user_id is None or not str(user_id).isdigit():
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(models.Employee).filter(models.Employee.id == user_id).first()
+    user = Principal.from_claims(int(user_id), payload) if AUTH_TRUST_JWT_ROLE else None
+    if user is None:
+        user = await load_principal(db, int(user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,10 +84,10 @@ def get_current_user(
 
 
 # ===== Optional: Return None if no/invalid token =====
-def get_current_user_optional(
+async def get_current_user_optional(
     request: Request,
-    db: Session = Depends(get_db),
-) -> Optional[models.Employee]:
+    db: AsyncSession = Depends(get_db),
+) -> Optional[Principal]:
     """
     Return user if token is valid, else None (used for bootstrap employer).
     Unlike get_current_user, this does NOT force 401 when missing.
@@ -73,7 +103,11 @@ def get_current_user_optional(
     except Exception:
         return None
 
-    return db.query(models.Employee).filter(models.Employee.id == user_id).first()
+    await revocation_list.sync(db)
+    if revocation_list.is_revoked(payload):
+        return None
+
+    return await load_principal(db, user_id)
 
 
 # ===== Require Role =====
@@ -82,7 +116,7 @@ def require_role(required_roles: List[str]):
     Dependency to restrict access based on employee role.
     Example: current_user=Depends(require_role(["employer", "manager"]))
     """
-    def role_checker(current_user: models.Employee = Depends(get_current_user)):
+    async def role_checker(current_user: Principal = Depends(get_current_user)):
         if current_user.role.value not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1,4 +1,10 @@
 # backend/auth/hashing.py
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
 # Configure bcrypt with explicit rounds
@@ -19,3 +25,114 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     - Returns True if match, False otherwise.
     """
     return _pwd_context.verify(plain_password, hashed_password)
+
+
+# ===== Dedicated hashing pool =====
+# bcrypt is ~250 ms of CPU: run it on its own small executor, never on the
+# shared threadpool the rest of the API depends on.
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+AUTH_HASH_QUEUE_LIMIT = int(os.getenv("AUTH_HASH_QUEUE_LIMIT", "32"))      # waiting jobs before 503
+AUTH_HASH_EXECUTOR = os.getenv("AUTH_HASH_EXECUTOR", "thread").lower()      # "thread" | "process"
+
+
+class HashPoolBusy(RuntimeError):
+    """The hashing queue is full (mapped to 503 + Retry-After)."""
+
+
+def _timed(fn, *args):
+    """Runs in the worker: result + pure service time (queue wait excluded)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class HashPool:
+    """
+    Bounded executor for password hashing with backpressure.
+    - At most `workers` hashes run at once; up to `queue_limit` more wait.
+    - Beyond that, run() raises HashPoolBusy instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int = AUTH_HASH_WORKERS, queue_limit: int = AUTH_HASH_QUEUE_LIMIT,
+                 kind: str = AUTH_HASH_EXECUTOR):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.kind = kind
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = self.peak = self.completed = self.rejected = 0
+        self.wait_seconds = self.service_seconds = 0.0
+
+    def _get_executor(self):
+        # Created lazily: a process pool must not be forked at import time
+        if self._executor is None:
+            executor_class = ProcessPoolExecutor if self.kind == "process" else ThreadPoolExecutor
+            self._executor = executor_class(max_workers=self.workers)
+        return self._executor
+
+    async def run(self, fn, *args):
+        """
+        Hash on the pool. The slot is freed when the job itself finishes (done
+        callback), not when the awaiting request does: a cancelled request
+        (client gone) leaves its hash running, and it still counts.
+        """
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise HashPoolBusy("Too many concurrent logins, please retry")
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        submitted = time.perf_counter()
+        try:
+            future = self._get_executor().submit(_timed, fn, *args)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(lambda done: self._finished(done, submitted))
+        result, _ = await asyncio.wrap_future(future)
+        return result
+
+    def _finished(self, future, submitted: float):
+        """Done callback (worker or caller thread): release the slot, record timings."""
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            _, service = future.result()
+            self.completed += 1
+            self.service_seconds += service
+            self.wait_seconds += max(0.0, time.perf_counter() - submitted - service)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        done = self.completed or 1
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "peak_in_flight": self.peak,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_seconds / done * 1000, 1),
+            "avg_hash_ms": round(self.service_seconds / done * 1000, 1),
+        }
+
+
+hash_pool = HashPool()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool (raises HashPoolBusy when saturated)."""
+    return await hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the hashing pool (raises HashPoolBusy when saturated)."""
+    return await hash_pool.run(get_password_hash, password)
@@ -1,4 +1,8 @@
 import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from dotenv import load_dotenv
@@ -10,6 +14,7 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))  # 0 disables the verified-token cache
 
 if not SECRET_KEY:
     raise RuntimeError(
@@ -22,13 +27,67 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     expire = datetime.utcnow() + (
         expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
+    # jti / iat make the token revocable (auth/revocation.py); iat keeps
+    # sub-second precision so a revocation never hits a token issued after it
+    to_encode.update({"exp": expire, "iat": time.time(), "jti": secrets.token_hex(16)})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# ===== VERIFIED-TOKEN CACHE =====
+class TokenCache:
+    """
+    LRU of token -> verified payload. Tills reuse one token for its whole
+    lifetime, so signature checks + claim parsing run once per token instead
+    of once per request. Entries are dropped once the token's `exp` passes;
+    only successfully verified tokens are stored.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # token -> (exp timestamp, payload)
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, token: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry and entry[0] > time.time():
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return dict(entry[1])  # callers may mutate their copy
+            if entry:
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, payload: dict):
+        exp = payload.get("exp")
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[token] = (exp, dict(payload))
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache()
+
+
 # ===== DECODE TOKEN =====
 def decode_access_token(token: str):
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError as e:
         raise ValueError(f"Invalid token: {str(e)}")
+    token_cache.put(token, payload)
+    return payload
@@ -0,0 +1,106 @@
+# backend/auth/principals.py
+"""
+Principal cache for get_current_user.
+
+Resolving a token used to cost a SELECT on employees per request. The fields
+require_role needs (id, role, status) are kept in a bounded LRU + TTL cache
+keyed by employee id; update_employee / delete_employee invalidate entries.
+
+AUTH_TRUST_JWT_ROLE=true (opt-in, default false) skips the lookup entirely and
+trusts the role claim signed into the token: role changes, deactivation and
+deletes revoke the employee's tokens (auth/revocation.py), so they still take
+effect within REVOCATION_SYNC_SECONDS on other workers. Tokens without a valid
+role claim fall back to the lookup.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import models
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+AUTH_TRUST_JWT_ROLE = os.getenv("AUTH_TRUST_JWT_ROLE", "false").lower() == "true"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller (what routes see as `current_user`)."""
+    id: int
+    role: models.EmployeeRole
+    status: str = "active"
+    name: str | None = None  # None when built from token claims
+
+    @classmethod
+    def from_employee(cls, employee: models.Employee) -> "Principal":
+        return cls(id=employee.id, role=employee.role, status=employee.status, name=employee.name)
+
+    @classmethod
+    def from_claims(cls, user_id: int, payload: dict) -> "Principal | None":
+        """Principal from a trusted token, or None if it carries no valid role claim."""
+        try:
+            return cls(id=user_id, role=models.EmployeeRole(payload.get("role")))
+        except ValueError:
+            return None
+
+
+class PrincipalCache:
+    def __init__(self, maxsize: int = PRINCIPAL_CACHE_SIZE, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # employee id -> (expires_at, Principal)
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by invalidate(): a lookup racing a write must not be cached
+        self.hits = self.misses = 0
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, employee_id: int) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(employee_id)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(employee_id)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[employee_id]
+            self.misses += 1
+            return None
+
+    def put(self, principal: Principal, generation: int | None = None):
+        """Cache `principal`, unless an invalidation happened since `generation` was read."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, employee_id: int):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(employee_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "trust_jwt_role": AUTH_TRUST_JWT_ROLE,
+        }
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,96 @@
+# backend/auth/revocation.py
+"""
+In-memory access-token revocation list.
+
+token_revocations (crud/revocation.py) is small: a row only lives as long as
+the tokens it covers. Each worker keeps a copy and checks it after the
+(cached) token decode, so get_current_user needs no per-request status read:
+- reloaded at most every REVOCATION_SYNC_SECONDS (one query, not one per request);
+- marked stale by any local commit writing the table, so revocations made
+  by this worker apply on its next request. Other workers (and manage.py)
+  catch up within REVOCATION_SYNC_SECONDS.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import models
+from db import run_sync
+from crud import revocation as crud_revocation
+from crud import versions as crud_versions
+
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "2"))
+REVOCATIONS_TABLE = models.TokenRevocation.__tablename__
+
+
+def _epoch(value: datetime) -> float:
+    """Naive UTC datetime (as stored) -> POSIX timestamp, comparable with `iat`."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationList:
+    def __init__(self, sync_interval: float = REVOCATION_SYNC_SECONDS):
+        self.sync_interval = sync_interval
+        self._jtis = {}       # jti -> expires_at
+        self._employees = {}  # str(employee id), as in `sub` -> latest issued_before
+        self._synced_at = None  # monotonic time of the last reload; None forces one
+        self._lock = threading.Lock()
+        self.syncs = 0
+
+    def due(self) -> bool:
+        return self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_interval
+
+    def mark_stale(self):
+        self._synced_at = None
+
+    def on_commit(self, tables: set):
+        if REVOCATIONS_TABLE in tables:
+            self.mark_stale()
+
+    def load(self, rows):
+        """Replace the list with `rows` of (employee_id, jti, issued_before, expires_at)."""
+        jtis, employees = {}, {}
+        for employee_id, jti, issued_before, expires_at in rows:
+            if jti:
+                jtis[jti] = _epoch(expires_at)
+            if issued_before is not None:
+                key = str(employee_id)
+                employees[key] = max(employees.get(key, 0.0), _epoch(issued_before))
+        with self._lock:
+            self._jtis, self._employees = jtis, employees
+            self.syncs += 1
+
+    async def sync(self, db):
+        """Reload from the table if due; a no-op on most requests."""
+        if not self.due():
+            return
+        self._synced_at = time.monotonic()  # concurrent requests keep using the current copy
+        try:
+            rows = await run_sync(db, crud_revocation.active_revocations)
+        except Exception:
+            self._synced_at = None
+            raise
+        self.load(rows)
+
+    def is_revoked(self, payload: dict) -> bool:
+        jti = payload.get("jti")
+        if jti and jti in self._jtis:
+            return True
+        issued_before = self._employees.get(str(payload.get("sub")))
+        if issued_before is None:
+            return False
+        iat = payload.get("iat")
+        return not isinstance(iat, (int, float)) or iat < issued_before  # no iat: a pre-revocation token
+
+    def stats(self) -> dict:
+        return {
+            "tokens": len(self._jtis),
+            "employees": len(self._employees),
+            "sync_interval_seconds": self.sync_interval,
+            "syncs": self.syncs,
+        }
+
+
+revocation_list = RevocationList()
+crud_versions.commit_hooks.append(revocation_list.on_commit)
@@ -1,31 +1,45 @@
 # backend/auth/routes.py
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 
-from db import get_db
+from db import get_db, run_sync
 import models
-from auth.hashing import verify_password
-from auth.jwt_handler import create_access_token
-from auth.schemas import Token
+from crud import employee as crud_employee
+from crud import refresh_token as crud_refresh
+from crud import revocation as crud_revocation
+from auth.dependencies import get_current_user, oauth2_scheme
+from auth.hashing import verify_password_async
+from auth.jwt_handler import create_access_token, decode_access_token
+from auth.principals import Principal
+from auth.schemas import LogoutRequest, RefreshRequest, Token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+async def issue_tokens(db: AsyncSession, user: models.Employee) -> dict:
+    """Access token + a new refresh token family (real sign-in only)."""
+    refresh_token = await run_sync(db, crud_refresh.issue_refresh_token, user.id)
+    token = create_access_token({"sub": str(user.id), "role": user.role.value})
+    return {"access_token": token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
 # ---------- OAuth2PasswordRequestForm ----------
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Login using OAuth2PasswordRequestForm.
-    - Username field maps to employee.name
+    - Username field maps to employee.name (case- and whitespace-insensitive)
     """
-    user = db.query(models.Employee).filter(models.Employee.name == form_data.username).first()
+    user = await run_sync(db, crud_employee.get_employee_by_login, form_data.username)
 
-    if not user or not verify_password(form_data.password, user.password_hash or ""):
+    # bcrypt is CPU-bound → dedicated bounded pool (503 when saturated)
+    if not user or not await verify_password_async(form_data.password, user.password_hash or ""):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
@@ -38,8 +52,7 @@ def login(
             detail="This account is inactive.",
         )
 
-    token = create_access_token({"sub": str(user.id), "role": user.role.value})
-    return {"access_token": token, "token_type": "bearer"}
+    return await issue_tokens(db, user)
 
 
 # ---------- JSON Login ----------
@@ -49,14 +62,14 @@ class LoginJSON(BaseModel):
 
 
 @router.post("/login-json", response_model=Token)
-def login_json(data: LoginJSON, db: Session = Depends(get_db)):
+async def login_json(data: LoginJSON, db: AsyncSession = Depends(get_db)):
     """
     Login using JSON body.
-    - Accepts name as username + password.
+    - Accepts name as username + password (case- and whitespace-insensitive).
     """
-    user = db.query(models.Employee).filter(models.Employee.name == data.username).first()
+    user = await run_sync(db, crud_employee.get_employee_by_login, data.username)
 
-    if not user or not verify_password(data.password, user.password_hash or ""):
+    if not user or not await verify_password_async(data.password, user.password_hash or ""):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
@@ -69,5 +82,46 @@ def login_json(data: LoginJSON, db: Session = Depends(get_db)):
             detail="This account is inactive.",
         )
 
+    return await issue_tokens(db, user)
+
+
+# ---------- Refresh ----------
+@router.post("/refresh", response_model=Token)
+async def refresh(data: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Renew an access token without a password (no bcrypt).
+    - The refresh token is single use: the response carries its replacement.
+    - Re-using a spent token signs out every session of that login.
+    """
+    try:
+        user, refresh_token = await run_sync(db, crud_refresh.rotate_refresh_token, data.refresh_token)
+    except crud_refresh.RefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     token = create_access_token({"sub": str(user.id), "role": user.role.value})
-    return {"access_token": token, "token_type": "bearer"}
+    return {"access_token": token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+# ---------- Logout ----------
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    data: LogoutRequest | None = None,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Revoke the presented access token at once (every worker within seconds).
+    - refresh_token: also revoke that sign-in's refresh tokens
+    - all_sessions: sign out every session of the caller
+    """
+    data = data or LogoutRequest()
+    payload = decode_access_token(token)  # verified by get_current_user (cache hit)
+    await run_sync(
+        db, crud_revocation.logout, current_user.id, payload.get("jti"),
+        datetime.utcfromtimestamp(payload["exp"]), data.refresh_token, data.all_sessions,
+    )
+    return {"ok": True}
@@ -6,6 +6,18 @@ class Token(BaseModel):
     """Response schema for access tokens."""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: str | None = None  # single use: POST /auth/refresh returns a new one
+
+
+class RefreshRequest(BaseModel):
+    """Body for /auth/refresh."""
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """Body for /auth/logout (optional)."""
+    refresh_token: str | None = None  # also revoke this sign-in's refresh tokens
+    all_sessions: bool = False        # sign out on every device
 
 
 class TokenData(BaseModel):
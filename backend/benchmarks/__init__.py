@@ -0,0 +1,15 @@
+# backend/benchmarks/__init__.py
+"""
+Timing scripts. Each builds its own throwaway SQLite database and prints
+numbers; none of them passes or fails. Correctness and regression guards
+(N+1 query counts, index usage, report totals, auth caches, search) are
+pytest tests in tests/.
+
+Usage (from backend/):
+    python -m benchmarks.reports       # report latency on 1M synthetic sales (target: 100 ms)
+    python -m benchmarks.search        # product search, FTS5 vs. LIKE scan (target: 20 ms)
+    python -m benchmarks.auth          # per-request auth cost, caches off vs. warm
+    python -m benchmarks.login_storm   # /sales/ latency during a bcrypt login storm
+
+Pass --help to any of them for the dataset size options.
+"""
@@ -0,0 +1,94 @@
+# backend/benchmarks/auth.py
+"""
+Per-request authentication overhead, with and without the auth caches.
+
+Times, per call:
+- decode_access_token: HMAC verification + claim parsing vs. a token-cache hit;
+- get_current_user: the whole dependency with both caches off vs. warm, in
+  lookup mode (AUTH_TRUST_JWT_ROLE=false: principal cache, else one SELECT on
+  employees) and in trusted mode (role claim + in-memory revocation list).
+
+Usage (from backend/):
+    python -m benchmarks.auth
+    python -m benchmarks.auth --requests 20000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+
+_tmp = tempfile.mkdtemp(prefix="ims-auth-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/ims.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models  # noqa: E402
+from db import AsyncSessionLocal, Base, SessionLocal, async_engine, engine  # noqa: E402
+from auth import dependencies  # noqa: E402
+from auth.dependencies import get_current_user  # noqa: E402
+from auth.jwt_handler import create_access_token, decode_access_token, token_cache  # noqa: E402
+from auth.principals import principal_cache  # noqa: E402
+
+
+def seed() -> str:
+    db = SessionLocal()
+    boss = models.Employee(name="Boss", role=models.EmployeeRole.employer, phone="0700000000", password_hash="x")
+    db.add(boss)
+    db.commit()
+    token = create_access_token({"sub": str(boss.id), "role": boss.role.value})
+    db.close()
+    return token
+
+
+def set_caches(enabled: bool):
+    token_cache.clear()
+    principal_cache.clear()
+    token_cache.maxsize = 4096 if enabled else 0
+    principal_cache.maxsize = 1024 if enabled else 0
+
+
+def time_decode(token: str, n: int) -> float:
+    start = timer.perf_counter()
+    for _ in range(n):
+        decode_access_token(token)
+    return (timer.perf_counter() - start) / n * 1e6
+
+
+async def time_dependency(token: str, n: int) -> float:
+    async with AsyncSessionLocal() as db:
+        await get_current_user(token, db)  # warm up (connection, caches)
+        start = timer.perf_counter()
+        for _ in range(n):
+            await get_current_user(token, db)
+            db.expunge_all()  # a fresh request session has an empty identity map
+        return (timer.perf_counter() - start) / n * 1e6
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    token = seed()
+
+    results = {}
+    for label, enabled in (("uncached", False), ("cached", True)):
+        set_caches(enabled)
+        results[label] = [time_decode(token, args.requests)]
+        for trusted in (False, True):
+            dependencies.AUTH_TRUST_JWT_ROLE = trusted
+            results[label].append(await time_dependency(token, args.requests))
+
+    print(f"{'':<28} {'uncached':>12} {'cached':>12} {'speedup':>9}")
+    for i, name in enumerate(("decode_access_token", "get_current_user (lookup)", "get_current_user (trusted)")):
+        before, after = results["uncached"][i], results["cached"][i]
+        print(f"{name:<28} {before:9.1f} µs {after:9.1f} µs {before / after:8.1f}x")
+
+    await async_engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
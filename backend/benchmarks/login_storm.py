@@ -0,0 +1,118 @@
+# backend/benchmarks/login_storm.py
+"""
+Login storm vs. /sales latency.
+
+Fires N concurrent logins (12-round bcrypt each) while probing GET /sales/,
+and reports the probe latency next to a no-storm baseline. Run twice:
+- "unbounded": hashing pool as wide as the old shared threadpool (40);
+- "bounded":   the configured AUTH_HASH_WORKERS / AUTH_HASH_QUEUE_LIMIT.
+
+Usage (from backend/):
+    python -m benchmarks.login_storm
+    python -m benchmarks.login_storm --logins 60
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+
+_tmp = tempfile.mkdtemp(prefix="ims-storm-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/ims.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+import models  # noqa: E402
+from app import app  # noqa: E402
+from db import Base, SessionLocal, async_engine, engine  # noqa: E402
+from auth.hashing import HashPool, get_password_hash  # noqa: E402
+from auth import hashing  # noqa: E402
+from auth.jwt_handler import create_access_token  # noqa: E402
+
+PASSWORD = "secret123"
+OLD_THREADPOOL_SIZE = 40  # anyio's default run_in_threadpool limit
+
+
+def seed(cashiers: int) -> str:
+    db = SessionLocal()
+    password_hash = get_password_hash(PASSWORD)
+    boss = models.Employee(name="Boss", role=models.EmployeeRole.employer, phone="0700000000",
+                           password_hash=password_hash)
+    db.add(boss)
+    db.add_all(
+        models.Employee(name=f"cashier{i}", role=models.EmployeeRole.employee, phone=f"071{i:07d}",
+                        password_hash=password_hash)
+        for i in range(cashiers)
+    )
+    db.commit()
+    token = create_access_token({"sub": str(boss.id), "role": "employer"})
+    db.close()
+    return token
+
+
+def percentile(samples: list, pct: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))] if samples else 0.0
+
+
+async def probe(client, headers, stop: asyncio.Event) -> list:
+    latencies = []
+    while not stop.is_set():
+        start = timer.perf_counter()
+        await client.get("/api/v1/sales/", headers=headers)
+        latencies.append((timer.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.02)
+    return latencies
+
+
+async def storm(client, headers, logins: int):
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(client, headers, stop))
+    start = timer.perf_counter()
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/auth/login-json", json={"username": f"cashier{i}", "password": PASSWORD})
+        for i in range(logins)
+    ))
+    elapsed = timer.perf_counter() - start
+    stop.set()
+    codes = {}
+    for response in responses:
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+    return await prober, codes, elapsed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=30)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    headers = {"Authorization": f"Bearer {seed(args.logins)}"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        stop = asyncio.Event()
+        asyncio.get_running_loop().call_later(1.0, stop.set)
+        baseline = await probe(client, headers, stop)
+        print(f"{'/sales/ no storm':<28} p50 {percentile(baseline, .5):7.1f} ms  p95 {percentile(baseline, .95):7.1f} ms")
+
+        configured = hashing.hash_pool
+        for label, pool in (
+            ("unbounded", HashPool(workers=OLD_THREADPOOL_SIZE, queue_limit=args.logins)),
+            ("bounded", configured),
+        ):
+            hashing.hash_pool = pool
+            latencies, codes, elapsed = await storm(client, headers, args.logins)
+            print(f"{'/sales/ during ' + label:<28} p50 {percentile(latencies, .5):7.1f} ms  "
+                  f"p95 {percentile(latencies, .95):7.1f} ms   logins {codes} in {elapsed:.1f}s "
+                  f"(workers={pool.workers}, queue={pool.queue_limit})")
+            pool.shutdown()
+        hashing.hash_pool = configured
+
+    await async_engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,139 @@
+# backend/benchmarks/reports.py
+"""
+Report latency benchmark on a synthetic dataset (default: 1M sales over a year).
+
+Builds a throwaway SQLite database, closes every day but the last (so closed
+days are served from snapshots and today is aggregated raw), then times the
+daily, period and top-products reports against a 100 ms target.
+
+Usage (from backend/):
+    python -m benchmarks.reports                    # 1,000,000 sales
+    python -m benchmarks.reports --sales 100000     # quicker run
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time as timer
+
+_tmp = tempfile.mkdtemp(prefix="ims-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/ims.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime, time, timedelta  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+import models  # noqa: E402
+from db import Base, SessionLocal, engine  # noqa: E402
+from crud import report as crud_report, rollup as crud_rollup  # noqa: E402
+
+TARGET_MS = 100
+CHUNK = 20_000
+
+
+def seed(db, sales: int, days: int, employees: int, products: int, categories: int):
+    rng = random.Random(42)
+    today = date.today()
+    first_day = today - timedelta(days=days - 1)
+
+    db.execute(insert(models.Employee), [
+        {"id": i, "name": f"emp{i}", "role": models.EmployeeRole.employee, "phone": f"07{i:08d}",
+         "status": "active", "password_hash": "x"}
+        for i in range(1, employees + 1)
+    ])
+    db.execute(insert(models.Category), [{"id": i, "name": f"cat{i}"} for i in range(1, categories + 1)])
+    prices = {i: float(rng.randint(10, 500)) for i in range(1, products + 1)}
+    db.execute(insert(models.Product), [
+        {"id": i, "name": f"product{i}", "sku": f"SKU{i}", "price": prices[i], "stock": 10**9,
+         "stock_shards": 0, "category_id": 1 + i % categories}
+        for i in range(1, products + 1)
+    ])
+    db.execute(insert(models.Day), [
+        {"date": first_day + timedelta(days=d), "is_open": True, "opened_by_id": 1}
+        for d in range(days)
+    ])
+
+    sale_id = item_id = 0
+    while sale_id < sales:
+        sale_rows, item_rows, credit_rows = [], [], []
+        for _ in range(min(CHUNK, sales - sale_id)):
+            sale_id += 1
+            day = first_day + timedelta(days=sale_id * days // (sales + 1))
+            total = 0.0
+            for product_id in rng.sample(range(1, products + 1), rng.randint(1, 4)):
+                item_id += 1
+                quantity = rng.randint(1, 5)
+                total += quantity * prices[product_id]
+                item_rows.append({"id": item_id, "sale_id": sale_id, "product_id": product_id,
+                                  "quantity": quantity, "price": prices[product_id]})
+            sale_rows.append({"id": sale_id, "date": datetime.combine(day, time.min),
+                              "total_amount": total, "employee_id": rng.randint(1, employees)})
+            if sale_id % 10 == 0:
+                credit_rows.append({"sale_id": sale_id, "employee_id": sale_rows[-1]["employee_id"],
+                                    "amount": total, "status": "cleared" if day < today else "open"})
+        db.execute(insert(models.Sale), sale_rows)
+        db.execute(insert(models.SaleItem), item_rows)
+        if credit_rows:
+            db.execute(insert(models.Credit), credit_rows)
+        db.commit()
+        print(f"\r  seeded {sale_id:,}/{sales:,} sales", end="", flush=True)
+    print()
+
+    db.query(models.Day).filter(models.Day.date < today).update({"is_open": False, "closed_by_id": 1})
+    db.commit()
+    return today
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = timer.perf_counter()
+        fn()
+        samples.append((timer.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[-1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--employees", type=int, default=25)
+    parser.add_argument("--products", type=int, default=2_000)
+    parser.add_argument("--categories", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    print(f"Seeding {args.sales:,} sales over {args.days} days ({_tmp})")
+    start = timer.perf_counter()
+    today = seed(db, args.sales, args.days, args.employees, args.products, args.categories)
+    crud_rollup.rebuild_rollups(db)
+    snapshots = crud_report.snapshot_closed_days(db)
+    print(f"  rollups + {snapshots} day snapshots in {timer.perf_counter() - start:.0f}s")
+    db.execute(models.Base.metadata.tables["sales"].select().limit(1))  # warm the pool
+
+    cases = {
+        "daily (open day, raw)": lambda: crud_report.daily_sales_report(db, today),
+        "daily (closed, snapshot)": lambda: crud_report.daily_sales_report(db, today - timedelta(days=1)),
+        "period 30 days": lambda: crud_report.sales_report_period(db, today - timedelta(days=29), today),
+        f"period {args.days} days": lambda: crud_report.sales_report_period(
+            db, today - timedelta(days=args.days - 1), today),
+        f"top 10 products {args.days} days": lambda: crud_report.top_products_report(
+            db, today - timedelta(days=args.days - 1), today, 10),
+        f"top 10 in category {args.days} days": lambda: crud_report.top_products_report(
+            db, today - timedelta(days=args.days - 1), today, 10, 1),
+    }
+    for name, fn in cases.items():
+        p50, worst = timed(fn, args.repeat)
+        db.expire_all()
+        over = p50 > TARGET_MS
+        print(f"{name:<36} p50 {p50:7.1f} ms   max {worst:7.1f} ms" + ("   over target" if over else ""))
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# backend/benchmarks/search.py
+"""
+Product search latency: FTS5 index vs. a LIKE scan (default: 50,000 products).
+
+Builds a throwaway SQLite catalogue, indexes it, then times
+crud.search.search_products against the equivalent `name/sku LIKE '%q%'`
+scan for a few typical till queries (target: 20 ms per search).
+
+Usage (from backend/):
+    python -m benchmarks.search
+    python -m benchmarks.search --products 200000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time as timer
+
+_tmp = tempfile.mkdtemp(prefix="ims-search-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/ims.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, or_  # noqa: E402
+
+import models  # noqa: E402
+from db import Base, SessionLocal, engine  # noqa: E402
+from crud import search as crud_search  # noqa: E402
+
+TARGET_MS = 20
+WORDS = ["bread", "milk", "sugar", "rice", "flour", "soap", "tea", "coffee", "juice", "salt",
+         "brown", "white", "whole", "fresh", "large", "small", "pack", "bottle", "tin", "box"]
+# Filler vocabulary so a common word matches ~1-2% of the catalogue, not 15%
+WORDS += [a + b for a in ("ka", "lo", "mi", "su", "te", "vo", "ne", "ri", "po", "da")
+          for b in ("ban", "dor", "lix", "mus", "tova", "rin", "sel", "quo")]
+QUERIES = ["bread", "bro", "whole milk", "SKU4242", "tin sal", "zzz"]
+
+
+def seed(db, products: int, vocabulary: int):
+    rng = random.Random(42)
+    words = WORDS[:max(3, vocabulary)]
+    db.execute(insert(models.Product), [
+        {"id": i, "name": " ".join(rng.sample(words, 3)).title() + f" {i}", "sku": f"SKU{i}",
+         "price": 10.0, "stock": 100, "stock_shards": 0}
+        for i in range(1, products + 1)
+    ])
+    indexed = crud_search.rebuild_search_index(db)
+    db.commit()
+    return indexed
+
+
+def like_scan(db, q: str, limit: int):
+    """What the index replaces: substring match on every row."""
+    pattern = f"%{q}%"
+    return (
+        db.query(models.Product)
+        .filter(or_(models.Product.name.ilike(pattern), models.Product.sku.ilike(pattern)))
+        .order_by(models.Product.name)
+        .limit(limit)
+        .all()
+    )
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = timer.perf_counter()
+        fn()
+        samples.append((timer.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--vocabulary", type=int, default=len(WORDS), help="fewer words = more hits per query")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.connection().exec_driver_sql(crud_search.FTS_DDL)
+    start = timer.perf_counter()
+    indexed = seed(db, args.products, args.vocabulary)
+    print(f"Indexed {indexed:,} products in {timer.perf_counter() - start:.1f}s ({_tmp})")
+
+    print(f"{'query':<14} {'hits':>5} {'fts5':>10} {'LIKE scan':>12}")
+    for q in QUERIES:
+        hits = len(crud_search.search_products(db, q, limit=args.limit))
+        fts = timed(lambda: crud_search.search_products(db, q, limit=args.limit), args.repeat)
+        scan = timed(lambda: like_scan(db, q, args.limit), args.repeat)
+        db.expire_all()
+        over = fts > TARGET_MS
+        print(f"{q!r:<14} {hits:>5} {fts:7.1f} ms {scan:9.1f} ms" + ("   over target" if over else ""))
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# backend/cache.py
+"""
+In-process report cache.
+
+- LRU + TTL: at most REPORT_CACHE_SIZE entries, each kept REPORT_CACHE_TTL_SECONDS.
+- Keyed by (endpoint, params, table versions); each entry lists the tables
+  it was built from.
+- Versioned: the key carries the table_versions the request's ETag was built
+  from (etag.py). A write by another worker or manage.py moves the versions,
+  so the next request misses instead of getting the old body under a new ETag.
+- Write-invalidated: on commit, entries built from any table the transaction
+  wrote are dropped (tracking lives in crud/versions.py), freeing memory early.
+- Single-flight: concurrent misses on one key share a single computation.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from db import AsyncSessionLocal, run_sync
+from crud import versions as crud_versions
+
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "256"))
+REPORT_CACHE_TTL_SECONDS = float(os.getenv("REPORT_CACHE_TTL_SECONDS", "30"))
+
+
+class _Flight:
+    """One in-progress computation; `stale` is set if a write lands meanwhile."""
+
+    def __init__(self, tables: frozenset, task: asyncio.Task):
+        self.tables = tables
+        self.task = task
+        self.stale = False
+
+
+class ReportCache:
+    def __init__(self, maxsize: int = REPORT_CACHE_SIZE, ttl: float = REPORT_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, tables, value)
+        self._flights = {}             # key -> _Flight
+        self._lock = threading.Lock()  # sync Sessions may commit from worker threads
+        self.hits = self.misses = self.coalesced = self.invalidations = 0
+
+    async def get_or_compute(self, key, tables, compute):
+        """
+        Cached value for `key`, else `await compute()` once for all concurrent callers.
+        Exceptions propagate to every waiter and are not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry:
+                del self._entries[key]
+
+            flight = self._flights.get(key)
+            if flight:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                flight = _Flight(frozenset(tables), None)
+                flight.task = asyncio.ensure_future(self._fill(key, flight, compute))
+                flight.task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                self._flights[key] = flight
+
+        # A cancelled request must not cancel the computation other callers wait on
+        return await asyncio.shield(flight.task)
+
+    async def _fill(self, key, flight: _Flight, compute):
+        try:
+            value = await compute()
+            with self._lock:
+                if not flight.stale and self.maxsize > 0:
+                    self._entries[key] = (time.monotonic() + self.ttl, flight.tables, value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def invalidate(self, tables) -> int:
+        """Drop entries (and detach in-flight computations) built from any of `tables`."""
+        tables = set(tables)
+        with self._lock:
+            stale = [key for key, (_, used, _) in self._entries.items() if used & tables]
+            for key in stale:
+                del self._entries[key]
+            for key, flight in list(self._flights.items()):
+                if flight.tables & tables:
+                    flight.stale = True
+                    del self._flights[key]
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for flight in self._flights.values():
+                flight.stale = True
+            self._flights.clear()
+
+    def stats(self) -> dict:
+        """Counters exposed on /health/cache."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "in_flight": len(self._flights),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+        }
+
+
+report_cache = ReportCache()
+
+
+async def cached_report(tables, versions: dict, fn, *args, response_model=None):
+    """
+    Serve `fn(db, *args)` through report_cache, keyed by (fn name, args, versions).
+    `versions` are the table versions read before computing (the etag()
+    dependency's return value): versions only move after the data has, so
+    the body is at least as fresh as the ETag sent with it.
+    Computed on its own session, so a caller that disconnects mid-way does not
+    close the session other waiters depend on.
+    """
+    async def compute():
+        async with AsyncSessionLocal() as session:
+            return await run_sync(session, fn, *args, response_model=response_model)
+
+    key = (fn.__name__, *args, tuple(sorted(versions.items())))
+    return await report_cache.get_or_compute(key, tables, compute)
+
+
+# Committed writes (tracked per Session in crud/versions.py) evict dependent entries
+crud_versions.commit_hooks.append(report_cache.invalidate)
@@ -1 +1 @@
-from . import employee, category, supplier, product, sale, credit, day, report
\ No newline at end of file
+from . import employee, category, supplier, product, sale, credit, day, report, idempotency, stock, rollup, versions, refresh_token, revocation, search
\ No newline at end of file
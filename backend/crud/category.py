@@ -3,12 +3,13 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 import models
 from schemas.category import CategoryCreate, CategoryUpdate
+from pagination import paginate
 
 
 # ===== READ =====
-def get_categories(db: Session, skip: int = 0, limit: int = 100):
+def get_categories(db: Session, skip: int = 0, limit: int = 100, after: str | None = None):
     """Fetch all categories with pagination."""
-    return db.query(models.Category).offset(skip).limit(limit).all()
+    return paginate(db.query(models.Category), models.Category.id, skip, limit, after)
 
 
 def get_category(db: Session, category_id: int):
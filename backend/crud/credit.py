@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 import models
 from schemas.credit import CreditCreate, CreditUpdate, CreditStatus
+from pagination import paginate
+from crud.rollup import apply_rollup, credit_deltas
+from crud.report import refresh_day_snapshot
 
 
 # ========= HELPERS =========
@@ -25,9 +28,9 @@ def validate_employee_active(db: Session, employee_id: int):
 
 
 # ========= CRUD =========
-def get_credits(db: Session, skip: int = 0, limit: int = 100):
+def get_credits(db: Session, skip: int = 0, limit: int = 100, after: str | None = None):
     """Retrieve all credits."""
-    return db.query(models.Credit).offset(skip).limit(limit).all()
+    return paginate(db.query(models.Credit), models.Credit.id, skip, limit, after)
 
 
 def get_credit(db: Session, credit_id: int):
@@ -57,6 +60,8 @@ def create_credit(db: Session, credit: CreditCreate):
         updated_at=datetime.utcnow(),
     )
     db.add(db_credit)
+    apply_rollup(db, sale.date, **credit_deltas(db_credit.status, db_credit.amount))
+    refresh_day_snapshot(db, sale.date)
     db.commit()
     db.refresh(db_credit)
     return db_credit
@@ -72,8 +77,15 @@ def update_credit(db: Session, credit_id: int, credit: CreditUpdate):
         return None
 
     if credit.status and credit.status == CreditStatus.cleared:
+        was_open = db_credit.status != CreditStatus.cleared.value
+        sale_date = db_credit.sale.date
+        if was_open:
+            apply_rollup(db, sale_date, **credit_deltas(db_credit.status, db_credit.amount, sign=-1))
+            apply_rollup(db, sale_date, **credit_deltas(CreditStatus.cleared.value, db_credit.amount))
         db_credit.status = CreditStatus.cleared.value
         db_credit.updated_at = datetime.utcnow()
+        if was_open:
+            refresh_day_snapshot(db, sale_date)
     else:
         raise ValueError("Only status update to 'cleared' is allowed")
 
@@ -98,6 +110,8 @@ def delete_credit(db: Session, credit_id: int):
     if day and not day.is_open:
         raise ValueError("Cannot delete credit: the sales day is already closed")
 
+    apply_rollup(db, sale.date, **credit_deltas(db_credit.status, db_credit.amount, sign=-1))
     db.delete(db_credit)
+    refresh_day_snapshot(db, sale.date)
     db.commit()
     return True
@@ -2,6 +2,9 @@
 from sqlalchemy.orm import Session
 from datetime import date, datetime
 import models
+from crud.stock import compact_stock
+from crud.report import sales_between, save_day_snapshot
+from pagination import paginate
 
 
 # ========= HELPERS =========
@@ -21,9 +24,9 @@ def validate_employee_active(db: Session, employee_id: int) -> models.Employee:
 
 
 # ========= CRUD =========
-def get_days(db: Session, skip: int = 0, limit: int = 100):
+def get_days(db: Session, skip: int = 0, limit: int = 100, after: str | None = None):
     """Retrieve all day records with pagination."""
-    return db.query(models.Day).offset(skip).limit(limit).all()
+    return paginate(db.query(models.Day), models.Day.id, skip, limit, after)
 
 
 def get_day(db: Session, day_id: int):
@@ -77,7 +80,7 @@ def close_day(db: Session, employee_id: int) -> models.Day:
     credits = (
         db.query(models.Credit)
         .join(models.Sale)
-        .filter(models.Sale.date == today, models.Credit.status == "open")
+        .filter(sales_between(today, today), models.Credit.status == "open")
         .all()
     )
     if credits:
@@ -86,7 +89,15 @@ def close_day(db: Session, employee_id: int) -> models.Day:
     db_day.is_open = 0
     db_day.closed_by_id = employee.id
     db_day.updated_at = datetime.utcnow()
+    db.flush()
+
+    # The day's numbers are final now: freeze the report in the same transaction
+    save_day_snapshot(db, today)
     db.commit()
+
+    # End of day is a quiet point: fold the day's stock movements into the snapshot
+    compact_stock(db)
+
     db.refresh(db_day)
     return db_day
 
@@ -115,6 +126,7 @@ def delete_day(db: Session, day_id: int) -> bool:
     if credits:
         raise ValueError("Cannot delete day with credit records")
 
+    db.query(models.DaySnapshot).filter(models.DaySnapshot.date == db_day.date).delete()
     db.delete(db_day)
     db.commit()
     return True
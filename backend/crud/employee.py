@@ -5,11 +5,14 @@ from fastapi import HTTPException, status
 import models
 from schemas.employee import EmployeeCreate, EmployeeUpdate
 from auth.hashing import get_password_hash
+from auth.principals import principal_cache
+from crud import revocation as crud_revocation
+from pagination import paginate
 
 
 # ===== GET EMPLOYEES =====
-def get_employees(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Employee).offset(skip).limit(limit).all()
+def get_employees(db: Session, skip: int = 0, limit: int = 100, after: str | None = None):
+    return paginate(db.query(models.Employee), models.Employee.id, skip, limit, after)
 
 
 def get_employee(db: Session, employee_id: int):
@@ -20,13 +23,35 @@ def get_employee_by_phone(db: Session, phone: str):
     return db.query(models.Employee).filter(models.Employee.phone == phone.strip()).first()
 
 
+def get_employee_by_login(db: Session, username: str):
+    """Login lookup: unique index seek on the normalized name."""
+    return (
+        db.query(models.Employee)
+        .filter(models.Employee.login_name == models.normalize_login_name(username))
+        .first()
+    )
+
+
+def ensure_login_name_free(db: Session, name: str, employee_id: int | None = None):
+    """Names are login usernames: they must stay unique once normalized."""
+    query = db.query(models.Employee.id).filter(models.Employee.login_name == models.normalize_login_name(name))
+    if employee_id is not None:
+        query = query.filter(models.Employee.id != employee_id)
+    if query.first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An employee with this name already exists."
+        )
+
+
 # ===== CREATE =====
-def create_employee(db: Session, employee: EmployeeCreate):
+def create_employee(db: Session, employee: EmployeeCreate, password_hash: str | None = None):
     """
     Create a new employee.
     - Employer: only one allowed in system.
     - Manager: only one allowed in system.
     - Password: must always be provided.
+    - password_hash: pre-computed hash (async routes hash off the event loop).
     """
     # Enforce unique employer
     if employee.role == models.EmployeeRole.employer:
@@ -52,10 +77,12 @@ def create_employee(db: Session, employee: EmployeeCreate):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password is required for new employees."
         )
-    hashed_password = get_password_hash(employee.password.strip())
+    hashed_password = password_hash or get_password_hash(employee.password.strip())
+    ensure_login_name_free(db, employee.name)
 
     db_employee = models.Employee(
         name=employee.name.strip(),
+        login_name=models.normalize_login_name(employee.name),
         role=employee.role,
         phone=employee.phone.strip(),
         status=employee.status or "active",
@@ -76,7 +103,13 @@ def create_employee(db: Session, employee: EmployeeCreate):
 
 
 # ===== UPDATE =====
-def update_employee(db: Session, employee_id: int, employee: EmployeeUpdate, allow_role_change: bool = True):
+def update_employee(
+    db: Session,
+    employee_id: int,
+    employee: EmployeeUpdate,
+    allow_role_change: bool = True,
+    password_hash: str | None = None,
+):
     db_employee = get_employee(db, employee_id)
     if not db_employee:
         raise HTTPException(
@@ -85,20 +118,37 @@ def update_employee(db: Session, employee_id: int, employee: EmployeeUpdate, all
         )
 
     updates = employee.dict(exclude_unset=True)
+    password_reset = False
 
     # Secure password update
     if "password" in updates and updates["password"]:
-        db_employee.password_hash = get_password_hash(updates.pop("password"))
+        password = updates.pop("password")
+        db_employee.password_hash = password_hash or get_password_hash(password)
+        password_reset = True
 
     # Restrict role updates if not explicitly allowed
     if not allow_role_change and "role" in updates:
         updates.pop("role")
 
+    # Tokens carry the role (trusted with AUTH_TRUST_JWT_ROLE): revoke them when it changes.
+    # Deactivation / password reset also end the sign-ins (refresh tokens).
+    deactivated = updates.get("status") not in (None, "active") and db_employee.status == "active"
+    role_changed = updates.get("role") is not None and models.EmployeeRole(updates["role"]) != db_employee.role
+    if deactivated or password_reset:
+        crud_revocation.revoke_employee_tokens(db, employee_id)
+    elif role_changed:
+        crud_revocation.revoke_employee_tokens(db, employee_id, refresh_tokens=False)  # refresh picks up the new role
+
+    if updates.get("name"):
+        ensure_login_name_free(db, updates["name"], employee_id)
+        db_employee.login_name = models.normalize_login_name(updates["name"])
+
     for key, value in updates.items():
         setattr(db_employee, key, value.strip() if isinstance(value, str) else value)
 
     try:
         db.commit()
+        principal_cache.invalidate(employee_id)  # role / status may have changed
         db.refresh(db_employee)
         return db_employee
     except IntegrityError:
@@ -109,6 +159,24 @@ def update_employee(db: Session, employee_id: int, employee: EmployeeUpdate, all
         )
 
 
+def set_password(db: Session, employee_id: int, password_hash: str):
+    """
+    Store a pre-computed password hash (self-service password change).
+    Signs out every session, as a reset does; the caller gets fresh tokens.
+    """
+    db_employee = get_employee(db, employee_id)
+    if not db_employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found."
+        )
+    db_employee.password_hash = password_hash
+    crud_revocation.revoke_employee_tokens(db, employee_id)
+    db.commit()
+    principal_cache.invalidate(employee_id)
+    return True
+
+
 # ===== DELETE =====
 def delete_employee(db: Session, employee_id: int):
     db_employee = get_employee(db, employee_id)
@@ -133,5 +201,7 @@ def delete_employee(db: Session, employee_id: int):
         )
 
     db.delete(db_employee)
+    crud_revocation.revoke_employee_tokens(db, employee_id, refresh_tokens=False)  # refresh tokens cascade
     db.commit()
+    principal_cache.invalidate(employee_id)
     return True
@@ -0,0 +1,142 @@
+# backend/crud/idempotency.py
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from pydantic import BaseModel
+import models
+
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "30"))  # in-flight reservations
+PURGE_INTERVAL_SECONDS = 60
+COMMITS = "commits"  # Session.info key: number of committed transactions
+
+_last_purge = datetime.min
+
+
+class IdempotencyConflict(ValueError):
+    """Key reused with a different payload, or the first request is still running."""
+
+
+# ========= HELPERS =========
+@event.listens_for(Session, "after_commit")
+def _count_commit(session):
+    if not session.in_nested_transaction():
+        session.info[COMMITS] = session.info.get(COMMITS, 0) + 1
+
+
+def commit_count(db) -> int:
+    """Transactions committed so far by this session (Session or AsyncSession)."""
+    return db.info.get(COMMITS, 0)
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    """Stable hash of the request body, used to detect key reuse."""
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+def purge_expired(db: Session, force: bool = False) -> int:
+    """TTL eviction: drop expired keys (at most once per PURGE_INTERVAL_SECONDS)."""
+    global _last_purge
+    now = datetime.utcnow()
+    if not force and (now - _last_purge).total_seconds() < PURGE_INTERVAL_SECONDS:
+        return 0
+    _last_purge = now
+
+    deleted = (
+        db.query(models.IdempotencyKey)
+        .filter(models.IdempotencyKey.expires_at < now)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+
+# ========= RESERVE / COMPLETE =========
+def reserve(db: Session, scope: str, employee_id: int, key: str, payload: BaseModel):
+    """
+    Claim an idempotency key (per endpoint and caller) before doing the real work.
+    - Returns the stored record if the request already completed (replay it).
+    - Returns None if the key was free and is now reserved for this request.
+    - Raises IdempotencyConflict on payload mismatch or a request still in flight.
+    The reservation is a lease of IDEMPOTENCY_LEASE_SECONDS: if its request dies
+    without settling it, the key frees up shortly instead of after the TTL.
+    """
+    purge_expired(db)
+    fingerprint = request_fingerprint(payload)
+
+    for _ in range(2):
+        record = db.get(models.IdempotencyKey, (scope, employee_id, key))
+        if record and record.expires_at < datetime.utcnow():
+            db.delete(record)
+            db.commit()
+            record = None
+
+        if record:
+            if record.request_hash != fingerprint:
+                raise IdempotencyConflict("Idempotency-Key was already used with a different request")
+            if record.status_code is None:
+                raise IdempotencyConflict("A request with this Idempotency-Key is still being processed")
+            return record
+
+        db.add(models.IdempotencyKey(
+            scope=scope,
+            employee_id=employee_id,
+            key=key,
+            request_hash=fingerprint,
+            expires_at=datetime.utcnow() + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS),
+        ))
+        try:
+            db.commit()
+            return None
+        except IntegrityError:
+            # Lost the race against a concurrent retry → re-read its record
+            db.rollback()
+
+    raise IdempotencyConflict("A request with this Idempotency-Key is still being processed")
+
+
+def _store(record: models.IdempotencyKey, status_code: int, body: str):
+    record.status_code = status_code
+    record.response_body = body
+    record.expires_at = datetime.utcnow() + timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+
+
+def complete(db: Session, scope: str, employee_id: int, key: str, status_code: int, response: BaseModel):
+    """Store the final response so retries get it back verbatim."""
+    record = db.get(models.IdempotencyKey, (scope, employee_id, key))
+    if record:
+        _store(record, status_code, response.model_dump_json())
+        db.commit()
+
+
+def fail(
+    db: Session, scope: str, employee_id: int, key: str,
+    commits_before: int, status_code: int, detail: str,
+):
+    """
+    Settle a reservation whose request raised.
+    - No commit since commits_before: nothing was written, forget the key so
+      the client may retry.
+    - The business transaction committed (the error came after it, e.g. while
+      building the response): keep the key and store the error, so a retry
+      replays it instead of writing a second time.
+    """
+    committed = commit_count(db) > commits_before
+    db.rollback()
+    record = db.get(models.IdempotencyKey, (scope, employee_id, key))
+    if not record or record.status_code is not None:
+        return
+    if committed:
+        _store(record, status_code, json.dumps({"detail": detail}))
+    else:
+        db.delete(record)
+    db.commit()
+
+
+def stored_body(record: models.IdempotencyKey):
+    """Decode the stored JSON response."""
+    return json.loads(record.response_body)
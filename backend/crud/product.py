@@ -1,8 +1,12 @@
 # backend/crud/product.py
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import func
 import models
+from models import StockMovementKind
 from schemas.product import ProductCreate, ProductUpdate
+from crud.stock import adjust_stock, record_movements
+from crud.search import index_product, unindex_product
+from pagination import paginate
 
 
 # ===== Helpers =====
@@ -27,14 +31,20 @@ def validate_supplier(db: Session, supplier_id: int | None):
 
 
 # ===== CRUD =====
-def get_products(db: Session, skip: int = 0, limit: int = 100):
-    """Fetch all products with pagination."""
-    return db.query(models.Product).offset(skip).limit(limit).all()
+def get_products(db: Session, skip: int = 0, limit: int = 100, after: str | None = None):
+    """Fetch all products with pagination (live stock loaded in the same query)."""
+    query = db.query(models.Product).options(undefer(models.Product.on_hand))
+    return paginate(query, models.Product.id, skip, limit, after)
 
 
 def get_product(db: Session, product_id: int):
-    """Fetch a product by ID."""
-    return db.query(models.Product).filter(models.Product.id == product_id).first()
+    """Fetch a product by ID (with live stock)."""
+    return (
+        db.query(models.Product)
+        .options(undefer(models.Product.on_hand))
+        .filter(models.Product.id == product_id)
+        .first()
+    )
 
 
 def create_product(db: Session, product: ProductCreate):
@@ -61,6 +71,12 @@ def create_product(db: Session, product: ProductCreate):
         supplier_id=product.supplier_id,
     )
     db.add(db_product)
+    db.flush()
+
+    # Opening stock goes straight into the snapshot; the ledger keeps the receipt
+    record_movements(db, {db_product.id: product.stock}, StockMovementKind.receipt, applied=True)
+    index_product(db, db_product)
+
     db.commit()
     db.refresh(db_product)
     return db_product
@@ -83,8 +99,7 @@ def update_product(db: Session, product_id: int, product: ProductUpdate):
         ).first()
         if existing:
             raise ValueError(f"Product with SKU '{normalized_sku}' already exists")
-        db_product.sku = normalized_sku
-        update_data.pop("sku")
+        update_data["sku"] = normalized_sku
 
     # Validate foreign keys if provided
     if "category_id" in update_data:
@@ -92,9 +107,17 @@ def update_product(db: Session, product_id: int, product: ProductUpdate):
     if "supplier_id" in update_data:
         validate_supplier(db, update_data["supplier_id"])
 
-    # Apply remaining updates (name/price/stock)
+    # Stock changes are ledger adjustments, never in-place writes. Done before
+    # any field is assigned: locking reloads the product (populate_existing)
+    # and would drop unflushed changes.
+    new_stock = update_data.pop("stock", None)
+    if new_stock is not None:
+        adjust_stock(db, db_product, new_stock)
+
+    # Apply remaining updates (name/sku/price/relations)
     for key, value in update_data.items():
         setattr(db_product, key, value)
+    index_product(db, db_product)
 
     db.commit()
     db.refresh(db_product)
@@ -110,6 +133,12 @@ def delete_product(db: Session, product_id: int):
     if db_product.sale_items:
         raise ValueError("Cannot delete product with existing sales")
 
+    # The ledger stays for the audit trail; pending deltas have no snapshot left to fold into.
+    db.query(models.StockMovement).filter(
+        models.StockMovement.product_id == product_id,
+        models.StockMovement.applied == False,
+    ).update({"applied": True}, synchronize_session=False)
     db.delete(db_product)
+    unindex_product(db, product_id)
     db.commit()
     return True
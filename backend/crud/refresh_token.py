@@ -0,0 +1,128 @@
+# backend/crud/refresh_token.py
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+import models
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+PURGE_INTERVAL_SECONDS = 60
+
+_last_purge = datetime.min
+
+
+class RefreshTokenError(ValueError):
+    """Unknown, expired, revoked or reused refresh token (→ 401)."""
+
+
+# ========= HELPERS =========
+def hash_token(token: str) -> str:
+    """
+    Storage key for a refresh token. Tokens are 256-bit random values, so a
+    plain SHA-256 is enough: no bcrypt on the renewal path.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def purge_expired(db: Session, force: bool = False) -> int:
+    """Drop expired tokens (at most once per PURGE_INTERVAL_SECONDS)."""
+    global _last_purge
+    now = datetime.utcnow()
+    if not force and (now - _last_purge).total_seconds() < PURGE_INTERVAL_SECONDS:
+        return 0
+    _last_purge = now
+
+    deleted = (
+        db.query(models.RefreshToken)
+        .filter(models.RefreshToken.expires_at < now)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+
+# ========= ISSUE / ROTATE =========
+def issue_refresh_token(db: Session, employee_id: int, family_id: str | None = None) -> str:
+    """
+    Create a refresh token and return it (the only time it exists in clear).
+    A new sign-in starts a new family; rotation keeps the family.
+    """
+    token = secrets.token_urlsafe(32)
+    db.add(models.RefreshToken(
+        employee_id=employee_id,
+        token_hash=hash_token(token),
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    db.commit()
+    return token
+
+
+def rotate_refresh_token(db: Session, token: str):
+    """
+    Spend a refresh token: returns (employee, new refresh token).
+    - Single use: claimed with a conditional UPDATE, so two concurrent
+      refreshes cannot both succeed.
+    - Reuse of a spent token revokes every token of its family.
+    Raises RefreshTokenError.
+    """
+    purge_expired(db)
+    now = datetime.utcnow()
+    record = (
+        db.query(models.RefreshToken)
+        .filter(models.RefreshToken.token_hash == hash_token(token))
+        .first()
+    )
+    if not record or record.revoked_at is not None:
+        raise RefreshTokenError("Invalid refresh token")
+    if record.expires_at < now:
+        raise RefreshTokenError("Refresh token expired")
+
+    claimed = db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.id == record.id, models.RefreshToken.used_at.is_(None))
+        .values(used_at=now)
+    ).rowcount
+    if not claimed:
+        db.execute(
+            update(models.RefreshToken)
+            .where(models.RefreshToken.family_id == record.family_id, models.RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        db.commit()
+        raise RefreshTokenError("Refresh token already used; please sign in again")
+
+    employee = db.get(models.Employee, record.employee_id)
+    if not employee or employee.status != "active":
+        db.rollback()
+        raise RefreshTokenError("This account is inactive.")
+
+    return employee, issue_refresh_token(db, employee.id, record.family_id)  # commits the claim too
+
+
+# ========= REVOKE (caller commits) =========
+def revoke_refresh_family(db: Session, token: str, employee_id: int) -> int:
+    """Revoke the family of `token` (logout of that sign-in). Others' or unknown tokens are ignored."""
+    family_id = (
+        db.query(models.RefreshToken.family_id)
+        .filter(models.RefreshToken.token_hash == hash_token(token), models.RefreshToken.employee_id == employee_id)
+        .scalar()
+    )
+    if family_id is None:
+        return 0
+    return db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.family_id == family_id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    ).rowcount
+
+
+def revoke_employee_refresh_tokens(db: Session, employee_id: int) -> int:
+    """Revoke every refresh token of an employee (sign out everywhere)."""
+    return db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.employee_id == employee_id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    ).rowcount
@@ -1,36 +1,124 @@
 # backend/crud/report.py
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import date
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, case, func, or_, select, union_all
+from datetime import date, datetime, time, timedelta
+import heapq
+import json
 import models
+from schemas.report import ReportOut
+from crud.rollup import COUNTERS, get_rollup, month_of, sale_day
 
 
-# ===== DAILY REPORT =====
-def daily_sales_report(db: Session, report_date: date | None = None):
-    report_date = report_date or date.today()
-
-    total_sales = (
-        db.query(func.sum(models.Sale.total_amount))
-        .filter(models.Sale.date == report_date)
-        .scalar() or 0.0
+# ===== HELPERS =====
+def sales_between(start_date: date, end_date: date):
+    """Filter for sales dated within [start_date, end_date] (Sale.date is a DATETIME)."""
+    return and_(
+        models.Sale.date >= datetime.combine(start_date, time.min),
+        models.Sale.date < datetime.combine(end_date + timedelta(days=1), time.min),
     )
 
-    number_of_sales = (
-        db.query(func.count(models.Sale.id))
-        .filter(models.Sale.date == report_date)
-        .scalar() or 0
+
+def sales_by_employee(db: Session, *criteria):
+    """One grouped pass: sales → employees, open credits outer-joined. criteria filter Sale."""
+    open_credit = case((models.Credit.status == "open", models.Credit.amount), else_=0.0)
+    rows = (
+        db.query(
+            models.Employee.id,
+            models.Employee.name,
+            func.sum(models.Sale.total_amount),
+            func.sum(open_credit),
+            func.count(models.Sale.id),
+        )
+        .join(models.Sale, models.Sale.employee_id == models.Employee.id)
+        .outerjoin(models.Credit, models.Credit.sale_id == models.Sale.id)
+        .filter(*criteria)
+        .group_by(models.Employee.id, models.Employee.name)
+        .order_by(models.Employee.id)
+        .all()
     )
+    return [
+        {
+            "employee_id": employee_id,
+            "employee_name": name,
+            "total_sales": float(total or 0.0),
+            "total_credits": float(credits or 0.0),
+            "total_cash": float((total or 0.0) - (credits or 0.0)),
+            "number_of_sales": count,
+        }
+        for employee_id, name, total, credits, count in rows
+    ]
 
-    # Credits breakdown
-    credits = (
-        db.query(models.Credit.status, func.sum(models.Credit.amount))
-        .join(models.Sale)
-        .filter(models.Sale.date == report_date)
-        .group_by(models.Credit.status)
+
+def sales_by_category(db: Session, *criteria):
+    """One grouped pass: sale_items → products → categories. criteria filter Sale."""
+    rows = (
+        db.query(
+            models.Category.id,
+            models.Category.name,
+            func.sum(models.SaleItem.quantity * models.SaleItem.price),
+            func.sum(models.SaleItem.quantity),
+        )
+        .select_from(models.SaleItem)
+        .join(models.Sale, models.Sale.id == models.SaleItem.sale_id)
+        .join(models.Product, models.Product.id == models.SaleItem.product_id)
+        .join(models.Category, models.Category.id == models.Product.category_id)
+        .filter(*criteria)
+        .group_by(models.Category.id, models.Category.name)
+        .order_by(models.Category.id)
         .all()
     )
-    total_credits = sum([c[1] for c in credits if c[0] == "open"]) or 0.0
-    cleared_credits = sum([c[1] for c in credits if c[0] == "cleared"]) or 0.0
+    return [
+        {
+            "category_id": category_id,
+            "category_name": name,
+            "total_sales": float(total or 0.0),
+            "number_of_items": int(items or 0),
+        }
+        for category_id, name, total, items in rows
+    ]
+
+
+def merge_rows(rows, key: str, fields: tuple) -> list:
+    """Sum `fields` of dict rows sharing `key` (other values: last one wins)."""
+    merged = {}
+    for row in rows:
+        current = merged.get(row[key])
+        if current is None:
+            merged[row[key]] = dict(row)
+        else:
+            for field in fields:
+                current[field] += row[field]
+    return [merged[k] for k in sorted(merged)]
+
+
+def day_status(db: Session, report_date: date, total_sales: float, total_credits: float):
+    """DayReport block: who opened/closed the day (if it exists)."""
+    day = (
+        db.query(models.Day)
+        .options(joinedload(models.Day.opened_by_emp), joinedload(models.Day.closed_by_emp))
+        .filter(models.Day.date == report_date)
+        .first()
+    )
+    return {
+        "date": report_date,
+        "is_open": 1 if day is None or day.is_open else 0,
+        "opened_by": day.opened_by_emp.name if day and day.opened_by_emp else "System",
+        "closed_by": day.closed_by_emp.name if day and day.closed_by_emp else None,
+        "total_sales": float(total_sales),
+        "total_credits": float(total_credits),
+        "total_cash": float(total_sales - total_credits),
+    }
+
+
+# ===== DAILY REPORT =====
+def build_daily_report(db: Session, report_date: date):
+    """Compute the full daily ReportOut from live data."""
+    # Totals: one primary-key read, maintained by every sale/credit mutation
+    rollup = get_rollup(db, report_date)
+    total_sales = rollup.total_sales if rollup else 0.0
+    number_of_sales = rollup.number_of_sales if rollup else 0
+    total_credits = rollup.open_credits if rollup else 0.0
+    cleared_credits = rollup.cleared_credits if rollup else 0.0
     total_cash = total_sales - total_credits
 
     return {
@@ -40,54 +128,155 @@ def daily_sales_report(db: Session, report_date: date | None = None):
             "total_cash": float(total_cash),
             "number_of_sales": number_of_sales,
         },
-        "sales_by_employee": [],
-        "sales_by_category": [],
+        "sales_by_employee": sales_by_employee(db, sales_between(report_date, report_date)),
+        "sales_by_category": sales_by_category(db, sales_between(report_date, report_date)),
         "credit_summary": {
             "open_credits": float(total_credits),
             "cleared_credits": float(cleared_credits),
-            "number_of_open_credits": len([c for c in credits if c[0] == "open"]),
-            "number_of_cleared_credits": len([c for c in credits if c[0] == "cleared"]),
-        },
-        "day_report": {
-            "date": report_date,
-            "is_open": 1,
-            "opened_by": "System",
-            "closed_by": None,
-            "total_sales": float(total_sales),
-            "total_credits": float(total_credits),
-            "total_cash": float(total_cash),
+            "number_of_open_credits": rollup.number_of_open_credits if rollup else 0,
+            "number_of_cleared_credits": rollup.number_of_cleared_credits if rollup else 0,
         },
+        "day_report": day_status(db, report_date, total_sales, total_credits),
     }
 
 
+def daily_sales_report(db: Session, report_date: date | None = None):
+    report_date = report_date or date.today()
+
+    # Closed days are frozen: serve the snapshot taken at close_day
+    snapshot = db.get(models.DaySnapshot, report_date)
+    if snapshot:
+        return json.loads(snapshot.report)
+    return build_daily_report(db, report_date)
+
+
+# ===== DAY SNAPSHOTS =====
+def save_day_snapshot(db: Session, report_date: date):
+    """
+    Freeze the day's ReportOut (called by close_day, inside its transaction).
+    Never commits.
+    """
+    report = ReportOut.model_validate(build_daily_report(db, report_date)).model_dump_json()
+    snapshot = db.get(models.DaySnapshot, report_date)
+    if snapshot:
+        snapshot.report = report
+    else:
+        db.add(models.DaySnapshot(date=report_date, report=report))
+
+
+def refresh_day_snapshot(db: Session, day):
+    """
+    Re-freeze a closed day after a late mutation (e.g. a credit cleared later).
+    No-op for days without a snapshot. Never commits.
+    """
+    day = sale_day(day)
+    if db.get(models.DaySnapshot, day) is not None:
+        db.flush()
+        save_day_snapshot(db, day)
+
+
+def snapshot_closed_days(db: Session) -> int:
+    """
+    Backfill: snapshot every closed day that has no snapshot yet.
+    Returns the number of days snapshotted.
+    """
+    missing = [
+        day for (day,) in
+        db.query(models.Day.date)
+        .outerjoin(models.DaySnapshot, models.DaySnapshot.date == models.Day.date)
+        .filter(models.Day.is_open == False, models.DaySnapshot.date.is_(None))
+        .order_by(models.Day.date)
+        .all()
+    ]
+    try:
+        for day in missing:
+            save_day_snapshot(db, day)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(missing)
+
+
+# ===== PERIOD AGGREGATION =====
+def period_parts(db: Session, start_date: date, end_date: date):
+    """
+    Split [start_date, end_date] into pre-aggregated and raw parts.
+    - Returns the snapshot reports (JSON) of frozen (closed) days,
+    - plus a Sale filter covering the days with sales but no snapshot
+      (normally just today), or None when every active day is frozen.
+    Cost is O(days), not O(sales).
+    """
+    frozen = dict(
+        db.query(models.DaySnapshot.date, models.DaySnapshot.report)
+        .filter(models.DaySnapshot.date.between(start_date, end_date))
+        .all()
+    )
+    active = [
+        day for (day,) in
+        db.query(models.DailyRollup.date)
+        .filter(models.DailyRollup.date.between(start_date, end_date))
+        .order_by(models.DailyRollup.date)
+        .all()
+    ]
+
+    # Contiguous runs of un-frozen active days → one range each
+    ranges, current = [], None
+    for day in active:
+        if day in frozen:
+            current = None
+        elif current is None:
+            current = [day, day]
+            ranges.append(current)
+        else:
+            current[1] = day
+
+    raw = or_(*(sales_between(first, last) for first, last in ranges)) if ranges else None
+    return list(frozen.values()), raw
+
+
 # ===== PERIOD REPORT =====
 def sales_report_period(db: Session, start_date: date, end_date: date):
-    total_sales = (
-        db.query(func.sum(models.Sale.total_amount))
-        .filter(models.Sale.date >= start_date, models.Sale.date <= end_date)
-        .scalar() or 0.0
-    )
+    if start_date > end_date:
+        raise ValueError("start_date must be on or before end_date")
 
-    number_of_sales = (
-        db.query(func.count(models.Sale.id))
-        .filter(models.Sale.date >= start_date, models.Sale.date <= end_date)
-        .scalar() or 0
+    # Totals: sum of daily rollup rows (one row per day)
+    rollup = models.DailyRollup
+    totals = (
+        db.query(*(func.coalesce(func.sum(getattr(rollup, name)), 0) for name in COUNTERS))
+        .filter(rollup.date.between(start_date, end_date))
+        .one()
     )
+    totals = dict(zip(COUNTERS, totals))
+    total_sales = float(totals["total_sales"])
+    total_credits = float(totals["open_credits"])
+
+    # Breakdowns: merge frozen day snapshots, read only un-frozen days raw
+    reports, raw = period_parts(db, start_date, end_date)
+    employees, categories = [], []
+    for report in map(json.loads, reports):
+        employees.extend(report["sales_by_employee"])
+        categories.extend(report["sales_by_category"])
+    if raw is not None:
+        employees.extend(sales_by_employee(db, raw))
+        categories.extend(sales_by_category(db, raw))
 
     return {
         "sales_summary": {
-            "total_sales": float(total_sales),
-            "total_credits": 0.0,
-            "total_cash": float(total_sales),
-            "number_of_sales": number_of_sales,
+            "total_sales": total_sales,
+            "total_credits": total_credits,
+            "total_cash": total_sales - total_credits,
+            "number_of_sales": int(totals["number_of_sales"]),
         },
-        "sales_by_employee": [],
-        "sales_by_category": [],
+        "sales_by_employee": merge_rows(
+            employees, "employee_id", ("total_sales", "total_credits", "total_cash", "number_of_sales")
+        ),
+        "sales_by_category": merge_rows(categories, "category_id", ("total_sales", "number_of_items")),
         "credit_summary": {
-            "open_credits": 0.0,
-            "cleared_credits": 0.0,
-            "number_of_open_credits": 0,
-            "number_of_cleared_credits": 0,
+            "open_credits": total_credits,
+            "cleared_credits": float(totals["cleared_credits"]),
+            "number_of_open_credits": int(totals["number_of_open_credits"]),
+            "number_of_cleared_credits": int(totals["number_of_cleared_credits"]),
         },
         "day_report": None,
     }
@@ -100,7 +289,22 @@ def credit_report(db: Session, status: str = "open"):
 
 # ===== INVENTORY REPORT =====
 def inventory_report(db: Session, threshold: int = 10):
-    return db.query(models.Product).filter(models.Product.stock <= threshold).all()
+    """Products whose live stock (on_hand) is at or below `threshold`, as InventoryReportItem rows."""
+    rows = (
+        db.query(
+            models.Product.name, models.Product.sku, models.Product.on_hand,
+            models.Category.name, models.Supplier.name,
+        )
+        .outerjoin(models.Category, models.Category.id == models.Product.category_id)
+        .outerjoin(models.Supplier, models.Supplier.id == models.Product.supplier_id)
+        .filter(models.Product.on_hand <= threshold)
+        .order_by(models.Product.id)
+        .all()
+    )
+    return [
+        {"product": name, "sku": sku, "stock": on_hand, "category": category, "supplier": supplier}
+        for name, sku, on_hand, category, supplier in rows
+    ]
 
 
 # ===== SUPPLIER BALANCES =====
@@ -109,23 +313,64 @@ def supplier_balances(db: Session):
 
 
 # ===== TOP PRODUCTS REPORT =====
-def top_products_report(db: Session, start_date: date, end_date: date, limit: int = 5):
-    top_products = (
-        db.query(
-            models.Product.name,
-            func.sum(models.SaleItem.quantity).label("total_qty"),
-            func.sum(models.SaleItem.quantity * models.SaleItem.price).label("total_sales"),
+def split_months(start_date: date, end_date: date):
+    """
+    Cover [start_date, end_date] with whole calendar months plus leftover day ranges.
+    Returns (first_month, last_month) or None, and a list of (first_day, last_day).
+    """
+    first_full = start_date if start_date.day == 1 else month_of(start_date + timedelta(days=32 - start_date.day))
+    after_end = end_date + timedelta(days=1)
+    end_full = after_end if after_end.day == 1 else month_of(after_end)  # first day after the last whole month
+    if first_full >= end_full:
+        return None, [(start_date, end_date)]
+
+    day_ranges = []
+    if start_date < first_full:
+        day_ranges.append((start_date, first_full - timedelta(days=1)))
+    if end_full <= end_date:
+        day_ranges.append((end_full, end_date))
+    return (first_full, month_of(end_full - timedelta(days=1))), day_ranges
+
+
+def top_products_report(
+    db: Session, start_date: date, end_date: date, limit: int = 5, category_id: int | None = None
+):
+    """
+    Top `limit` products by quantity, from pre-aggregated product counters.
+    - Whole months in the range read the monthly counters, the edges read daily ones,
+      so a year costs ~12 rows per product plus two partial months.
+    - Partials are summed per product in SQL; the top-k is picked with a bounded
+      heap instead of sorting the whole catalog.
+    """
+    daily, monthly = models.ProductDailySales, models.ProductMonthlySales
+    months, day_ranges = split_months(start_date, end_date)
+
+    parts = [
+        select(daily.product_id, daily.quantity, daily.total_sales).where(daily.date.between(first, last))
+        for first, last in day_ranges
+    ]
+    if months:
+        parts.append(
+            select(monthly.product_id, monthly.quantity, monthly.total_sales)
+            .where(monthly.month.between(*months))
         )
-        .join(models.SaleItem, models.SaleItem.product_id == models.Product.id)
-        .join(models.Sale, models.Sale.id == models.SaleItem.sale_id)
-        .filter(models.Sale.date >= start_date, models.Sale.date <= end_date)
-        .group_by(models.Product.name)
-        .order_by(func.sum(models.SaleItem.quantity).desc())
-        .limit(limit)
-        .all()
-    )
+    partials = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+
+    query = db.query(partials.c.product_id, func.sum(partials.c.quantity), func.sum(partials.c.total_sales))
+    if category_id is not None:
+        query = query.join(models.Product, models.Product.id == partials.c.product_id).filter(
+            models.Product.category_id == category_id
+        )
+    totals = query.group_by(partials.c.product_id).having(func.sum(partials.c.quantity) > 0)
 
+    # Highest quantity first; ties → lowest product id (stable across calls)
+    top = heapq.nlargest(limit, totals, key=lambda row: (row[1], -row[0]))
+    names = dict(
+        db.query(models.Product.id, models.Product.name)
+        .filter(models.Product.id.in_([product_id for product_id, _, _ in top]))
+        .all()
+    ) if top else {}
     return [
-        {"product": p, "quantity": int(qty), "total_sales": float(total)}
-        for p, qty, total in top_products
+        {"product": names.get(product_id, str(product_id)), "quantity": int(quantity), "total_sales": float(total)}
+        for product_id, quantity, total in top
     ]
@@ -0,0 +1,86 @@
+# backend/crud/revocation.py
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+import models
+from auth.jwt_handler import ACCESS_TOKEN_EXPIRE_MINUTES
+from crud import refresh_token as crud_refresh
+
+PURGE_INTERVAL_SECONDS = 60
+
+_last_purge = datetime.min
+
+
+# ========= HELPERS =========
+def purge_expired(db: Session, force: bool = False) -> int:
+    """Drop revocations whose tokens have all expired (at most once per PURGE_INTERVAL_SECONDS)."""
+    global _last_purge
+    now = datetime.utcnow()
+    if not force and (now - _last_purge).total_seconds() < PURGE_INTERVAL_SECONDS:
+        return 0
+    _last_purge = now
+
+    return (
+        db.query(models.TokenRevocation)
+        .filter(models.TokenRevocation.expires_at < now)
+        .delete(synchronize_session=False)
+    )
+
+
+def active_revocations(db: Session) -> list:
+    """Every revocation still covering an unexpired token (auth/revocation.py sync)."""
+    return (
+        db.query(
+            models.TokenRevocation.employee_id,
+            models.TokenRevocation.jti,
+            models.TokenRevocation.issued_before,
+            models.TokenRevocation.expires_at,
+        )
+        .filter(models.TokenRevocation.expires_at >= datetime.utcnow())
+        .all()
+    )
+
+
+# ========= REVOKE (caller commits) =========
+def revoke_token(db: Session, employee_id: int, jti: str, expires_at: datetime):
+    """Revoke one access token until its own expiry."""
+    purge_expired(db)
+    db.add(models.TokenRevocation(employee_id=employee_id, jti=jti, expires_at=expires_at))
+
+
+def revoke_employee_tokens(db: Session, employee_id: int, refresh_tokens: bool = True):
+    """
+    Revoke every access token the employee holds now; tokens issued later
+    stay valid. With refresh_tokens, their sign-ins cannot be renewed either.
+    """
+    purge_expired(db)
+    now = datetime.utcnow()
+    db.add(models.TokenRevocation(
+        employee_id=employee_id,
+        issued_before=now,
+        expires_at=now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    ))
+    if refresh_tokens:
+        crud_refresh.revoke_employee_refresh_tokens(db, employee_id)
+
+
+# ========= LOGOUT =========
+def logout(
+    db: Session,
+    employee_id: int,
+    jti: str | None,
+    expires_at: datetime,
+    refresh_token: str | None = None,
+    all_sessions: bool = False,
+):
+    """
+    Sign out: revoke the presented access token (+ its refresh token family),
+    or every session of the employee with all_sessions.
+    """
+    if all_sessions or not jti:  # tokens without jti cannot be revoked one by one
+        revoke_employee_tokens(db, employee_id)
+    else:
+        revoke_token(db, employee_id, jti, expires_at)
+        if refresh_token:
+            crud_refresh.revoke_refresh_family(db, refresh_token, employee_id)
+    db.commit()
+    return True
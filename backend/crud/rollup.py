@@ -0,0 +1,226 @@
+# backend/crud/rollup.py
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy import Date, cast, delete, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import date, datetime
+import models
+
+
+COUNTERS = (
+    "total_sales", "number_of_sales",
+    "open_credits", "number_of_open_credits",
+    "cleared_credits", "number_of_cleared_credits",
+)
+
+
+# ========= HELPERS =========
+def sale_day(value) -> date:
+    """Rollup key for a Sale.date / Day.date value."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def month_of(day: date) -> date:
+    """Monthly counter key: first day of the month."""
+    return day.replace(day=1)
+
+
+def as_date(value) -> date:
+    """Grouped date column value → date (SQLite's date() returns text)."""
+    return date.fromisoformat(value) if isinstance(value, str) else sale_day(value)
+
+
+def credit_deltas(status: str, amount: float, sign: int = 1) -> dict:
+    """Counter deltas for adding (sign=1) or removing (sign=-1) one credit."""
+    if status == "cleared":
+        return {"cleared_credits": sign * amount, "number_of_cleared_credits": sign}
+    return {"open_credits": sign * amount, "number_of_open_credits": sign}
+
+
+def credit_amount_delta(status: str, amount: float) -> dict:
+    """Counter delta for re-pricing an existing credit (count unchanged)."""
+    return {"cleared_credits" if status == "cleared" else "open_credits": amount}
+
+
+def _upsert(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    return None
+
+
+def product_sales_deltas(items, sign: int = 1, deltas: dict | None = None) -> dict:
+    """
+    {product_id: (quantity, amount)} for sale items (sign=-1 to remove them).
+    Pass `deltas` to accumulate onto an existing mapping.
+    """
+    deltas = {} if deltas is None else deltas
+    for item in items:
+        quantity, amount = deltas.get(item.product_id, (0, 0.0))
+        deltas[item.product_id] = (quantity + sign * item.quantity, amount + sign * item.quantity * item.price)
+    return deltas
+
+
+def add_counters(db: Session | Connection, table, keys: list, rows: list, counters):
+    """
+    Upsert rows, adding `counters` onto existing values.
+    SQLite/Postgres: one INSERT ... ON CONFLICT DO UPDATE (executemany);
+    other dialects: UPDATE, then INSERT where no row matched.
+    """
+    now = datetime.utcnow()
+    dialect = db.get_bind().dialect if isinstance(db, Session) else db.dialect
+    upsert = _upsert(dialect.name)
+    if upsert is not None:
+        stmt = upsert(table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c[key] for key in keys],
+                set_={
+                    **{name: table.c[name] + stmt.excluded[name] for name in counters},
+                    "updated_at": now,
+                },
+            ),
+            [{**row, "updated_at": now} for row in rows],
+        )
+        return
+
+    for row in rows:
+        result = db.execute(
+            update(table)
+            .where(*(table.c[key] == row[key] for key in keys))
+            .values(updated_at=now, **{name: table.c[name] + row[name] for name in counters})
+        )
+        if not result.rowcount:
+            db.execute(insert(table).values(updated_at=now, **row))
+
+
+# ========= WRITE =========
+def apply_rollup(db: Session, day, **deltas):
+    """
+    Add deltas to the day's rollup row (created on first use).
+    Runs inside the caller's transaction: never commits.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    unknown = set(deltas) - set(COUNTERS)
+    if unknown:
+        raise ValueError(f"Unknown rollup counters: {', '.join(sorted(unknown))}")
+
+    row = {"date": sale_day(day), **{name: deltas.get(name, 0) for name in COUNTERS}}
+    add_counters(db, models.DailyRollup.__table__, ["date"], [row], list(deltas))
+
+
+def apply_product_sales(db: Session, day, deltas: dict):
+    """
+    Add {product_id: (quantity, amount)} to the day's and the month's per-product counters.
+    Runs inside the caller's transaction: never commits.
+    """
+    day = sale_day(day)
+    rows = [
+        {"product_id": product_id, "quantity": quantity, "total_sales": amount}
+        for product_id, (quantity, amount) in sorted(deltas.items())
+        if quantity or amount
+    ]
+    if rows:
+        counters = ["quantity", "total_sales"]
+        add_counters(
+            db, models.ProductDailySales.__table__, ["date", "product_id"],
+            [{"date": day, **row} for row in rows], counters,
+        )
+        add_counters(
+            db, models.ProductMonthlySales.__table__, ["month", "product_id"],
+            [{"month": month_of(day), **row} for row in rows], counters,
+        )
+
+
+def rebuild_rollups(db: Session) -> int:
+    """
+    Recompute every rollup row (daily totals and per-product counters) from
+    sales, sale items and credits (drift recovery).
+    Returns the number of days written.
+    """
+    sqlite_dialect = db.get_bind().dialect.name == "sqlite"
+    sale_date = func.date(models.Sale.date) if sqlite_dialect else cast(models.Sale.date, Date)
+
+    days = {}
+
+    def bucket(value):
+        return days.setdefault(as_date(value), {name: 0 for name in COUNTERS})
+
+    for day, total, count in (
+        db.query(sale_date, func.sum(models.Sale.total_amount), func.count(models.Sale.id))
+        .group_by(sale_date)
+        .all()
+    ):
+        counters = bucket(day)
+        counters["total_sales"] = float(total or 0.0)
+        counters["number_of_sales"] = count
+
+    for day, status, total, count in (
+        db.query(sale_date, models.Credit.status, func.sum(models.Credit.amount), func.count(models.Credit.id))
+        .join(models.Sale, models.Sale.id == models.Credit.sale_id)
+        .group_by(sale_date, models.Credit.status)
+        .all()
+    ):
+        counters = bucket(day)
+        state = "cleared" if status == "cleared" else "open"
+        counters[f"{state}_credits"] += float(total or 0.0)
+        counters[f"number_of_{state}_credits"] += count
+
+    product_rows = [
+        {
+            "date": as_date(day),
+            "product_id": product_id,
+            "quantity": int(quantity or 0),
+            "total_sales": float(amount or 0.0),
+        }
+        for day, product_id, quantity, amount in (
+            db.query(
+                sale_date,
+                models.SaleItem.product_id,
+                func.sum(models.SaleItem.quantity),
+                func.sum(models.SaleItem.quantity * models.SaleItem.price),
+            )
+            .select_from(models.SaleItem)
+            .join(models.Sale, models.Sale.id == models.SaleItem.sale_id)
+            .group_by(sale_date, models.SaleItem.product_id)
+            .all()
+        )
+    ]
+
+    monthly = {}
+    for row in product_rows:
+        key = (month_of(row["date"]), row["product_id"])
+        quantity, amount = monthly.get(key, (0, 0.0))
+        monthly[key] = (quantity + row["quantity"], amount + row["total_sales"])
+
+    try:
+        db.execute(delete(models.DailyRollup))
+        db.execute(delete(models.ProductDailySales))
+        db.execute(delete(models.ProductMonthlySales))
+        now = datetime.utcnow()
+        if days:
+            db.execute(
+                insert(models.DailyRollup),
+                [{"date": day, "updated_at": now, **counters} for day, counters in days.items()],
+            )
+        if product_rows:
+            db.execute(insert(models.ProductDailySales), [{**row, "updated_at": now} for row in product_rows])
+            db.execute(insert(models.ProductMonthlySales), [
+                {"month": month, "product_id": product_id, "quantity": quantity,
+                 "total_sales": amount, "updated_at": now}
+                for (month, product_id), (quantity, amount) in monthly.items()
+            ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(days)
+
+
+# ========= READ =========
+def get_rollup(db: Session, day) -> models.DailyRollup | None:
+    """Primary-key read of one day's totals."""
+    return db.get(models.DailyRollup, sale_day(day), populate_existing=True)
@@ -1,8 +1,18 @@
 # backend/crud/sale.py
-from sqlalchemy.orm import Session
-from datetime import date, datetime
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import insert, select
+from datetime import date, datetime, time, timedelta
+import csv
+import io
+import json
+from types import SimpleNamespace
 import models
+from models import StockMovementKind
 from schemas.sale import SaleCreate, SaleUpdate
+from crud.stock import lock_products, move_stock, take_from_shards
+from crud.rollup import apply_product_sales, apply_rollup, credit_amount_delta, credit_deltas, product_sales_deltas
+from crud.report import refresh_day_snapshot
+from pagination import paginate
 
 
 # ========= HELPERS =========
@@ -25,42 +35,120 @@ def validate_day_open(db: Session):
     return day
 
 
-def calculate_total_and_items(db: Session, items):
-    """Calculate total + prepare SaleItem objects, adjusting stock safely."""
+def _merge_quantities(items):
+    """Collapse repeated lines for the same product into one quantity."""
+    quantities = {}
+    for item in items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    return quantities
+
+
+def restore_stock(db: Session, sale_items, sale_id: int | None = None):
+    """Put the quantities of the given sale items back on the shelf (return movements)."""
+    quantities = _merge_quantities(sale_items)
+    products = lock_products(db, list(quantities))
+    quantities = {pid: qty for pid, qty in quantities.items() if pid in products}
+    move_stock(db, quantities, products, StockMovementKind.sale_return, sale_id=sale_id)
+
+
+def stock_errors(quantities: dict, products: dict, available: dict | None = None):
+    """List every missing product / shortage for a basket (empty list = OK)."""
+    errors = []
+    for product_id, quantity in quantities.items():
+        product = products.get(product_id)
+        if not product:
+            errors.append(f"Product with ID {product_id} not found")
+            continue
+        in_stock = available[product_id] if available is not None else product.on_hand
+        if in_stock < quantity:
+            errors.append(
+                f"Not enough stock for product {product.name} "
+                f"(available: {in_stock}, requested: {quantity})"
+            )
+    return errors
+
+
+def take_sharded(db: Session, quantities: dict, products: dict):
+    """
+    Take one basket's sharded products from their counters inside a savepoint.
+    Shards are not locked by lock_products and may have run short since the
+    basket was checked: the savepoint is then rolled back and the shortage
+    returned like any other stock error (empty list = OK).
+    """
+    sharded = {pid: qty for pid, qty in quantities.items() if products[pid].stock_shards}
+    if not sharded:
+        return []
+    savepoint = db.begin_nested()
+    try:
+        for product_id, quantity in sharded.items():
+            take_from_shards(db, products[product_id], quantity)
+    except ValueError as e:
+        savepoint.rollback()
+        return [str(e)]
+    savepoint.commit()
+    return []
+
+
+def calculate_total_and_items(db: Session, items, sale_id: int | None = None):
+    """
+    Calculate total + prepare SaleItem objects, adjusting stock safely.
+    - All products are loaded and locked in a single query.
+    - Every missing product / shortage is reported at once.
+    - Stock is deducted by appending sale movements to the ledger.
+    """
+    quantities = _merge_quantities(items)
+    products = lock_products(db, list(quantities))
+
+    errors = stock_errors(quantities, products)
+    if errors:
+        raise ValueError("; ".join(errors))
+
     total_amount = 0.0
     sale_items = []
-
     for item in items:
-        product = db.query(models.Product).filter(models.Product.id == item.product_id).first()
-        if not product:
-            raise ValueError(f"Product with ID {item.product_id} not found")
-        if product.stock < item.quantity:
-            raise ValueError(f"Not enough stock for product {product.name} (available: {product.stock})")
-
-        # Deduct stock
-        product.stock -= item.quantity
-
-        # Create item
-        sale_item = models.SaleItem(
-            product_id=product.id,
-            quantity=item.quantity,
-            price=product.price,  # always system price
+        product = products[item.product_id]
+        sale_items.append(
+            models.SaleItem(
+                product_id=product.id,
+                quantity=item.quantity,
+                price=product.price,  # always system price
+            )
         )
-        sale_items.append(sale_item)
         total_amount += product.price * item.quantity
 
+    move_stock(
+        db, {pid: -qty for pid, qty in quantities.items()}, products, StockMovementKind.sale, sale_id=sale_id
+    )
+
     return total_amount, sale_items
 
 
+def sale_loaders(with_credit: bool = False) -> list:
+    """
+    Eager-load what SaleOut serializes: one extra IN query per page for items
+    (and optionally credits) instead of one lazy load per sale.
+    """
+    options = [selectinload(models.Sale.items)]
+    if with_credit:
+        options.append(selectinload(models.Sale.credit))
+    return options
+
+
 # ========= CRUD =========
-def get_sales(db: Session, skip: int = 0, limit: int = 100):
+def get_sales(db: Session, skip: int = 0, limit: int = 100, after: str | None = None, with_credit: bool = False):
     """Retrieve all sales."""
-    return db.query(models.Sale).offset(skip).limit(limit).all()
+    query = db.query(models.Sale).options(*sale_loaders(with_credit))
+    return paginate(query, models.Sale.id, skip, limit, after)
 
 
-def get_sale(db: Session, sale_id: int):
+def get_sale(db: Session, sale_id: int, with_credit: bool = False):
     """Retrieve one sale by ID."""
-    return db.query(models.Sale).filter(models.Sale.id == sale_id).first()
+    return (
+        db.query(models.Sale)
+        .options(*sale_loaders(with_credit))
+        .filter(models.Sale.id == sale_id)
+        .first()
+    )
 
 
 def create_sale(db: Session, sale: SaleCreate):
@@ -69,22 +157,22 @@ def create_sale(db: Session, sale: SaleCreate):
     employee = validate_employee_active(db, sale.employee_id)
 
     try:
-        total_amount, sale_items = calculate_total_and_items(db, sale.items)
-
         db_sale = models.Sale(
             date=date.today(),
-            total_amount=total_amount,
+            total_amount=0.0,
             employee_id=employee.id,
-            items=sale_items,
         )
         db.add(db_sale)
-        db.commit()
-        db.refresh(db_sale)
+        db.flush()
+
+        total_amount, sale_items = calculate_total_and_items(db, sale.items, sale_id=db_sale.id)
+        db_sale.total_amount = total_amount
+        db_sale.items = sale_items
+        apply_rollup(db, db_sale.date, total_sales=total_amount, number_of_sales=1)
+        apply_product_sales(db, db_sale.date, product_sales_deltas(sale_items))
 
-        # Handle credit
+        # Handle credit (same transaction as the sale)
         if sale.is_credit:
-            if db_sale.credit:
-                raise ValueError("This sale already has a credit record")
             db_credit = models.Credit(
                 sale_id=db_sale.id,
                 employee_id=employee.id,
@@ -94,9 +182,10 @@ def create_sale(db: Session, sale: SaleCreate):
                 updated_at=datetime.utcnow(),
             )
             db.add(db_credit)
-            db.commit()
-            db.refresh(db_credit)
+            apply_rollup(db, db_sale.date, **credit_deltas(db_credit.status, total_amount))
 
+        db.commit()
+        db.refresh(db_sale)
         return db_sale
     except Exception:
         db.rollback()
@@ -112,23 +201,29 @@ def update_sale(db: Session, sale_id: int, sale: SaleUpdate):
     try:
         if sale.items:
             # Restore stock from old items
-            for old_item in db_sale.items:
-                product = db.query(models.Product).filter(models.Product.id == old_item.product_id).first()
-                if product:
-                    product.stock += old_item.quantity
-                db.delete(old_item)
+            restore_stock(db, db_sale.items, sale_id=db_sale.id)
+            product_deltas = product_sales_deltas(db_sale.items, sign=-1)
+            for old_item in list(db_sale.items):
+                db_sale.items.remove(old_item)
 
-            db.commit()
+            db.flush()
 
             # Add new items
-            total_amount, new_items = calculate_total_and_items(db, sale.items)
+            old_total = db_sale.total_amount
+            total_amount, new_items = calculate_total_and_items(db, sale.items, sale_id=db_sale.id)
             db_sale.total_amount = total_amount
             db_sale.items.extend(new_items)
+            apply_rollup(db, db_sale.date, total_sales=total_amount - old_total)
+            apply_product_sales(db, db_sale.date, product_sales_deltas(new_items, deltas=product_deltas))
 
             # Update credit if exists
             if db_sale.credit:
-                db_sale.credit.amount = total_amount
-                db_sale.credit.updated_at = datetime.utcnow()
+                credit = db_sale.credit
+                apply_rollup(db, db_sale.date, **credit_amount_delta(credit.status, total_amount - credit.amount))
+                credit.amount = total_amount
+                credit.updated_at = datetime.utcnow()
+
+            refresh_day_snapshot(db, db_sale.date)
 
         db.commit()
         db.refresh(db_sale)
@@ -146,14 +241,199 @@ def delete_sale(db: Session, sale_id: int):
 
     try:
         # restore stock
-        for item in db_sale.items:
-            product = db.query(models.Product).filter(models.Product.id == item.product_id).first()
-            if product:
-                product.stock += item.quantity
+        restore_stock(db, db_sale.items, sale_id=db_sale.id)
+
+        apply_rollup(db, db_sale.date, total_sales=-db_sale.total_amount, number_of_sales=-1)
+        apply_product_sales(db, db_sale.date, product_sales_deltas(db_sale.items, sign=-1))
+        if db_sale.credit:
+            apply_rollup(db, db_sale.date, **credit_deltas(db_sale.credit.status, db_sale.credit.amount, sign=-1))
 
         db.delete(db_sale)  # credit + items cascade delete (models.py has cascade)
+        refresh_day_snapshot(db, db_sale.date)
         db.commit()
         return True
     except Exception:
         db.rollback()
         raise
+
+
+# ========= BATCH =========
+def create_sales_batch(db: Session, sales: list[SaleCreate]):
+    """
+    Create many sales in one transaction (offline POS sync).
+    - Day is validated once, each employee once.
+    - Every basket is priced against ONE locked product snapshot.
+    - Sales, items and credits are inserted with bulk executemany.
+    - A basket that fails validation is reported, the rest still go through
+      (sharded counters are taken per basket, in a savepoint).
+    """
+    validate_day_open(db)
+    today = date.today()
+    now = datetime.utcnow()
+
+    employee_errors = {}
+    for employee_id in {sale.employee_id for sale in sales}:
+        try:
+            validate_employee_active(db, employee_id)
+        except ValueError as e:
+            employee_errors[employee_id] = str(e)
+
+    try:
+        products = lock_products(
+            db, list({item.product_id for sale in sales for item in sale.items})
+        )
+        available = {pid: product.on_hand for pid, product in products.items()}
+
+        results = []
+        accepted = []
+        for index, sale in enumerate(sales):
+            if sale.employee_id in employee_errors:
+                results.append({"index": index, "ok": False, "error": employee_errors[sale.employee_id]})
+                continue
+
+            quantities = _merge_quantities(sale.items)
+            errors = stock_errors(quantities, products, available) or take_sharded(db, quantities, products)
+            if errors:
+                results.append({"index": index, "ok": False, "error": "; ".join(errors)})
+                continue
+
+            for product_id, quantity in quantities.items():
+                available[product_id] -= quantity
+            total_amount = sum(products[item.product_id].price * item.quantity for item in sale.items)
+            result = {"index": index, "ok": True, "total_amount": total_amount}
+            results.append(result)
+            accepted.append((sale, result))
+
+        if accepted:
+            sale_ids = db.scalars(
+                insert(models.Sale).returning(models.Sale.id, sort_by_parameter_order=True),
+                [
+                    {"date": today, "total_amount": result["total_amount"], "employee_id": sale.employee_id}
+                    for sale, result in accepted
+                ],
+            ).all()
+
+            item_rows = []
+            credit_rows = []
+            for (sale, result), sale_id in zip(accepted, sale_ids):
+                result["sale_id"] = sale_id
+                item_rows.extend(
+                    {
+                        "sale_id": sale_id,
+                        "product_id": item.product_id,
+                        "quantity": item.quantity,
+                        "price": products[item.product_id].price,
+                    }
+                    for item in sale.items
+                )
+                if sale.is_credit:
+                    credit_rows.append({
+                        "sale_id": sale_id,
+                        "employee_id": sale.employee_id,
+                        "amount": result["total_amount"],
+                        "status": "open",
+                        "created_at": now,
+                        "updated_at": now,
+                    })
+
+            db.execute(insert(models.SaleItem), item_rows)
+            if credit_rows:
+                db.execute(insert(models.Credit), credit_rows)
+            apply_rollup(
+                db, today,
+                total_sales=sum(result["total_amount"] for _, result in accepted),
+                number_of_sales=len(accepted),
+                open_credits=sum(row["amount"] for row in credit_rows),
+                number_of_open_credits=len(credit_rows),
+            )
+            apply_product_sales(db, today, product_sales_deltas(SimpleNamespace(**row) for row in item_rows))
+
+            db.execute(insert(models.StockMovement), [
+                {
+                    "product_id": row["product_id"],
+                    "kind": StockMovementKind.sale.value,
+                    "quantity": -row["quantity"],
+                    "sale_id": row["sale_id"],
+                    "applied": bool(products[row["product_id"]].stock_shards),  # counters already taken
+                    "created_at": now,
+                }
+                for row in item_rows
+            ])
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "created": len(accepted),
+        "failed": len(results) - len(accepted),
+        "results": results,
+    }
+
+
+# ========= EXPORT =========
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CSV_COLUMNS = [
+    "sale_id", "date", "employee_id", "total_amount",
+    "item_id", "product_id", "quantity", "price",
+]
+
+
+def export_sales_stmt(start: date, end: date):
+    """
+    Flat sale + item rows for [start, end] (inclusive), ordered so each sale's
+    items are contiguous. Plain columns, no ORM identity map: meant for
+    streaming with yield_per.
+    """
+    return (
+        select(
+            models.Sale.id.label("sale_id"),
+            models.Sale.date,
+            models.Sale.employee_id,
+            models.Sale.total_amount,
+            models.SaleItem.id.label("item_id"),
+            models.SaleItem.product_id,
+            models.SaleItem.quantity,
+            models.SaleItem.price,
+        )
+        .outerjoin(models.SaleItem, models.SaleItem.sale_id == models.Sale.id)
+        .where(
+            models.Sale.date >= datetime.combine(start, time.min),
+            models.Sale.date < datetime.combine(end + timedelta(days=1), time.min),
+        )
+        .order_by(models.Sale.id, models.SaleItem.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def export_csv_header() -> str:
+    buf = io.StringIO()
+    csv.writer(buf).writerow(EXPORT_CSV_COLUMNS)
+    return buf.getvalue()
+
+
+def export_csv_chunk(rows) -> str:
+    """One CSV line per sale item (sales without items get empty item columns)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([
+            row.sale_id, row.date.isoformat(), row.employee_id, row.total_amount,
+            row.item_id, row.product_id, row.quantity, row.price,
+        ])
+    return buf.getvalue()
+
+
+def export_ndjson_line(sale_row, items: list) -> str:
+    """One JSON object per sale, items nested."""
+    return json.dumps({
+        "id": sale_row.sale_id,
+        "date": sale_row.date.isoformat(),
+        "employee_id": sale_row.employee_id,
+        "total_amount": sale_row.total_amount,
+        "items": [
+            {"id": r.item_id, "product_id": r.product_id, "quantity": r.quantity, "price": r.price}
+            for r in items
+        ],
+    }) + "\n"
@@ -0,0 +1,118 @@
+# backend/crud/search.py
+"""
+Product search over name and SKU.
+
+- SQLite: FTS5 table products_fts (rowid = product id), ranked by bm25.
+  Kept in sync by crud/product.py; ensure_search_index() creates / rebuilds
+  it at startup (create_all cannot: it is a virtual table).
+- PostgreSQL: pg_trgm GIN indexes on products.name / products.sku, ranked by
+  similarity. Nothing to sync.
+Other dialects fall back to an unindexed LIKE.
+
+Each query word matches as a prefix on SQLite ("bre 00" finds "Bread", SKU
+"BR-001") and as a substring on PostgreSQL.
+"""
+import re
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlalchemy.orm import Session, undefer
+import models
+
+FTS_TABLE = "products_fts"
+FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, sku, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+TRGM_INDEXES = {"ix_products_name_trgm": "name", "ix_products_sku_trgm": "sku"}
+
+products_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+
+def _dialect(db) -> str:
+    return db.get_bind().dialect.name if isinstance(db, Session) else db.dialect.name
+
+
+# ========= INDEX MAINTENANCE (SQLite; caller commits) =========
+def index_product(db: Session, product: models.Product):
+    """(Re)index one product after create / update."""
+    if _dialect(db) != "sqlite":
+        return
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": product.id})
+    db.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, name, sku) VALUES (:id, :name, :sku)"),
+        {"id": product.id, "name": product.name, "sku": product.sku},
+    )
+
+
+def unindex_product(db: Session, product_id: int):
+    if _dialect(db) == "sqlite":
+        db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": product_id})
+
+
+def rebuild_search_index(db) -> int:
+    """Re-index every product (drift recovery); returns the product count."""
+    if _dialect(db) != "sqlite":
+        return 0
+    db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    return db.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, name, sku) SELECT id, name, sku FROM products")
+    ).rowcount
+
+
+def ensure_search_index(conn) -> None:
+    """
+    Startup hook (Connection): create the search index if missing; on SQLite,
+    rebuild it when its row count disagrees with products.
+    """
+    dialect = _dialect(conn)
+    if dialect == "sqlite":
+        conn.execute(text(FTS_DDL))
+        indexed = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+        if indexed != conn.execute(text("SELECT count(*) FROM products")).scalar():
+            rebuild_search_index(conn)
+    elif dialect == "postgresql":
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for name, col in TRGM_INDEXES.items():
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON products USING gin ({col} gin_trgm_ops)"))
+
+
+# ========= SEARCH =========
+def _match_expression(q: str) -> str | None:
+    """FTS5 query: every word of `q` as a quoted prefix (no FTS syntax from users)."""
+    words = re.findall(r"\w+", q.casefold())
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def search_products(db: Session, q: str, skip: int = 0, limit: int = 20):
+    """Products matching `q` on name / SKU, best match first."""
+    query = db.query(models.Product).options(undefer(models.Product.on_hand))
+    dialect = _dialect(db)
+
+    if dialect == "sqlite":
+        match = _match_expression(q)
+        if match is None:
+            return []
+        query = (
+            query.join(products_fts, products_fts.c.rowid == models.Product.id)
+            .filter(literal_column(FTS_TABLE).op("MATCH")(match))
+            .order_by(products_fts.c.rank, models.Product.id)  # rank = bm25
+        )
+    else:
+        q = q.strip()
+        if not q:
+            return []
+        pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        query = query.filter(or_(
+            models.Product.name.ilike(pattern, escape="\\"),
+            models.Product.sku.ilike(pattern, escape="\\"),
+        ))
+        if dialect == "postgresql":
+            query = query.order_by(
+                func.greatest(func.similarity(models.Product.name, q), func.similarity(models.Product.sku, q)).desc(),
+                models.Product.id,
+            )
+        else:
+            query = query.order_by(models.Product.name, models.Product.id)
+
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
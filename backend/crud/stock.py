@@ -0,0 +1,310 @@
+# backend/crud/stock.py
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy import bindparam, func, insert, text, update
+from datetime import datetime
+import random
+import models
+from models import StockMovementKind
+from pagination import paginate
+
+
+MAX_STOCK_SHARDS = 64
+
+
+# ========= LOCKING =========
+def lock_products(db: Session, product_ids):
+    """
+    Load every referenced product and lock the rows.
+    - Postgres/MySQL: SELECT ... FOR UPDATE (ordered by id to avoid deadlocks).
+      Sharded products are NOT locked: their stock lives in shard counters.
+    - SQLite: no row locks, so take the write lock up front (BEGIN IMMEDIATE).
+    Returned products carry a fresh `on_hand` (snapshot + pending deltas + shards).
+
+    Availability is checked under this lock: the ledger removed the in-place
+    stock rewrite, not the contention. Sales of the same unsharded product
+    still queue on its row (on SQLite, on the database write lock) for the
+    rest of their transaction; hot products need sharded counters.
+    """
+    if not product_ids:
+        return {}
+
+    query = (
+        db.query(models.Product)
+        .filter(models.Product.id.in_(product_ids))
+        .options(undefer(models.Product.on_hand))
+        .order_by(models.Product.id)
+        .populate_existing()
+    )
+    if db.get_bind().dialect.name == "sqlite":
+        _begin_immediate(db)
+        return {product.id: product for product in query.all()}
+
+    products = {
+        product.id: product for product in
+        query.filter(models.Product.stock_shards == 0).with_for_update(of=models.Product).all()
+    }
+    if len(products) < len(set(product_ids)):
+        # Only sharded (or missing) products left → load them without the row lock
+        products.update({
+            product.id: product for product in
+            query.filter(models.Product.stock_shards > 0).all()
+        })
+    return products
+
+
+def _begin_immediate(db: Session):
+    """Start a SQLite write transaction unless one is already running."""
+    driver_connection = db.connection().connection.driver_connection
+    if not getattr(driver_connection, "in_transaction", True):
+        db.execute(text("BEGIN IMMEDIATE"))
+
+
+# ========= LEDGER =========
+def record_movements(
+    db: Session,
+    quantities: dict,
+    kind: StockMovementKind,
+    sale_id: int | None = None,
+    applied: bool = False,
+):
+    """
+    Append one ledger row per product (insert-only, one executemany).
+    quantities maps product_id → signed delta.
+    """
+    rows = [
+        {
+            "product_id": product_id,
+            "kind": kind.value,
+            "quantity": quantity,
+            "sale_id": sale_id,
+            "applied": applied,
+            "created_at": datetime.utcnow(),
+        }
+        for product_id, quantity in quantities.items()
+        if quantity
+    ]
+    if rows:
+        db.execute(insert(models.StockMovement), rows)
+
+
+def move_stock(
+    db: Session,
+    quantities: dict,
+    products: dict,
+    kind: StockMovementKind,
+    sale_id: int | None = None,
+):
+    """
+    Apply signed deltas for a set of (already loaded) products.
+    - Plain products: pending ledger rows, folded in later by compact_stock.
+    - Sharded products: counters are changed right away, ledger rows stored as applied.
+    Raises ValueError listing every sharded product that ran out of stock.
+    """
+    pending, applied, errors = {}, {}, []
+    for product_id, delta in quantities.items():
+        product = products[product_id]
+        if not product.stock_shards:
+            pending[product_id] = delta
+            continue
+        try:
+            if delta < 0:
+                take_from_shards(db, product, -delta)
+            else:
+                add_to_shards(db, product, delta)
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+        applied[product_id] = delta
+
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    record_movements(db, pending, kind, sale_id=sale_id)
+    record_movements(db, applied, kind, sale_id=sale_id, applied=True)
+    for product in products.values():
+        db.expire(product, ["on_hand"])
+
+
+def adjust_stock(db: Session, product: models.Product, new_stock: int):
+    """Set a product's live stock by appending an adjustment for the difference."""
+    products = lock_products(db, [product.id])
+    delta = new_stock - product.on_hand
+    if delta:
+        move_stock(db, {product.id: delta}, products, StockMovementKind.adjustment)
+
+
+# ========= SHARDED COUNTERS =========
+def take_from_shards(db: Session, product: models.Product, quantity: int):
+    """
+    Decrement a sharded product by `quantity`.
+    - Fast path: one conditional UPDATE on a random shard.
+    - Reservation: if that shard is short, lock all shards and borrow across them.
+    """
+    shards = models.ProductStockShard.__table__
+    hit = db.execute(
+        update(shards)
+        .where(
+            shards.c.product_id == product.id,
+            shards.c.shard == random.randrange(product.stock_shards),
+            shards.c.stock >= quantity,
+        )
+        .values(stock=shards.c.stock - quantity)
+    ).rowcount
+    if hit:
+        return
+
+    rows = (
+        db.query(models.ProductStockShard)
+        .filter(models.ProductStockShard.product_id == product.id)
+        .order_by(models.ProductStockShard.shard)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+    available = sum(row.stock for row in rows)
+    if available < quantity:
+        raise ValueError(
+            f"Not enough stock for product {product.name} "
+            f"(available: {available}, requested: {quantity})"
+        )
+
+    remaining = quantity
+    for row in sorted(rows, key=lambda r: r.stock, reverse=True):
+        taken = min(row.stock, remaining)
+        row.stock -= taken
+        remaining -= taken
+        if not remaining:
+            break
+    db.flush()
+
+
+def add_to_shards(db: Session, product: models.Product, quantity: int):
+    """Put stock back on a random shard of a sharded product."""
+    shards = models.ProductStockShard.__table__
+    db.execute(
+        update(shards)
+        .where(
+            shards.c.product_id == product.id,
+            shards.c.shard == random.randrange(product.stock_shards),
+        )
+        .values(stock=shards.c.stock + quantity)
+    )
+
+
+def set_stock_shards(db: Session, product_id: int, shards: int):
+    """
+    Switch a product into (shards > 0) or out of (shards = 0) sharded-counter mode.
+    Live stock is preserved: pending movements are folded in and the total is
+    spread evenly over the new shards (or moved back onto products.stock).
+    The product and all of its shards are locked before the total is read, so
+    a concurrent take_from_shards is either fully counted or waits for us.
+    Returns the product with its live stock (on_hand) loaded, or None.
+    """
+    if shards < 0 or shards > MAX_STOCK_SHARDS:
+        raise ValueError(f"Shard count must be between 0 and {MAX_STOCK_SHARDS}")
+
+    try:
+        if db.get_bind().dialect.name == "sqlite":
+            _begin_immediate(db)
+        product = (
+            db.query(models.Product)
+            .filter(models.Product.id == product_id)
+            .populate_existing()
+            .with_for_update(of=models.Product)
+            .first()
+        )
+        if not product:
+            return None
+        locked_shards = (
+            db.query(models.ProductStockShard)
+            .filter(models.ProductStockShard.product_id == product_id)
+            .order_by(models.ProductStockShard.shard)
+            .with_for_update()
+            .populate_existing()
+            .all()
+        )
+        pending = db.query(func.coalesce(func.sum(models.StockMovement.quantity), 0)).filter(
+            models.StockMovement.product_id == product_id,
+            models.StockMovement.applied == False,
+        ).scalar()
+        on_hand = product.stock + pending + sum(row.stock for row in locked_shards)
+
+        for row in locked_shards:
+            db.delete(row)
+        db.flush()
+        db.query(models.StockMovement).filter(
+            models.StockMovement.product_id == product_id,
+            models.StockMovement.applied == False,
+        ).update({"applied": True}, synchronize_session=False)
+
+        if shards:
+            base, extra = divmod(max(on_hand, 0), shards)
+            db.add_all([
+                models.ProductStockShard(product_id=product_id, shard=n, stock=base + (1 if n < extra else 0))
+                for n in range(shards)
+            ])
+            product.stock = 0
+        else:
+            product.stock = on_hand
+        product.stock_shards = shards
+
+        db.commit()
+        db.refresh(product, ["stock", "stock_shards", "on_hand"])  # on_hand is deferred: load it here
+        return product
+    except Exception:
+        db.rollback()
+        raise
+
+
+# ========= COMPACTION =========
+def compact_stock(db: Session) -> int:
+    """
+    Fold pending ledger deltas into the products.stock snapshot.
+    Products are locked first, so no sale can append to them mid-compaction.
+    Returns the number of products compacted.
+    """
+    try:
+        product_ids = [
+            row[0] for row in
+            db.query(models.StockMovement.product_id)
+            .filter(models.StockMovement.applied == False)
+            .distinct()
+            .all()
+        ]
+        if not product_ids:
+            return 0
+        lock_products(db, product_ids)
+
+        pending = (
+            db.query(models.StockMovement.product_id, func.sum(models.StockMovement.quantity))
+            .filter(
+                models.StockMovement.product_id.in_(product_ids),
+                models.StockMovement.applied == False,
+            )
+            .group_by(models.StockMovement.product_id)
+            .all()
+        )
+
+        products = models.Product.__table__
+        db.execute(
+            update(products)
+            .where(products.c.id == bindparam("pid"))
+            .values(stock=products.c.stock + bindparam("delta")),
+            [{"pid": product_id, "delta": delta} for product_id, delta in pending],
+        )
+        db.query(models.StockMovement).filter(
+            models.StockMovement.product_id.in_(product_ids),
+            models.StockMovement.applied == False,
+        ).update({"applied": True}, synchronize_session=False)
+
+        db.commit()
+        return len(pending)
+    except Exception:
+        db.rollback()
+        raise
+
+
+def stock_history(db: Session, product_id: int, skip: int = 0, limit: int = 100, after: str | None = None):
+    """Ledger rows for one product, newest first (audit / replay)."""
+    query = db.query(models.StockMovement).filter(models.StockMovement.product_id == product_id)
+    return paginate(query, models.StockMovement.id, skip, limit, after, descending=True)
@@ -4,12 +4,13 @@ from sqlalchemy import func
 from datetime import datetime
 import models
 from schemas.supplier import SupplierCreate, SupplierUpdate
+from pagination import paginate
 
 
 # ===== READ =====
-def get_suppliers(db: Session, skip: int = 0, limit: int = 100):
+def get_suppliers(db: Session, skip: int = 0, limit: int = 100, after: str | None = None):
     """Fetch all suppliers with pagination."""
-    return db.query(models.Supplier).offset(skip).limit(limit).all()
+    return paginate(db.query(models.Supplier), models.Supplier.id, skip, limit, after)
 
 
 def get_supplier(db: Session, supplier_id: int):
@@ -0,0 +1,103 @@
+# backend/crud/versions.py
+"""
+Table-level change tracking.
+
+Every Session records the tables it writes (flushed ORM objects and DML
+statements). Once a transaction has committed and the Session has returned
+its connection to the pool:
+- table_versions is bumped for each of them, in a short transaction of its
+  own (never inside the business transaction: writers would all queue on
+  the same table_versions row for the whole of their transaction);
+- commit_hooks are called with the set (e.g. report cache invalidation).
+
+Versions move only after the data did, so a version read always comes with
+data at least that fresh (ETags, report cache keys). Rolled-back savepoints
+keep their tables: a spurious bump only costs a cache miss.
+"""
+import logging
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+import models
+from crud.rollup import add_counters
+
+WRITTEN_TABLES = "written_tables"      # Session.info key: tables written by the open transaction
+COMMITTED_TABLES = "committed_tables"  # Session.info key: written by the transaction that just committed
+VERSIONS_TABLE = models.TableVersion.__tablename__
+
+commit_hooks = []  # callables taking the set of table names a commit wrote
+
+logger = logging.getLogger(__name__)
+
+
+# ========= TRACKING =========
+def _written(session: Session) -> set:
+    return session.info.setdefault(WRITTEN_TABLES, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    written = _written(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        written.update(table.name for table in inspect(obj).mapper.tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_dml(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        _written(state.session).add(state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session):
+    if session.in_nested_transaction():  # savepoint released: the outer transaction decides
+        return
+    written = session.info.pop(WRITTEN_TABLES, None)
+    if written:
+        session.info[COMMITTED_TABLES] = written
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _publish_commit(session, transaction):
+    if transaction.parent is not None:  # savepoint: tables stay with the outer transaction
+        return
+    session.info.pop(WRITTEN_TABLES, None)  # rolled back: nothing to publish
+    committed = session.info.pop(COMMITTED_TABLES, None)
+    if not committed:
+        return
+    bump_versions(session.get_bind(), committed)
+    for hook in commit_hooks:
+        hook(committed)
+
+
+# ========= BUMP =========
+def bump_versions(bind, tables) -> None:
+    """
+    Add 1 to the version of each table, on a connection of its own.
+    The write it reports is already committed: a failure here is logged, not
+    raised (the caller's commit succeeded); the next write of the table moves
+    its version again.
+    """
+    tables = sorted(set(tables) - {VERSIONS_TABLE})
+    if not tables:
+        return
+    try:
+        with bind.begin() as conn:
+            add_counters(
+                conn, models.TableVersion.__table__, ["table_name"],
+                [{"table_name": name, "version": 1} for name in tables], ["version"],
+            )
+    except Exception:
+        logger.exception("table_versions bump failed for %s", ", ".join(tables))
+
+
+# ========= READ =========
+def get_versions(db: Session, tables) -> dict:
+    """{table_name: version} for `tables` (0 for tables never written)."""
+    tables = sorted(set(tables))
+    rows = dict(
+        db.query(models.TableVersion.table_name, models.TableVersion.version)
+        .filter(models.TableVersion.table_name.in_(tables))
+        .all()
+    )
+    return {name: rows.get(name, 0) for name in tables}
@@ -0,0 +1,73 @@
+# backend/etag.py
+"""
+Conditional GET (weak ETags).
+
+The ETag of a GET is derived from the versions of the tables the endpoint
+reads (crud/versions.py), the URL, the caller and today's date - never from
+the response body. A matching `If-None-Match` returns `304 Not Modified`
+before the endpoint runs: no report, no serialization, no body.
+
+Usage:
+    @router.get("/", dependencies=[Depends(etag({"products"}))])
+
+The dependency returns the versions it read: cached endpoints key their
+cache on them (cache.cached_report), so a body is never served under an
+ETag newer than the data it was built from.
+"""
+import hashlib
+from datetime import date
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_db, run_sync
+from crud import versions as crud_versions
+from auth.dependencies import get_current_user
+from auth.principals import Principal
+
+
+def make_etag(request: Request, user: Principal, versions: dict) -> str:
+    seed = "|".join([
+        request.url.path,
+        "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items())),
+        f"{user.id}:{user.role.value}",
+        date.today().isoformat(),  # "today" defaults roll over at midnight
+        ",".join(f"{name}={version}" for name, version in sorted(versions.items())),
+    ])
+    return f'W/"{hashlib.sha256(seed.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, tag: str) -> bool:
+    """Weak comparison against an If-None-Match list (or `*`)."""
+    if not if_none_match:
+        return False
+    opaque = tag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque
+        for candidate in (part.strip() for part in if_none_match.split(","))
+    )
+
+
+def etag(tables):
+    """
+    Dependency factory: ETag / 304 for a GET that reads `tables`.
+    Also sets `Cache-Control: private, no-cache` so browsers revalidate every time.
+    Returns the {table: version} mapping the ETag was built from.
+    """
+    tables = frozenset(tables)
+
+    async def check(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_user),
+    ):
+        versions = await run_sync(db, crud_versions.get_versions, tables)
+        tag = make_etag(request, current_user, versions)
+        headers = {"ETag": tag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+        if etag_matches(request.headers.get("If-None-Match"), tag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        return versions
+
+    return check
@@ -0,0 +1,93 @@
+# backend/manage.py
+"""
+Maintenance commands (run from backend/, e.g. from cron):
+
+    python manage.py compact-stock
+    python manage.py rebuild-rollups
+    python manage.py snapshot-days
+    python manage.py rebuild-search
+    python manage.py revoke-sessions <employee_id>
+"""
+import argparse
+
+from db import SessionLocal
+from crud import stock as crud_stock
+from crud import rollup as crud_rollup
+from crud import report as crud_report
+from crud import revocation as crud_revocation
+from crud import search as crud_search
+
+
+def compact_stock(args):
+    """Fold pending stock movements into products.stock."""
+    db = SessionLocal()
+    try:
+        compacted = crud_stock.compact_stock(db)
+        print(f"Compacted stock for {compacted} product(s)")
+    finally:
+        db.close()
+
+
+def rebuild_rollups(args):
+    """Recompute daily_rollups from sales and credits (drift recovery)."""
+    db = SessionLocal()
+    try:
+        days = crud_rollup.rebuild_rollups(db)
+        print(f"Rebuilt rollups for {days} day(s)")
+    finally:
+        db.close()
+
+
+def snapshot_days(args):
+    """Snapshot closed days that predate day_snapshots (period reports read them)."""
+    db = SessionLocal()
+    try:
+        days = crud_report.snapshot_closed_days(db)
+        print(f"Snapshotted {days} closed day(s)")
+    finally:
+        db.close()
+
+
+def rebuild_search(args):
+    """Re-index every product for GET /products/search (after imports bypassing the CRUD layer)."""
+    db = SessionLocal()
+    try:
+        products = crud_search.rebuild_search_index(db)
+        db.commit()
+        print(f"Indexed {products} product(s)")
+    finally:
+        db.close()
+
+
+def revoke_sessions(args):
+    """Sign an employee out everywhere (running workers pick it up within REVOCATION_SYNC_SECONDS)."""
+    if args.employee_id is None:
+        raise SystemExit("revoke-sessions needs an employee id")
+    db = SessionLocal()
+    try:
+        crud_revocation.revoke_employee_tokens(db, args.employee_id)
+        db.commit()
+        print(f"Revoked every session of employee {args.employee_id}")
+    finally:
+        db.close()
+
+
+COMMANDS = {
+    "compact-stock": compact_stock,
+    "rebuild-rollups": rebuild_rollups,
+    "snapshot-days": snapshot_days,
+    "rebuild-search": rebuild_search,
+    "revoke-sessions": revoke_sessions,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IMS maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("employee_id", nargs="?", type=int, help="revoke-sessions: employee to sign out")
+    args = parser.parse_args()
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
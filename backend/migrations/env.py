@@ -5,13 +5,16 @@ from sqlalchemy import pool
 
 from alembic import context
 
-from db import Base
+from db import Base, SQLALCHEMY_DATABASE_URL
 import models
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# Use the same database as the app (DATABASE_URL), escaping % for configparser
+config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL.replace("%", "%%"))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -23,6 +26,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Search index objects managed by hand (crud/search.py): the FTS5 table and
+# its shadow tables on SQLite, the pg_trgm indexes on PostgreSQL
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not name.startswith("products_fts")
+    if type_ == "index":
+        return not name.endswith("_trgm")
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -45,6 +58,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -68,7 +82,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_name=include_name
         )
 
         with context.begin_transaction():
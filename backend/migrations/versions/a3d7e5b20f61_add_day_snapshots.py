@@ -0,0 +1,34 @@
+"""add day snapshots
+
+Revision ID: a3d7e5b20f61
+Revises: f4c9a2d17b38
+Create Date: 2026-10-17 15:04:52.117832
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d7e5b20f61'
+down_revision: Union[str, Sequence[str], None] = 'f4c9a2d17b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('day_snapshots',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('report', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('date')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('day_snapshots')
@@ -0,0 +1,47 @@
+"""add product search index
+
+SQLite: FTS5 table products_fts over products.name / sku (rowid = product id),
+populated here and kept in sync by crud/product.py.
+PostgreSQL: pg_trgm GIN indexes on products.name / sku.
+Neither is in the model metadata (see include_name in env.py).
+
+Revision ID: b3e9f7a12c45
+Revises: a84d3c6e2f19
+Create Date: 2026-10-17 21:48:03.162907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e9f7a12c45'
+down_revision: Union[str, Sequence[str], None] = 'a84d3c6e2f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+            "name, sku, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+        op.execute("INSERT INTO products_fts (rowid, name, sku) SELECT id, name, sku FROM products")
+    elif dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_products_sku_trgm ON products USING gin (sku gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS products_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_products_sku_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_products_name_trgm")
@@ -0,0 +1,30 @@
+"""add day snapshot product sales
+
+Revision ID: b58e0c3f9a12
+Revises: a3d7e5b20f61
+Create Date: 2026-10-17 15:47:30.902214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b58e0c3f9a12'
+down_revision: Union[str, Sequence[str], None] = 'a3d7e5b20f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('day_snapshots', sa.Column('product_sales', sa.Text(), nullable=True))
+    # Existing closed days are (re)snapshotted by: python manage.py snapshot-days
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('day_snapshots') as batch_op:
+        batch_op.drop_column('product_sales')
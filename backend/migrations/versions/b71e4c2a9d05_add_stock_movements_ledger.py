@@ -0,0 +1,44 @@
+"""add stock movements ledger
+
+Revision ID: b71e4c2a9d05
+Revises: 9f4b2d7e1c30
+Create Date: 2026-10-17 10:03:18.224619
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71e4c2a9d05'
+down_revision: Union[str, Sequence[str], None] = '9f4b2d7e1c30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_movements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('sale_id', sa.Integer(), nullable=True),
+    sa.Column('applied', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stock_movements_id'), 'stock_movements', ['id'], unique=False)
+    op.create_index(op.f('ix_stock_movements_sale_id'), 'stock_movements', ['sale_id'], unique=False)
+    op.create_index('ix_stock_movements_product_applied', 'stock_movements', ['product_id', 'applied'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_stock_movements_product_applied', table_name='stock_movements')
+    op.drop_index(op.f('ix_stock_movements_sale_id'), table_name='stock_movements')
+    op.drop_index(op.f('ix_stock_movements_id'), table_name='stock_movements')
+    op.drop_table('stock_movements')
@@ -0,0 +1,99 @@
+"""add product daily and monthly sales
+
+Revision ID: c62f8b4d1e07
+Revises: b58e0c3f9a12
+Create Date: 2026-10-17 17:58:13.640215
+
+"""
+from typing import Sequence, Union
+
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c62f8b4d1e07'
+down_revision: Union[str, Sequence[str], None] = 'b58e0c3f9a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('product_daily_sales',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('total_sales', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('date', 'product_id')
+    )
+    op.create_table('product_monthly_sales',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('total_sales', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('month', 'product_id')
+    )
+    backfill_product_sales()
+    # Per-product totals now live in product_daily/monthly_sales
+    with op.batch_alter_table('day_snapshots') as batch_op:
+        batch_op.drop_column('product_sales')
+
+
+def backfill_product_sales():
+    """
+    Fold existing sale items into the per-product day and month counters
+    (same totals as `python manage.py rebuild-rollups`; frozen here,
+    migrations must not import app code).
+    """
+    sales = sa.table('sales', sa.column('id', sa.Integer), sa.column('date', sa.DateTime))
+    items = sa.table('sale_items', sa.column('sale_id', sa.Integer), sa.column('product_id', sa.Integer),
+                     sa.column('quantity', sa.Integer), sa.column('price', sa.Float))
+
+    def counter_table(name, period):
+        return sa.table(name, sa.column(period, sa.Date), sa.column('product_id', sa.Integer),
+                        sa.column('quantity', sa.Integer), sa.column('total_sales', sa.Float),
+                        sa.column('updated_at', sa.DateTime))
+
+    daily = counter_table('product_daily_sales', 'date')
+    monthly = counter_table('product_monthly_sales', 'month')
+    conn = op.get_bind()
+    sale_day = sa.func.date(sales.c.date) if conn.dialect.name == 'sqlite' else sa.cast(sales.c.date, sa.Date)
+
+    now = datetime.utcnow()
+    daily_rows, months = [], {}
+    for day, product_id, quantity, amount in conn.execute(
+        sa.select(sale_day, items.c.product_id, sa.func.sum(items.c.quantity),
+                  sa.func.sum(items.c.quantity * items.c.price))
+        .select_from(items.join(sales, sales.c.id == items.c.sale_id))
+        .group_by(sale_day, items.c.product_id)
+    ):
+        day = date.fromisoformat(day) if isinstance(day, str) else day
+        day = day.date() if isinstance(day, datetime) else day
+        quantity, amount = int(quantity or 0), float(amount or 0.0)
+        daily_rows.append({'date': day, 'product_id': product_id, 'quantity': quantity,
+                           'total_sales': amount, 'updated_at': now})
+        key = (day.replace(day=1), product_id)
+        month_quantity, month_amount = months.get(key, (0, 0.0))
+        months[key] = (month_quantity + quantity, month_amount + amount)
+
+    if daily_rows:
+        conn.execute(daily.insert(), daily_rows)
+        conn.execute(monthly.insert(), [
+            {'month': month, 'product_id': product_id, 'quantity': quantity,
+             'total_sales': amount, 'updated_at': now}
+            for (month, product_id), (quantity, amount) in months.items()
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('day_snapshots', sa.Column('product_sales', sa.Text(), nullable=True))
+    op.drop_table('product_monthly_sales')
+    op.drop_table('product_daily_sales')
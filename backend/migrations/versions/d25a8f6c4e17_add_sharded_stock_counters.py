@@ -0,0 +1,37 @@
+"""add sharded stock counters
+
+Revision ID: d25a8f6c4e17
+Revises: b71e4c2a9d05
+Create Date: 2026-10-17 11:26:54.730115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd25a8f6c4e17'
+down_revision: Union[str, Sequence[str], None] = 'b71e4c2a9d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('stock_shards', sa.Integer(), nullable=False, server_default='0'))
+    op.create_table('product_stock_shards',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('stock', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('product_id', 'shard')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_stock_shards')
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_column('stock_shards')
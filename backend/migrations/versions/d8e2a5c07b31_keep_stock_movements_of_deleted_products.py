@@ -0,0 +1,36 @@
+"""keep stock movements of deleted products
+
+Revision ID: d8e2a5c07b31
+Revises: c7d4a9e13f56
+Create Date: 2026-10-19 10:05:12.418903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2a5c07b31'
+down_revision: Union[str, Sequence[str], None] = 'c7d4a9e13f56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite reflects the constraint unnamed: batch mode names it by this convention.
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+FK_NAME = 'fk_stock_movements_product_id_products'
+
+
+def upgrade() -> None:
+    """Upgrade schema: drop the products FK so the ledger outlives deleted products."""
+    fks = sa.inspect(op.get_bind()).get_foreign_keys('stock_movements')
+    name = next(fk['name'] for fk in fks if fk['constrained_columns'] == ['product_id'])
+    with op.batch_alter_table('stock_movements', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(name or FK_NAME, type_='foreignkey')
+
+
+def downgrade() -> None:
+    """Downgrade schema. Fails if movements of deleted products remain."""
+    with op.batch_alter_table('stock_movements', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.create_foreign_key(FK_NAME, 'products', ['product_id'], ['id'])
@@ -0,0 +1,42 @@
+"""add report hot path indexes
+
+Revision ID: e8b3f1a96c24
+Revises: d25a8f6c4e17
+Create Date: 2026-10-17 13:02:41.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3f1a96c24'
+down_revision: Union[str, Sequence[str], None] = 'd25a8f6c4e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_employees_name', 'employees', ['name'], unique=False)
+    op.create_index('ix_sales_date', 'sales', ['date'], unique=False)
+    op.create_index('ix_sales_employee_date', 'sales', ['employee_id', 'date'], unique=False)
+    op.create_index('ix_sale_items_sale_product', 'sale_items', ['sale_id', 'product_id'], unique=False)
+    op.create_index('ix_sale_items_product_id', 'sale_items', ['product_id'], unique=False)
+    op.create_index('ix_credits_sale_status', 'credits', ['sale_id', 'status'], unique=False)
+    op.create_index('ix_credits_status', 'credits', ['status'], unique=False)
+    op.create_index('ix_stock_movements_applied_product', 'stock_movements', ['applied', 'product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_stock_movements_applied_product', table_name='stock_movements')
+    op.drop_index('ix_credits_status', table_name='credits')
+    op.drop_index('ix_credits_sale_status', table_name='credits')
+    op.drop_index('ix_sale_items_product_id', table_name='sale_items')
+    op.drop_index('ix_sale_items_sale_product', table_name='sale_items')
+    op.drop_index('ix_sales_employee_date', table_name='sales')
+    op.drop_index('ix_sales_date', table_name='sales')
+    op.drop_index('ix_employees_name', table_name='employees')
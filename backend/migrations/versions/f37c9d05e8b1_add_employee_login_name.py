@@ -0,0 +1,58 @@
+"""add employee login name
+
+Adds employees.login_name (normalized name, unique) for index-seek logins.
+
+Backfill: login_name = name trimmed, inner whitespace collapsed, case-folded.
+Names that collide once normalized keep the login on the lowest id; the
+others get "<name> <id>" (rename them in the app afterwards).
+
+Revision ID: f37c9d05e8b1
+Revises: e5f2b8c41a93
+Create Date: 2026-10-17 20:21:37.550183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f37c9d05e8b1'
+down_revision: Union[str, Sequence[str], None] = 'e5f2b8c41a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def normalize(name: str) -> str:
+    # Frozen copy of models.normalize_login_name (migrations must not import app code)
+    return " ".join(name.split()).casefold()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('employees', sa.Column('login_name', sa.String(length=150), nullable=True))
+
+    employees = sa.table('employees', sa.column('id', sa.Integer), sa.column('name', sa.String),
+                         sa.column('login_name', sa.String))
+    conn = op.get_bind()
+    taken = set()
+    for employee_id, name in conn.execute(sa.select(employees.c.id, employees.c.name).order_by(employees.c.id)):
+        login_name = normalize(name)
+        if login_name in taken:
+            login_name = f"{login_name} {employee_id}"
+        taken.add(login_name)
+        conn.execute(employees.update().where(employees.c.id == employee_id).values(login_name=login_name))
+
+    with op.batch_alter_table('employees') as batch_op:
+        batch_op.alter_column('login_name', existing_type=sa.String(length=150), nullable=False)
+        batch_op.drop_index('ix_employees_name')
+        batch_op.create_index('ix_employees_login_name', ['login_name'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('employees') as batch_op:
+        batch_op.drop_index('ix_employees_login_name')
+        batch_op.create_index('ix_employees_name', ['name'], unique=False)
+        batch_op.drop_column('login_name')
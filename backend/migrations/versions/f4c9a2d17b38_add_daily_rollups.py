@@ -0,0 +1,96 @@
+"""add daily rollups
+
+Revision ID: f4c9a2d17b38
+Revises: e8b3f1a96c24
+Create Date: 2026-10-17 14:18:07.264519
+
+"""
+from typing import Sequence, Union
+
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c9a2d17b38'
+down_revision: Union[str, Sequence[str], None] = 'e8b3f1a96c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_rollups',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('total_sales', sa.Float(), nullable=False),
+    sa.Column('number_of_sales', sa.Integer(), nullable=False),
+    sa.Column('open_credits', sa.Float(), nullable=False),
+    sa.Column('number_of_open_credits', sa.Integer(), nullable=False),
+    sa.Column('cleared_credits', sa.Float(), nullable=False),
+    sa.Column('number_of_cleared_credits', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('date')
+    )
+    backfill_rollups()
+
+
+def backfill_rollups():
+    """
+    Fold existing sales / credits into daily_rollups (same totals as
+    `python manage.py rebuild-rollups`; frozen here, migrations must not
+    import app code). Credits count on their sale's day.
+    """
+    sales = sa.table('sales', sa.column('id', sa.Integer), sa.column('date', sa.DateTime),
+                     sa.column('total_amount', sa.Float))
+    credits = sa.table('credits', sa.column('id', sa.Integer), sa.column('sale_id', sa.Integer),
+                       sa.column('amount', sa.Float), sa.column('status', sa.String))
+    rollups = sa.table(
+        'daily_rollups', sa.column('date', sa.Date), sa.column('updated_at', sa.DateTime),
+        *(sa.column(name, sa.Float) for name in ('total_sales', 'open_credits', 'cleared_credits')),
+        *(sa.column(name, sa.Integer) for name in (
+            'number_of_sales', 'number_of_open_credits', 'number_of_cleared_credits',
+        )),
+    )
+    conn = op.get_bind()
+    sale_day = sa.func.date(sales.c.date) if conn.dialect.name == 'sqlite' else sa.cast(sales.c.date, sa.Date)
+
+    days = {}
+
+    def bucket(value):
+        day = date.fromisoformat(value) if isinstance(value, str) else value
+        day = day.date() if isinstance(day, datetime) else day
+        return days.setdefault(day, {
+            'total_sales': 0.0, 'number_of_sales': 0,
+            'open_credits': 0.0, 'number_of_open_credits': 0,
+            'cleared_credits': 0.0, 'number_of_cleared_credits': 0,
+        })
+
+    for day, total, count in conn.execute(
+        sa.select(sale_day, sa.func.sum(sales.c.total_amount), sa.func.count(sales.c.id)).group_by(sale_day)
+    ):
+        counters = bucket(day)
+        counters['total_sales'] = float(total or 0.0)
+        counters['number_of_sales'] = count
+
+    for day, status, total, count in conn.execute(
+        sa.select(sale_day, credits.c.status, sa.func.sum(credits.c.amount), sa.func.count(credits.c.id))
+        .select_from(credits.join(sales, sales.c.id == credits.c.sale_id))
+        .group_by(sale_day, credits.c.status)
+    ):
+        counters = bucket(day)
+        state = 'cleared' if status == 'cleared' else 'open'
+        counters[f'{state}_credits'] += float(total or 0.0)
+        counters[f'number_of_{state}_credits'] += count
+
+    if days:
+        now = datetime.utcnow()
+        conn.execute(rollups.insert(), [
+            {'date': day, 'updated_at': now, **counters} for day, counters in days.items()
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_rollups')
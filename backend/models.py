@@ -1,7 +1,8 @@
 from sqlalchemy import (
-    Column, Integer, String, Float, Date, Enum, ForeignKey, DateTime, Boolean, UniqueConstraint
+    Column, Integer, String, Float, Date, Enum, ForeignKey, DateTime, Boolean, Text, UniqueConstraint
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy import Index, func, select
+from sqlalchemy.orm import relationship, column_property
 from db import Base
 import enum
 from datetime import datetime, date
@@ -15,11 +16,21 @@ class EmployeeRole(enum.Enum):
 
 
 # ================= EMPLOYEE =================
+def normalize_login_name(name: str) -> str:
+    """Login key for a display name: trimmed, inner whitespace collapsed, case-folded."""
+    return " ".join(name.split()).casefold()
+
+
+def _default_login_name(context):
+    return normalize_login_name(context.get_current_parameters()["name"])
+
+
 class Employee(Base):
     __tablename__ = "employees"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(150), nullable=False)
+    login_name = Column(String(150), nullable=False, default=_default_login_name)  # normalize_login_name(name)
     role = Column(Enum(EmployeeRole), nullable=False)
     phone = Column(String(20), unique=True, nullable=False)
     status = Column(String(20), default="active")
@@ -30,6 +41,11 @@ class Employee(Base):
     credits = relationship("Credit", back_populates="employee", cascade="all, delete-orphan")
     days_opened = relationship("Day", back_populates="opened_by_emp", foreign_keys="Day.opened_by_id")
     days_closed = relationship("Day", back_populates="closed_by_emp", foreign_keys="Day.closed_by_id")
+    refresh_tokens = relationship("RefreshToken", back_populates="employee", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_employees_login_name", "login_name", unique=True),  # login lookup
+    )
 
     # __table_args__ = (
     #     # Business rule: only ONE employer and ONE manager
@@ -81,6 +97,7 @@ class Product(Base):
     sku = Column(String(50), unique=True, nullable=False)
     price = Column(Float, nullable=False)
     stock = Column(Integer, default=0)
+    stock_shards = Column(Integer, nullable=False, default=0)  # >0 → stock lives in ProductStockShard rows
 
     category_id = Column(Integer, ForeignKey("categories.id"))
     supplier_id = Column(Integer, ForeignKey("suppliers.id"))
@@ -88,6 +105,11 @@ class Product(Base):
     category = relationship("Category", back_populates="products")
     supplier = relationship("Supplier", back_populates="products")
     sale_items = relationship("SaleItem", back_populates="product")
+    stock_movements = relationship(
+        "StockMovement", primaryjoin="foreign(StockMovement.product_id) == Product.id",
+        back_populates="product", viewonly=True,
+    )
+    shards = relationship("ProductStockShard", back_populates="product", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Product(name={self.name}, sku={self.sku}, stock={self.stock})>"
@@ -107,6 +129,11 @@ class Sale(Base):
     items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan")
     credit = relationship("Credit", uselist=False, back_populates="sale", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_sales_date", "date"),                          # daily / period reports, close_day
+        Index("ix_sales_employee_date", "employee_id", "date"),  # per-employee history
+    )
+
     def __repr__(self):
         return f"<Sale(id={self.id}, total={self.total_amount})>"
 
@@ -124,6 +151,11 @@ class SaleItem(Base):
     sale = relationship("Sale", back_populates="items")
     product = relationship("Product", back_populates="sale_items")
 
+    __table_args__ = (
+        Index("ix_sale_items_sale_product", "sale_id", "product_id"),  # sale -> items (loaders, reports)
+        Index("ix_sale_items_product_id", "product_id"),                # product -> sales
+    )
+
     def __repr__(self):
         return f"<SaleItem(product={self.product_id}, qty={self.quantity}, price={self.price})>"
 
@@ -143,6 +175,11 @@ class Credit(Base):
     sale = relationship("Sale", back_populates="credit")
     employee = relationship("Employee", back_populates="credits")
 
+    __table_args__ = (
+        Index("ix_credits_sale_status", "sale_id", "status"),  # sale -> credit, close_day open check
+        Index("ix_credits_status", "status"),                  # credit report
+    )
+
     def __repr__(self):
         return f"<Credit(amount={self.amount}, status={self.status})>"
 
@@ -162,4 +199,237 @@ class Day(Base):
     closed_by_emp = relationship("Employee", back_populates="days_closed", foreign_keys=[closed_by_id])
 
     def __repr__(self):
-        return f"<Day(date={self.date}, is_open={self.is_open})>"
\ No newline at end of file
+        return f"<Day(date={self.date}, is_open={self.is_open})>"
+
+
+# ================= STOCK MOVEMENT =================
+class StockMovementKind(str, enum.Enum):
+    sale = "sale"
+    sale_return = "return"
+    adjustment = "adjustment"
+    receipt = "receipt"
+
+
+class StockMovement(Base):
+    """
+    Append-only stock ledger.
+    - quantity is a signed delta (sales are negative).
+    - applied=False rows are pending deltas not yet folded into products.stock.
+    """
+    __tablename__ = "stock_movements"
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, nullable=False)  # no FK: history outlives deleted products
+    kind = Column(String(20), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    sale_id = Column(Integer, nullable=True, index=True)  # no FK: history outlives deleted sales
+    applied = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    product = relationship(
+        "Product", primaryjoin="foreign(StockMovement.product_id) == Product.id",
+        back_populates="stock_movements", viewonly=True,
+    )
+
+    __table_args__ = (
+        Index("ix_stock_movements_product_applied", "product_id", "applied"),
+        Index("ix_stock_movements_applied_product", "applied", "product_id"),  # compaction: pending rows
+    )
+
+    def __repr__(self):
+        return f"<StockMovement(product={self.product_id}, kind={self.kind}, qty={self.quantity})>"
+
+
+# ================= PRODUCT STOCK SHARD =================
+class ProductStockShard(Base):
+    """Sub-counter for hot products: sales decrement one shard instead of the product row."""
+    __tablename__ = "product_stock_shards"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    stock = Column(Integer, nullable=False, default=0)
+
+    product = relationship("Product", back_populates="shards")
+
+    def __repr__(self):
+        return f"<ProductStockShard(product={self.product_id}, shard={self.shard}, stock={self.stock})>"
+
+
+# Live stock = compacted snapshot (products.stock) + pending ledger deltas + shard counters.
+# Deferred: two aggregate subqueries per row, so only queries that need it undefer it.
+Product.on_hand = column_property(
+    Product.stock
+    + func.coalesce(
+        select(func.sum(StockMovement.quantity))
+        .where(StockMovement.product_id == Product.id, StockMovement.applied == False)
+        .correlate_except(StockMovement)
+        .scalar_subquery(),
+        0,
+    )
+    + func.coalesce(
+        select(func.sum(ProductStockShard.stock))
+        .where(ProductStockShard.product_id == Product.id)
+        .correlate_except(ProductStockShard)
+        .scalar_subquery(),
+        0,
+    ),
+    deferred=True,
+)
+
+
+# ================= IDEMPOTENCY KEY =================
+class IdempotencyKey(Base):
+    """
+    Stored response for a client-supplied Idempotency-Key, per endpoint and caller.
+    Evicted after expires_at: a short lease while the first request is in flight,
+    IDEMPOTENCY_TTL_HOURS once its response is stored.
+    """
+    __tablename__ = "idempotency_keys"
+
+    scope = Column(String(50), primary_key=True)  # endpoint, e.g. "sales.create"
+    employee_id = Column(Integer, primary_key=True)  # caller (no FK: rows are short-lived)
+    key = Column(String(100), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)  # NULL while the first request is in flight
+    response_body = Column(Text, nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return (
+            f"<IdempotencyKey(scope={self.scope}, employee={self.employee_id}, "
+            f"key={self.key}, status={self.status_code})>"
+        )
+
+
+# ================= REFRESH TOKEN =================
+class RefreshToken(Base):
+    """
+    Rotating refresh token; only its SHA-256 is stored.
+    Each use replaces it with a new token of the same family; presenting an
+    already-used token again revokes the whole family (assumed stolen).
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
+    token_hash = Column(String(64), nullable=False)
+    family_id = Column(String(32), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)     # set when rotated
+    revoked_at = Column(DateTime, nullable=True)  # set on reuse detection
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    employee = relationship("Employee", back_populates="refresh_tokens")
+
+    __table_args__ = (
+        Index("ix_refresh_tokens_token_hash", "token_hash", unique=True),  # /auth/refresh lookup
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),                # purge
+    )
+
+    def __repr__(self):
+        return f"<RefreshToken(employee={self.employee_id}, family={self.family_id}, used={self.used_at})>"
+
+
+# ================= TOKEN REVOCATION =================
+class TokenRevocation(Base):
+    """
+    Revoked access tokens, mirrored in memory by every worker (auth/revocation.py).
+    - jti set:           that one token (logout);
+    - issued_before set: every token of the employee issued earlier
+                         (deactivation, role change, password reset, delete).
+    Rows are useless once expires_at passes (the tokens they cover have expired).
+    No FK on employee_id: a deleted employee's revocation must outlive the row.
+    """
+    __tablename__ = "token_revocations"
+
+    id = Column(Integer, primary_key=True)
+    employee_id = Column(Integer, nullable=False)
+    jti = Column(String(32), nullable=True)
+    issued_before = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_token_revocations_expires_at", "expires_at"),  # sync + purge
+    )
+
+    def __repr__(self):
+        return f"<TokenRevocation(employee={self.employee_id}, jti={self.jti}, before={self.issued_before})>"
+
+
+# ================= DAILY ROLLUP =================
+class DailyRollup(Base):
+    """
+    Per-day sales/credit totals, maintained in the same transaction as every
+    sale and credit mutation (crud/rollup.py). The daily report reads one row.
+    """
+    __tablename__ = "daily_rollups"
+
+    date = Column(Date, primary_key=True)
+    total_sales = Column(Float, nullable=False, default=0.0)
+    number_of_sales = Column(Integer, nullable=False, default=0)
+    open_credits = Column(Float, nullable=False, default=0.0)
+    number_of_open_credits = Column(Integer, nullable=False, default=0)
+    cleared_credits = Column(Float, nullable=False, default=0.0)
+    number_of_cleared_credits = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DailyRollup(date={self.date}, total={self.total_sales}, sales={self.number_of_sales})>"
+
+
+# ================= PRODUCT DAILY SALES =================
+class ProductDailySales(Base):
+    """Per-day, per-product sales counters (top products), maintained with daily_rollups."""
+    __tablename__ = "product_daily_sales"
+
+    date = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    total_sales = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ProductDailySales(date={self.date}, product={self.product_id}, qty={self.quantity})>"
+
+
+class ProductMonthlySales(Base):
+    """Same counters per calendar month (month = first day): long ranges read ~12 rows per product a year."""
+    __tablename__ = "product_monthly_sales"
+
+    month = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    total_sales = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ProductMonthlySales(month={self.month}, product={self.product_id}, qty={self.quantity})>"
+
+
+# ================= DAY SNAPSHOT =================
+class DaySnapshot(Base):
+    """Frozen ReportOut (JSON) for a closed day, written by close_day."""
+    __tablename__ = "day_snapshots"
+
+    date = Column(Date, primary_key=True)
+    report = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DaySnapshot(date={self.date})>"
+
+
+# ================= TABLE VERSION =================
+class TableVersion(Base):
+    """Per-table change counter, bumped by every commit that writes the table (ETags)."""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TableVersion(table={self.table_name}, version={self.version})>"
@@ -0,0 +1,50 @@
+# backend/pagination.py
+"""
+Keyset (cursor) pagination.
+
+List endpoints accept `?after=<cursor>&limit=` and return the cursor for the
+next page in the `X-Next-Cursor` response header (absent on the last page).
+Pages are `WHERE id > :last ORDER BY id LIMIT :n` on the primary key index,
+so page 10,000 costs the same as page 1. Legacy `?skip=` still works.
+"""
+import base64
+import json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque cursor for the row a page ended on."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Inverse of encode_cursor; ValueError on anything we did not issue."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return int(json.loads(raw)["id"])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def paginate(query, key_column, skip: int = 0, limit: int = 100, after: str | None = None, descending: bool = False):
+    """
+    Order `query` by `key_column` and return one page.
+    `after` (keyset) wins over `skip` (offset) when both are given.
+    """
+    if after is not None:
+        last_id = decode_cursor(after)
+        query = query.filter(key_column < last_id if descending else key_column > last_id)
+        skip = 0
+    query = query.order_by(key_column.desc() if descending else key_column)
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+def set_next_cursor(response, items: list, limit: int) -> list:
+    """Attach X-Next-Cursor when the page is full (there may be more rows)."""
+    if items and len(items) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
+    return items
@@ -1,48 +1,58 @@
 # backend/routes/categories.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_db, run_sync
+from pagination import set_next_cursor
 from crud import category as crud_category
 from schemas.category import CategoryCreate, CategoryUpdate, CategoryOut
+from etag import etag
 from auth.dependencies import require_role
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
+CATEGORY_TABLES = {"categories"}
 
-@router.get("/", response_model=list[CategoryOut])
-def read_categories(
+
+@router.get("/", response_model=list[CategoryOut], dependencies=[Depends(etag(CATEGORY_TABLES))])
+async def read_categories(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ View all categories.
     Roles: Employer, Manager, Employee (view-only).
     """
-    return crud_category.get_categories(db, skip=skip, limit=limit)
+    try:
+        items = await run_sync(db, crud_category.get_categories, skip=skip, limit=limit, after=after, response_model=list[CategoryOut])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return set_next_cursor(response, items, limit)
 
 
-@router.get("/{category_id}", response_model=CategoryOut)
-def read_category(
+@router.get("/{category_id}", response_model=CategoryOut, dependencies=[Depends(etag(CATEGORY_TABLES))])
+async def read_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ View category by ID.
     Roles: Employer, Manager, Employee.
     """
-    category = crud_category.get_category(db, category_id)
+    category = await run_sync(db, crud_category.get_category, category_id, response_model=CategoryOut)
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
     return category
 
 
 @router.post("/", response_model=CategoryOut, status_code=status.HTTP_201_CREATED)
-def create_category(
+async def create_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -50,16 +60,16 @@ def create_category(
     Roles: Employer, Manager only.
     """
     try:
-        return crud_category.create_category(db, category)
+        return await run_sync(db, crud_category.create_category, category, response_model=CategoryOut)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.put("/{category_id}", response_model=CategoryOut)
-def update_category(
+async def update_category(
     category_id: int,
     category: CategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -67,7 +77,7 @@ def update_category(
     Roles: Employer, Manager only.
     """
     try:
-        updated = crud_category.update_category(db, category_id, category)
+        updated = await run_sync(db, crud_category.update_category, category_id, category, response_model=CategoryOut)
         if not updated:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
         return updated
@@ -76,9 +86,9 @@ def update_category(
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_200_OK)
-def delete_category(
+async def delete_category(
     category_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -87,7 +97,7 @@ def delete_category(
     Prevent deletion if category has products.
     """
     try:
-        deleted = crud_category.delete_category(db, category_id)
+        deleted = await run_sync(db, crud_category.delete_category, category_id)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
         return {"ok": True, "message": "Category deleted successfully"}
@@ -1,48 +1,61 @@
 # backend/routes/credits.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Header, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_db, run_sync
+from pagination import set_next_cursor
 from crud import credit as crud_credit
+from crud import idempotency as crud_idempotency
 from schemas.credit import CreditCreate, CreditUpdate, CreditOut
+from etag import etag
 from auth.dependencies import require_role
 
 router = APIRouter(prefix="/credits", tags=["Credits"])
 
+CREDIT_TABLES = {"credits"}
 
-@router.get("/", response_model=list[CreditOut])
-def read_credits(
+
+@router.get("/", response_model=list[CreditOut], dependencies=[Depends(etag(CREDIT_TABLES))])
+async def read_credits(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
     ✅ View all credits.
     Roles: Employer, Manager only.
     """
-    return crud_credit.get_credits(db, skip=skip, limit=limit)
+    try:
+        items = await run_sync(db, crud_credit.get_credits, skip=skip, limit=limit, after=after, response_model=list[CreditOut])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return set_next_cursor(response, items, limit)
 
 
-@router.get("/{credit_id}", response_model=CreditOut)
-def read_credit(
+@router.get("/{credit_id}", response_model=CreditOut, dependencies=[Depends(etag(CREDIT_TABLES))])
+async def read_credit(
     credit_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ View a specific credit.
     Roles: Employer, Manager, Employee.
     """
-    credit = crud_credit.get_credit(db, credit_id)
+    credit = await run_sync(db, crud_credit.get_credit, credit_id, response_model=CreditOut)
     if not credit:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Credit not found")
     return credit
 
 
 @router.post("/", response_model=CreditOut, status_code=status.HTTP_201_CREATED)
-def create_credit(
+async def create_credit(
     credit: CreditCreate,
-    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=100),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
@@ -54,18 +67,46 @@ def create_credit(
     - Amount = sale.total_amount (system-calculated).
     - Employee must be active.
     - Prevent duplicate credits for same sale.
+    - Optional `Idempotency-Key` header (per caller): retries replay the first response.
     """
+    scope = ("credits.create", current_user.id, idempotency_key)
+    if idempotency_key:
+        try:
+            stored = await run_sync(db, crud_idempotency.reserve, *scope, credit)
+        except crud_idempotency.IdempotencyConflict as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        if stored:
+            return JSONResponse(
+                status_code=stored.status_code,
+                content=crud_idempotency.stored_body(stored),
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+    commits = crud_idempotency.commit_count(db)
     try:
-        return crud_credit.create_credit(db, credit)
+        created = await run_sync(db, crud_credit.create_credit, credit, response_model=CreditOut)
     except ValueError as e:
+        if idempotency_key:
+            await run_sync(db, crud_idempotency.fail, *scope, commits, status.HTTP_400_BAD_REQUEST, str(e))
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception:
+        if idempotency_key:
+            await run_sync(
+                db, crud_idempotency.fail, *scope, commits,
+                status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal Server Error",
+            )
+        raise
+
+    if idempotency_key:
+        await run_sync(db, crud_idempotency.complete, *scope, status.HTTP_201_CREATED, created)
+    return created
 
 
 @router.put("/{credit_id}", response_model=CreditOut)
-def update_credit(
+async def update_credit(
     credit_id: int,
     credit: CreditUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -74,7 +115,7 @@ def update_credit(
     - Only allowed update: status → 'cleared'.
     """
     try:
-        updated = crud_credit.update_credit(db, credit_id, credit)
+        updated = await run_sync(db, crud_credit.update_credit, credit_id, credit, response_model=CreditOut)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     if not updated:
@@ -83,9 +124,9 @@ def update_credit(
 
 
 @router.delete("/{credit_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_credit(
+async def delete_credit(
     credit_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -95,7 +136,7 @@ def delete_credit(
     - Can only revoke if the sales day is still open.
     """
     try:
-        deleted = crud_credit.delete_credit(db, credit_id)
+        deleted = await run_sync(db, crud_credit.delete_credit, credit_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -1,48 +1,58 @@
 # backend/routes/days.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_db, run_sync
+from pagination import set_next_cursor
 from crud import day as crud_day
 from schemas.day import DayOut
+from etag import etag
 from auth.dependencies import require_role, get_current_user
 import models
 
 router = APIRouter(prefix="/days", tags=["Days"])
 
+DAY_TABLES = {"days"}
 
-@router.get("/", response_model=list[DayOut])
-def read_days(
+
+@router.get("/", response_model=list[DayOut], dependencies=[Depends(etag(DAY_TABLES))])
+async def read_days(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
     ✅ View all business days.
     Roles: Employer, Manager.
     """
-    return crud_day.get_days(db, skip=skip, limit=limit)
+    try:
+        items = await run_sync(db, crud_day.get_days, skip=skip, limit=limit, after=after, response_model=list[DayOut])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return set_next_cursor(response, items, limit)
 
 
-@router.get("/{day_id}", response_model=DayOut)
-def read_day(
+@router.get("/{day_id}", response_model=DayOut, dependencies=[Depends(etag(DAY_TABLES))])
+async def read_day(
     day_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ View a single day by ID.
     Roles: Employer, Manager, Employee.
     """
-    day = crud_day.get_day(db, day_id)
+    day = await run_sync(db, crud_day.get_day, day_id, response_model=DayOut)
     if not day:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Day not found")
     return day
 
 
 @router.post("/open", response_model=DayOut, status_code=status.HTTP_201_CREATED)
-def open_day(
-    db: Session = Depends(get_db),
+async def open_day(
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -50,14 +60,14 @@ def open_day(
     Roles: Employer, Manager.
     """
     try:
-        return crud_day.open_day(db, current_user.id)
+        return await run_sync(db, crud_day.open_day, current_user.id, response_model=DayOut)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/close", response_model=DayOut)
-def close_day(
-    db: Session = Depends(get_db),
+async def close_day(
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -66,15 +76,15 @@ def close_day(
     - Prevents closing if uncleared credits exist.
     """
     try:
-        return crud_day.close_day(db, current_user.id)
+        return await run_sync(db, crud_day.close_day, current_user.id, response_model=DayOut)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.delete("/{day_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_day(
+async def delete_day(
     day_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer"]))
 ):
     """
@@ -83,7 +93,7 @@ def delete_day(
     - Only allowed if no sales or credits exist for that day.
     """
     try:
-        deleted = crud_day.delete_day(db, day_id)
+        deleted = await run_sync(db, crud_day.delete_day, day_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
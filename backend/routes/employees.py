@@ -1,37 +1,49 @@
 # backend/routes/employees.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_db, run_sync
+from pagination import set_next_cursor
 from crud import employee as crud_employee
 from schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeOut
+from etag import etag
 from auth.dependencies import get_current_user, get_current_user_optional, require_role
-from auth.hashing import get_password_hash
+from auth.hashing import get_password_hash_async
+from auth.routes import issue_tokens
 from pydantic import BaseModel
 import models
 from typing import Optional
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
+EMPLOYEE_TABLES = {"employees"}
+
 
 # ===== GET ALL EMPLOYEES =====
-@router.get("/", response_model=list[EmployeeOut])
-def read_employees(
+@router.get("/", response_model=list[EmployeeOut], dependencies=[Depends(etag(EMPLOYEE_TABLES))])
+async def read_employees(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
-    return crud_employee.get_employees(db, skip=skip, limit=limit)
+    try:
+        items = await run_sync(db, crud_employee.get_employees, skip=skip, limit=limit, after=after, response_model=list[EmployeeOut])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return set_next_cursor(response, items, limit)
 
 
 # ===== GET SINGLE EMPLOYEE =====
-@router.get("/{employee_id}", response_model=EmployeeOut)
-def read_employee(
+@router.get("/{employee_id}", response_model=EmployeeOut, dependencies=[Depends(etag(EMPLOYEE_TABLES))])
+async def read_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
-    emp = crud_employee.get_employee(db, employee_id)
+    emp = await run_sync(db, crud_employee.get_employee, employee_id, response_model=EmployeeOut)
     if not emp:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
@@ -41,9 +53,9 @@ def read_employee(
 
 # ===== CREATE EMPLOYEE =====
 @router.post("/", response_model=EmployeeOut, status_code=status.HTTP_201_CREATED)
-def create_employee(
+async def create_employee(
     employee: EmployeeCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Optional[models.Employee] = Depends(get_current_user_optional)  # ✅ allows no token for bootstrap
 ):
     """
@@ -51,7 +63,7 @@ def create_employee(
     - If no employees exist → bootstrap employer (no auth required).
     - Otherwise → only Employer or Manager can create employees.
     """
-    employees_exist = bool(crud_employee.get_employees(db, 0, 1))
+    employees_exist = bool(await run_sync(db, crud_employee.get_employees, 0, 1))
 
     if not employees_exist:
         # Bootstrap employer → ignore auth
@@ -62,7 +74,11 @@ def create_employee(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Password is required for the first employer account."
             )
-        return crud_employee.create_employee(db, employee)
+        password_hash = await get_password_hash_async(employee.password.strip())
+        return await run_sync(
+            db, crud_employee.create_employee, employee,
+            password_hash=password_hash, response_model=EmployeeOut,
+        )
 
     # ✅ After bootstrap -> require Employer or Manager
     if not current_user or current_user.role.value not in ["employer", "manager"]:
@@ -71,25 +87,29 @@ def create_employee(
             detail="Only employer or manager can create employees."
         )
 
-    return crud_employee.create_employee(db, employee)
+    password_hash = await get_password_hash_async(employee.password.strip())
+    return await run_sync(
+        db, crud_employee.create_employee, employee,
+        password_hash=password_hash, response_model=EmployeeOut,
+    )
 
 
 # ===== UPDATE EMPLOYEE =====
 @router.put("/{employee_id}", response_model=EmployeeOut)
-def update_employee(
+async def update_employee(
     employee_id: int,
     employee: EmployeeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
-    emp = crud_employee.get_employee(db, employee_id)
+    emp = await run_sync(db, crud_employee.get_employee, employee_id)
     if not emp:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
         )
 
     # Protect first employer
-    first_emp = db.query(models.Employee).order_by(models.Employee.id.asc()).first()
+    first_emp = await db.scalar(select(models.Employee).order_by(models.Employee.id.asc()))
     if first_emp and first_emp.id == emp.id and emp.role.value == "employer":
         if employee.role and employee.role != "employer":
             raise HTTPException(
@@ -102,31 +122,37 @@ def update_employee(
                 detail="Cannot deactivate the first employer."
             )
 
-    return crud_employee.update_employee(db, employee_id, employee)
+    password_hash = None
+    if employee.password:
+        password_hash = await get_password_hash_async(employee.password)
+    return await run_sync(
+        db, crud_employee.update_employee, employee_id, employee,
+        password_hash=password_hash, response_model=EmployeeOut,
+    )
 
 
 # ===== DELETE EMPLOYEE =====
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_employee(
+async def delete_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
-    emp = crud_employee.get_employee(db, employee_id)
+    emp = await run_sync(db, crud_employee.get_employee, employee_id)
     if not emp:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
         )
 
     # Prevent deletion of first employer
-    first_emp = db.query(models.Employee).order_by(models.Employee.id.asc()).first()
+    first_emp = await db.scalar(select(models.Employee).order_by(models.Employee.id.asc()))
     if first_emp and first_emp.id == emp.id and emp.role.value == "employer":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot delete the first employer (bootstrap admin account)."
         )
 
-    crud_employee.delete_employee(db, employee_id)
+    await run_sync(db, crud_employee.delete_employee, employee_id)
     return {"ok": True}
 
 
@@ -135,9 +161,9 @@ class PasswordChangeRequest(BaseModel):
     new_password: str
 
 @router.put("/me/password")
-def change_own_password(
+async def change_own_password(
     req: PasswordChangeRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     if not req.new_password or len(req.new_password) < 6:
@@ -146,6 +172,7 @@ def change_own_password(
             detail="Password must be at least 6 characters."
         )
 
-    current_user.hashed_password = get_password_hash(req.new_password)
-    db.commit()
-    return {"msg": "Password updated successfully"}
+    password_hash = await get_password_hash_async(req.new_password)
+    await run_sync(db, crud_employee.set_password, current_user.id, password_hash)
+    # Every other session is signed out; this one continues on a new sign-in.
+    return {"msg": "Password updated successfully", **await issue_tokens(db, current_user)}
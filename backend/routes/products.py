@@ -1,48 +1,141 @@
 # backend/routes/products.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_db, run_sync
+from pagination import set_next_cursor
 from crud import product as crud_product
-from schemas.product import ProductCreate, ProductUpdate, ProductOut
+from crud import stock as crud_stock
+from crud import search as crud_search
+from schemas.product import ProductCreate, ProductUpdate, ProductOut, ProductSearchOut, StockMovementOut
+from etag import etag
 from auth.dependencies import require_role
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
+# Live stock = products + pending ledger rows + shard counters
+PRODUCT_TABLES = {"products", "stock_movements", "product_stock_shards"}
+STOCK_MOVEMENT_TABLES = {"products", "stock_movements"}
 
-@router.get("/", response_model=list[ProductOut])
-def read_products(
+
+@router.get("/", response_model=list[ProductOut], dependencies=[Depends(etag(PRODUCT_TABLES))])
+async def read_products(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ List all products (paginated).
     Roles: Employer, Manager, Employee (view-only).
     """
-    return crud_product.get_products(db, skip=skip, limit=limit)
+    try:
+        items = await run_sync(db, crud_product.get_products, skip=skip, limit=limit, after=after, response_model=list[ProductOut])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return set_next_cursor(response, items, limit)
+
+
+@router.get("/search", response_model=list[ProductSearchOut], dependencies=[Depends(etag(PRODUCT_TABLES))])
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_role(["employer", "manager", "employee"]))
+):
+    """
+    🔎 Search products by name / SKU (ranked, best match first; page with skip + limit).
+    Roles: Employer, Manager, Employee (view-only).
+    """
+    return await run_sync(
+        db, crud_search.search_products, q, skip=skip, limit=limit, response_model=list[ProductSearchOut],
+    )
 
 
-@router.get("/{product_id}", response_model=ProductOut)
-def read_product(
+@router.get("/{product_id}", response_model=ProductOut, dependencies=[Depends(etag(PRODUCT_TABLES))])
+async def read_product(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ Get product by ID.
     Roles: Employer, Manager, Employee (view-only).
     """
-    product = crud_product.get_product(db, product_id)
+    product = await run_sync(db, crud_product.get_product, product_id, response_model=ProductOut)
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     return product
 
 
+@router.get(
+    "/{product_id}/stock-movements",
+    response_model=list[StockMovementOut],
+    dependencies=[Depends(etag(STOCK_MOVEMENT_TABLES))],
+)
+async def read_stock_movements(
+    product_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_role(["employer", "manager"]))
+):
+    """
+    📜 Stock ledger for a product (newest first), kept after the product is deleted.
+    Roles: Employer, Manager only.
+    """
+    try:
+        items = await run_sync(
+            db, crud_stock.stock_history, product_id, skip=skip, limit=limit, after=after,
+            response_model=list[StockMovementOut],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not items and not await run_sync(db, crud_product.get_product, product_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    return set_next_cursor(response, items, limit)
+
+
+@router.post("/stock/compact")
+async def compact_stock(
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_role(["employer", "manager"]))
+):
+    """
+    🧮 Fold pending stock movements into the product stock snapshot.
+    Roles: Employer, Manager only.
+    """
+    return {"ok": True, "products_compacted": await run_sync(db, crud_stock.compact_stock)}
+
+
+@router.put("/{product_id}/stock-shards")
+async def set_stock_shards(
+    product_id: int,
+    shards: int,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_role(["employer", "manager"]))
+):
+    """
+    🔀 Turn sharded stock counters on (shards > 0) or off (shards = 0) for a hot product.
+    Roles: Employer, Manager only.
+    """
+    try:
+        product = await run_sync(db, crud_stock.set_stock_shards, product_id, shards)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not product:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    return {"ok": True, "stock_shards": product.stock_shards, "stock": product.on_hand}
+
+
 @router.post("/", response_model=ProductOut, status_code=status.HTTP_201_CREATED)
-def create_product(
+async def create_product(
     product: ProductCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -50,16 +143,16 @@ def create_product(
     Roles: Employer, Manager only.
     """
     try:
-        return crud_product.create_product(db, product)
+        return await run_sync(db, crud_product.create_product, product, response_model=ProductOut)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.put("/{product_id}", response_model=ProductOut)
-def update_product(
+async def update_product(
     product_id: int,
     product: ProductUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -67,7 +160,7 @@ def update_product(
     Roles: Employer, Manager only.
     """
     try:
-        updated = crud_product.update_product(db, product_id, product)
+        updated = await run_sync(db, crud_product.update_product, product_id, product, response_model=ProductOut)
         if not updated:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
         return updated
@@ -76,9 +169,9 @@ def update_product(
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_200_OK)
-def delete_product(
+async def delete_product(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -86,7 +179,7 @@ def delete_product(
     Roles: Employer, Manager only.
     """
     try:
-        deleted = crud_product.delete_product(db, product_id)
+        deleted = await run_sync(db, crud_product.delete_product, product_id)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
         return {"ok": True, "message": "Product deleted successfully"}
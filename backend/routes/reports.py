@@ -1,8 +1,7 @@
 # backend/routes/reports.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
 from datetime import date
-from db import get_db
+from cache import cached_report
 from crud import report as crud_report
 from schemas.report import (
     ReportOut,
@@ -10,74 +9,102 @@ from schemas.report import (
     SupplierBalanceItem,
     TopProductItem,
 )
+from schemas.credit import CreditOut
+from etag import etag
 from auth.dependencies import require_role
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+# Tables each report reads: their versions key the ETag and the cached body,
+# and a committed write to any of them evicts its cached copies
+SALES_REPORT_TABLES = {
+    "sales", "sale_items", "credits", "employees", "products", "categories",
+    "days", "daily_rollups", "day_snapshots",
+}
+CREDIT_REPORT_TABLES = {"credits"}
+INVENTORY_REPORT_TABLES = {"products", "stock_movements", "product_stock_shards", "categories", "suppliers"}
+SUPPLIER_REPORT_TABLES = {"suppliers"}
+TOP_PRODUCTS_TABLES = {"product_daily_sales", "product_monthly_sales", "products"}
+
 
 @router.get("/daily", response_model=ReportOut)
-def daily_report(
+async def daily_report(
     report_date: date | None = None,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role(["employer", "manager"]))
+    current_user=Depends(require_role(["employer", "manager"])),
+    versions: dict = Depends(etag(SALES_REPORT_TABLES)),
 ):
     """📊 Daily sales report"""
     try:
-        return crud_report.daily_sales_report(db, report_date)
+        return await cached_report(
+            SALES_REPORT_TABLES, versions, crud_report.daily_sales_report, report_date or date.today()
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/period", response_model=ReportOut)
-def sales_report_period(
+async def sales_report_period(
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role(["employer", "manager"]))
+    current_user=Depends(require_role(["employer", "manager"])),
+    versions: dict = Depends(etag(SALES_REPORT_TABLES)),
 ):
     """📈 Report for a custom date range"""
     try:
-        return crud_report.sales_report_period(db, start_date, end_date)
+        return await cached_report(
+            SALES_REPORT_TABLES, versions, crud_report.sales_report_period, start_date, end_date
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/credits")
-def credit_reports(
+@router.get("/credits", response_model=list[CreditOut])
+async def credit_reports(
     status: str = "open",
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role(["employer", "manager"]))
+    current_user=Depends(require_role(["employer", "manager"])),
+    versions: dict = Depends(etag(CREDIT_REPORT_TABLES)),
 ):
     """💳 Credits report"""
-    return crud_report.credit_report(db, status=status)
+    return await cached_report(
+        CREDIT_REPORT_TABLES, versions, crud_report.credit_report, status, response_model=list[CreditOut]
+    )
 
 
 @router.get("/inventory", response_model=list[InventoryReportItem])
-def inventory_reports(
+async def inventory_reports(
     threshold: int = 10,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role(["employer", "manager"]))
+    current_user=Depends(require_role(["employer", "manager"])),
+    versions: dict = Depends(etag(INVENTORY_REPORT_TABLES)),
 ):
     """📦 Low stock report"""
-    return crud_report.inventory_report(db, threshold)
+    return await cached_report(
+        INVENTORY_REPORT_TABLES, versions, crud_report.inventory_report, threshold,
+        response_model=list[InventoryReportItem],
+    )
 
 
 @router.get("/suppliers", response_model=list[SupplierBalanceItem])
-def supplier_reports(
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role(["employer", "manager"]))
+async def supplier_reports(
+    current_user=Depends(require_role(["employer", "manager"])),
+    versions: dict = Depends(etag(SUPPLIER_REPORT_TABLES)),
 ):
     """🧾 Supplier balances"""
-    return crud_report.supplier_balances(db)
+    return await cached_report(
+        SUPPLIER_REPORT_TABLES, versions, crud_report.supplier_balances, response_model=list[SupplierBalanceItem]
+    )
 
 
 @router.get("/top-products", response_model=list[TopProductItem])
-def top_products_reports(
+async def top_products_reports(
     start_date: date,
     end_date: date,
-    limit: int = 5,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role(["employer", "manager"]))
+    limit: int = Query(5, ge=1),
+    category_id: int | None = None,
+    current_user=Depends(require_role(["employer", "manager"])),
+    versions: dict = Depends(etag(TOP_PRODUCTS_TABLES)),
 ):
-    """🔥 Top-selling products"""
-    return crud_report.top_products_report(db, start_date, end_date, limit)
+    """🔥 Top-selling products (optionally within one category)"""
+    return await cached_report(
+        TOP_PRODUCTS_TABLES, versions, crud_report.top_products_report, start_date, end_date, limit, category_id,
+        response_model=list[TopProductItem],
+    )
@@ -1,48 +1,124 @@
 # backend/routes/sales.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import AsyncSessionLocal, get_db, run_sync
+from pagination import set_next_cursor
 from crud import sale as crud_sale
-from schemas.sale import SaleCreate, SaleUpdate, SaleOut
+from crud import idempotency as crud_idempotency
+from schemas.sale import SaleCreate, SaleUpdate, SaleOut, SaleBatchOut
+from etag import etag
 from auth.dependencies import require_role
 
 router = APIRouter(prefix="/sales", tags=["Sales"])
 
+MAX_BATCH_SIZE = 1000
+SALE_TABLES = {"sales", "sale_items"}
 
-@router.get("/", response_model=list[SaleOut])
-def read_sales(
+
+@router.get("/", response_model=list[SaleOut], dependencies=[Depends(etag(SALE_TABLES))])
+async def read_sales(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
     ✅ View all sales.
     Roles: Employer, Manager only.
     """
-    return crud_sale.get_sales(db, skip=skip, limit=limit)
+    try:
+        items = await run_sync(db, crud_sale.get_sales, skip=skip, limit=limit, after=after, response_model=list[SaleOut])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return set_next_cursor(response, items, limit)
+
+
+async def _export_rows(start: date, end: date):
+    """
+    Stream export rows through a server-side cursor, one yield_per batch at a time.
+    Uses its own session: the request-scoped one is closed before streaming starts.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(crud_sale.export_sales_stmt(start, end))
+        async for rows in result.partitions():
+            yield rows
+
 
+async def _export_csv(start: date, end: date):
+    yield crud_sale.export_csv_header()
+    async for rows in _export_rows(start, end):
+        yield crud_sale.export_csv_chunk(rows)
+
+
+async def _export_ndjson(start: date, end: date):
+    current, items = None, []
+    async for rows in _export_rows(start, end):
+        lines = []
+        for row in rows:
+            if current is not None and row.sale_id != current.sale_id:
+                lines.append(crud_sale.export_ndjson_line(current, items))
+                items = []
+            current = row
+            if row.item_id is not None:
+                items.append(row)
+        if lines:
+            yield "".join(lines)
+    if current is not None:
+        yield crud_sale.export_ndjson_line(current, items)
+
+
+@router.get("/export")
+async def export_sales(
+    start: date,
+    end: date,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user=Depends(require_role(["employer", "manager"]))
+):
+    """
+    📤 Export sales in a date range (inclusive) as a stream.
+    Roles: Employer, Manager only.
+    - `csv`: one row per sale item.
+    - `ndjson`: one JSON object per sale with nested items.
+    """
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be on or before end")
+    filename = f"sales_{start}_{end}.{format}"
+    if format == "csv":
+        body, media_type = _export_csv(start, end), "text/csv"
+    else:
+        body, media_type = _export_ndjson(start, end), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-@router.get("/{sale_id}", response_model=SaleOut)
-def read_sale(
+
+@router.get("/{sale_id}", response_model=SaleOut, dependencies=[Depends(etag(SALE_TABLES))])
+async def read_sale(
     sale_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ View a specific sale.
     Roles: Employer, Manager, Employee.
     """
-    sale = crud_sale.get_sale(db, sale_id)
+    sale = await run_sync(db, crud_sale.get_sale, sale_id, response_model=SaleOut)
     if not sale:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sale not found")
     return sale
 
 
 @router.post("/", response_model=SaleOut, status_code=status.HTTP_201_CREATED)
-def create_sale(
+async def create_sale(
     sale: SaleCreate,
-    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=100),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
@@ -52,23 +128,75 @@ def create_sale(
     - Day must be open.
     - Stock validation applied.
     - If sale is credit → Credit record is auto-created.
+    - Optional `Idempotency-Key` header (per caller): retries replay the first response.
     """
+    scope = ("sales.create", current_user.id, idempotency_key)
+    if idempotency_key:
+        try:
+            stored = await run_sync(db, crud_idempotency.reserve, *scope, sale)
+        except crud_idempotency.IdempotencyConflict as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        if stored:
+            return JSONResponse(
+                status_code=stored.status_code,
+                content=crud_idempotency.stored_body(stored),
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+    commits = crud_idempotency.commit_count(db)
+    try:
+        created = await run_sync(db, crud_sale.create_sale, sale, response_model=SaleOut)
+    except ValueError as e:
+        if idempotency_key:
+            await run_sync(db, crud_idempotency.fail, *scope, commits, status.HTTP_400_BAD_REQUEST, str(e))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception:
+        detail = "Failed to create sale due to server error"
+        if idempotency_key:
+            await run_sync(db, crud_idempotency.fail, *scope, commits, status.HTTP_500_INTERNAL_SERVER_ERROR, detail)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
+
+    if idempotency_key:
+        await run_sync(db, crud_idempotency.complete, *scope, status.HTTP_201_CREATED, created)
+    return created
+
+
+@router.post("/batch", response_model=SaleBatchOut, status_code=status.HTTP_201_CREATED)
+async def create_sales_batch(
+    sales: list[SaleCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_role(["employer", "manager", "employee"]))
+):
+    """
+    📦 Create many sales at once (offline POS sync).
+    Roles: Employer, Manager, Employee.
+    - Day must be open (checked once for the whole batch).
+    - Each sale succeeds or fails on its own; see `results`.
+    """
+    if not sales:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Batch is empty")
+    if len(sales) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch too large (max {MAX_BATCH_SIZE} sales)"
+        )
+
     try:
-        return crud_sale.create_sale(db, sale)
+        return await run_sync(db, crud_sale.create_sales_batch, sales)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create sale due to server error"
+            detail="Failed to create sales batch due to server error"
         )
 
 
 @router.put("/{sale_id}", response_model=SaleOut)
-def update_sale(
+async def update_sale(
     sale_id: int,
     sale: SaleUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -78,7 +206,7 @@ def update_sale(
     - Restores stock for old items before updating.
     """
     try:
-        updated = crud_sale.update_sale(db, sale_id, sale)
+        updated = await run_sync(db, crud_sale.update_sale, sale_id, sale, response_model=SaleOut)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception:
@@ -93,9 +221,9 @@ def update_sale(
 
 
 @router.delete("/{sale_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_sale(
+async def delete_sale(
     sale_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -105,7 +233,7 @@ def delete_sale(
     - Cascades delete credit if linked.
     """
     try:
-        deleted = crud_sale.delete_sale(db, sale_id)
+        deleted = await run_sync(db, crud_sale.delete_sale, sale_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,48 +1,58 @@
 # backend/routes/suppliers.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import get_db, run_sync
+from pagination import set_next_cursor
 from crud import supplier as crud_supplier
 from schemas.supplier import SupplierCreate, SupplierUpdate, SupplierOut
+from etag import etag
 from auth.dependencies import require_role
 
 router = APIRouter(prefix="/suppliers", tags=["Suppliers"])
 
+SUPPLIER_TABLES = {"suppliers"}
 
-@router.get("/", response_model=list[SupplierOut])
-def read_suppliers(
+
+@router.get("/", response_model=list[SupplierOut], dependencies=[Depends(etag(SUPPLIER_TABLES))])
+async def read_suppliers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ View all suppliers.
     Roles: Employer, Manager, Employee (view-only).
     """
-    return crud_supplier.get_suppliers(db, skip=skip, limit=limit)
+    try:
+        items = await run_sync(db, crud_supplier.get_suppliers, skip=skip, limit=limit, after=after, response_model=list[SupplierOut])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return set_next_cursor(response, items, limit)
 
 
-@router.get("/{supplier_id}", response_model=SupplierOut)
-def read_supplier(
+@router.get("/{supplier_id}", response_model=SupplierOut, dependencies=[Depends(etag(SUPPLIER_TABLES))])
+async def read_supplier(
     supplier_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager", "employee"]))
 ):
     """
     ✅ View supplier by ID.
     Roles: Employer, Manager, Employee (view-only).
     """
-    supplier = crud_supplier.get_supplier(db, supplier_id)
+    supplier = await run_sync(db, crud_supplier.get_supplier, supplier_id, response_model=SupplierOut)
     if not supplier:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
     return supplier
 
 
 @router.post("/", response_model=SupplierOut, status_code=status.HTTP_201_CREATED)
-def create_supplier(
+async def create_supplier(
     supplier: SupplierCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -50,16 +60,16 @@ def create_supplier(
     Roles: Employer, Manager only.
     """
     try:
-        return crud_supplier.create_supplier(db, supplier)
+        return await run_sync(db, crud_supplier.create_supplier, supplier, response_model=SupplierOut)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.put("/{supplier_id}", response_model=SupplierOut)
-def update_supplier(
+async def update_supplier(
     supplier_id: int,
     supplier: SupplierUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -67,7 +77,7 @@ def update_supplier(
     Roles: Employer, Manager only.
     """
     try:
-        updated = crud_supplier.update_supplier(db, supplier_id, supplier)
+        updated = await run_sync(db, crud_supplier.update_supplier, supplier_id, supplier, response_model=SupplierOut)
         if not updated:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
         return updated
@@ -76,9 +86,9 @@ def update_supplier(
 
 
 @router.delete("/{supplier_id}", status_code=status.HTTP_200_OK)
-def delete_supplier(
+async def delete_supplier(
     supplier_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user=Depends(require_role(["employer", "manager"]))
 ):
     """
@@ -87,7 +97,7 @@ def delete_supplier(
     Prevent deletion if supplier has products.
     """
     try:
-        deleted = crud_supplier.delete_supplier(db, supplier_id)
+        deleted = await run_sync(db, crud_supplier.delete_supplier, supplier_id)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Supplier not found")
         return {"ok": True, "message": "Supplier deleted successfully"}
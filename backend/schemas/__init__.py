@@ -3,8 +3,8 @@
 from .employee import EmployeeBase, EmployeeCreate, EmployeeUpdate, EmployeeOut, EmployeeRole
 from .category import CategoryBase, CategoryCreate, CategoryUpdate, CategoryOut
 from .supplier import SupplierBase, SupplierCreate, SupplierUpdate, SupplierOut
-from .product import ProductBase, ProductCreate, ProductUpdate, ProductOut
-from .sale import SaleBase, SaleCreate, SaleUpdate, SaleOut, SaleItemOut
+from .product import ProductBase, ProductCreate, ProductUpdate, ProductOut, StockMovementOut
+from .sale import SaleBase, SaleCreate, SaleUpdate, SaleOut, SaleItemOut, SaleBatchResult, SaleBatchOut
 from .credit import CreditBase, CreditCreate, CreditUpdate, CreditOut
 from .day import DayBase, DayCreate, DayUpdate, DayOut
 from .report import (
@@ -1,5 +1,5 @@
 # backend/schemas/day.py
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 from datetime import date, datetime
 from typing import Optional
 
@@ -24,11 +24,12 @@ class DayUpdate(BaseModel):
 # ===== OUT =====
 class DayOut(DayBase):
     id: int
+    day_date: date = Field(..., validation_alias=AliasChoices("day_date", "date"), description="Business day date")
     is_open: int
     opened_by_id: Optional[int]
     closed_by_id: Optional[int]
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
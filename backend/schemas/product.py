@@ -1,5 +1,5 @@
 # backend/schemas/product.py
-from pydantic import BaseModel, Field, StringConstraints, field_validator
+from pydantic import AliasChoices, BaseModel, Field, StringConstraints, field_validator
 from typing import Optional, Annotated
 from datetime import datetime
 
@@ -59,8 +59,43 @@ class ProductUpdate(BaseModel):
 # ====== OUT ======
 class ProductOut(ProductBase):
     id: int
+    stock: int = Field(
+        default=0,
+        validation_alias=AliasChoices("on_hand", "stock"),
+        description="Live stock (snapshot + pending ledger movements + shard counters)",
+    )
+    stock_shards: int = Field(default=0, description="Sharded stock counters (0 = off)")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ====== SEARCH ======
+class ProductSearchOut(BaseModel):
+    """Search hit (GET /products/search), best match first."""
+    id: int
+    name: str
+    sku: str
+    price: float
+    stock: int = Field(default=0, validation_alias=AliasChoices("on_hand", "stock"))
+    category_id: Optional[int] = None
+    supplier_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ====== STOCK LEDGER ======
+class StockMovementOut(BaseModel):
+    id: int
+    product_id: int
+    kind: str
+    quantity: int
+    sale_id: Optional[int] = None
+    applied: bool
     created_at: datetime
-    updated_at: datetime
 
     class Config:
         from_attributes = True
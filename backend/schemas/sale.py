@@ -45,8 +45,24 @@ class SaleOut(SaleBase):
     date: date
     total_amount: float = Field(..., ge=0, description="Total amount of the sale")
     items: List[SaleItemOut]
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+# ====== BATCH ======
+class SaleBatchResult(BaseModel):
+    """Outcome of one sale inside a batch (index = position in the request)."""
+    index: int
+    ok: bool
+    sale_id: Optional[int] = None
+    total_amount: Optional[float] = None
+    error: Optional[str] = None
+
+
+class SaleBatchOut(BaseModel):
+    created: int
+    failed: int
+    results: List[SaleBatchResult]
@@ -0,0 +1,82 @@
+# backend/tests/conftest.py
+"""
+Shared test setup: the app runs against a throwaway SQLite database.
+DATABASE_URL must be set before any app module (db.py) is imported.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix="ims-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/ims.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import models  # noqa: E402
+from app import app  # noqa: E402
+from db import Base, SessionLocal, engine  # noqa: E402
+from crud import search as crud_search  # noqa: E402
+from cache import report_cache  # noqa: E402
+from auth.jwt_handler import create_access_token, token_cache  # noqa: E402
+from auth.principals import principal_cache  # noqa: E402
+from auth.revocation import revocation_list  # noqa: E402
+
+API = "/api/v1"
+
+
+def bearer(employee: models.Employee) -> dict:
+    """Authorization header for `employee` (role claim included)."""
+    token = create_access_token({"sub": str(employee.id), "role": employee.role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="module")
+def db():
+    """Fresh schema (tables + search index) and a Session, per test module."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {crud_search.FTS_TABLE}")
+        crud_search.ensure_search_index(conn)
+    report_cache.clear()
+    principal_cache.clear()
+    token_cache.clear()
+    revocation_list.mark_stale()
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="module")
+def api(db):
+    """TestClient on the app (startup hooks run); server errors come back as 500s."""
+    with TestClient(app, raise_server_exceptions=False) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def shop(db):
+    """
+    Today's open day, an employer (boss) and an employee (ann), and two
+    products: bread (50.0, 10 in stock) and milk (60.0, 3 in stock).
+    `headers` authenticates as boss.
+    """
+    boss = models.Employee(name="Boss", role=models.EmployeeRole.employer, phone="0700000000", password_hash="x")
+    ann = models.Employee(name="Ann", role=models.EmployeeRole.employee, phone="0700000001", password_hash="x")
+    bread = models.Product(name="Bread", sku="BR-001", price=50.0, stock=10)
+    milk = models.Product(name="Milk", sku="MK-001", price=60.0, stock=3)
+    db.add_all([boss, ann, bread, milk, models.Day(date=date.today(), is_open=True)])
+    db.commit()
+    for product in (bread, milk):
+        crud_search.index_product(db, product)
+    db.commit()
+    return SimpleNamespace(boss=boss, ann=ann, bread=bread, milk=milk, headers=bearer(boss))
@@ -0,0 +1,146 @@
+# backend/tests/test_auth.py
+import pytest
+
+import models
+from auth.hashing import get_password_hash
+from conftest import API
+
+
+def hire(db, name: str, phone: str) -> models.Employee:
+    """A manager who can sign in as `name` / "secret1"."""
+    employee = models.Employee(
+        name=name, role=models.EmployeeRole.manager, phone=phone,
+        password_hash=get_password_hash("secret1"),
+    )
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+@pytest.fixture(scope="module")
+def mia(db, shop):
+    return hire(db, "Mia", "0700000002")
+
+
+@pytest.fixture(scope="module")
+def raj(db, shop):
+    return hire(db, "Raj", "0700000003")
+
+
+def sign_in(api, username="Mia", password="secret1") -> dict:
+    r = api.post(f"{API}/auth/login-json", json={"username": username, "password": password})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def auth(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def refresh(api, tokens: dict):
+    return api.post(f"{API}/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+
+# ===== PASSWORD CHANGE =====
+def test_password_change_signs_out_other_sessions(api, mia):
+    laptop, phone = sign_in(api), sign_in(api)
+    assert api.get(f"{API}/employees/{mia.id}", headers=auth(phone)).status_code == 200
+
+    r = api.put(f"{API}/employees/me/password", json={"new_password": "secret2"}, headers=auth(laptop))
+    assert r.status_code == 200, r.text
+    fresh = r.json()
+
+    for old in (laptop, phone):
+        assert api.get(f"{API}/employees/{mia.id}", headers=auth(old)).status_code == 401
+        assert refresh(api, old).status_code == 401
+
+    # The session that changed the password carries on with its new tokens.
+    assert api.get(f"{API}/employees/{mia.id}", headers=auth(fresh)).status_code == 200
+    assert refresh(api, fresh).status_code == 200
+    sign_in(api, password="secret2")
+
+
+# ===== REFRESH =====
+
+def test_refresh_rotates_and_reuse_revokes_the_family(api, raj):
+    laptop, phone = sign_in(api, "Raj"), sign_in(api, "Raj")
+
+    resp = refresh(api, laptop)
+    assert resp.status_code == 200, resp.text
+    rotated = resp.json()
+    assert rotated["refresh_token"] != laptop["refresh_token"]
+    assert api.get(f"{API}/employees/{raj.id}", headers=auth(rotated)).status_code == 200
+
+    # Replaying the spent token (e.g. stolen) ends that sign-in, including its newer token.
+    resp = refresh(api, laptop)
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Refresh token already used; please sign in again"
+    assert refresh(api, rotated).status_code == 401
+
+    # Other sign-ins are separate families.
+    assert refresh(api, phone).status_code == 200
+
+
+# ===== LOGIN NAMES =====
+def test_login_name_ignores_case_and_spacing(api, db, shop):
+    zoe = hire(db, "Zoe  Ray", "0700000004")
+    assert zoe.login_name == "zoe ray"
+
+    for username in ("Zoe Ray", "  zoe ray ", "ZOE\tRAY", "zoe   RAY"):
+        tokens = sign_in(api, username)
+        assert api.get(f"{API}/employees/{zoe.id}", headers=auth(tokens)).status_code == 200
+    resp = api.post(f"{API}/auth/login", data={"username": "ZOE RAY", "password": "secret1"})
+    assert resp.status_code == 200, resp.text
+    assert api.post(f"{API}/auth/login-json", json={"username": "Zoe Rae", "password": "secret1"}).status_code == 401
+
+
+def test_names_colliding_after_normalization_are_rejected(api, db, shop):
+    resp = api.post(f"{API}/employees/", headers=shop.headers, json={
+        "name": " zoe RAY", "role": "employee", "phone": "0700000005", "password": "secret1",
+    })
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "An employee with this name already exists."
+
+    resp = api.put(f"{API}/employees/{shop.ann.id}", headers=shop.headers, json={
+        "name": "ZOE RAY", "role": "employee", "phone": shop.ann.phone, "status": "active", "password": None,
+    })
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "An employee with this name already exists."
+
+    # Renaming an employee to a spelling of their own name is fine.
+    resp = api.put(f"{API}/employees/{shop.ann.id}", headers=shop.headers, json={
+        "name": "ANN", "role": "employee", "phone": shop.ann.phone, "status": "active", "password": None,
+    })
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["name"] == "ANN"
+
+
+# ===== REVOCATION =====
+def test_logout_revokes_the_token_at_once(api, db, shop):
+    kim = hire(db, "Kim", "0700000006")
+    laptop, phone = sign_in(api, "Kim"), sign_in(api, "Kim")
+
+    resp = api.post(f"{API}/auth/logout", headers=auth(laptop), json={"refresh_token": laptop["refresh_token"]})
+    assert resp.status_code == 204
+    assert api.get(f"{API}/employees/{kim.id}", headers=auth(laptop)).status_code == 401
+    assert refresh(api, laptop).status_code == 401
+    assert api.get(f"{API}/employees/{kim.id}", headers=auth(phone)).status_code == 200
+
+    resp = api.post(f"{API}/auth/logout", headers=auth(phone), json={"all_sessions": True})
+    assert resp.status_code == 204
+    assert api.get(f"{API}/employees/{kim.id}", headers=auth(phone)).status_code == 401
+    assert refresh(api, phone).status_code == 401
+
+
+def test_deactivated_employee_is_signed_out(api, db, shop):
+    lea = hire(db, "Lea", "0700000007")
+    tokens = sign_in(api, "Lea")
+    assert api.get(f"{API}/employees/{lea.id}", headers=auth(tokens)).status_code == 200
+
+    resp = api.put(f"{API}/employees/{lea.id}", headers=shop.headers, json={
+        "name": "Lea", "role": "manager", "phone": lea.phone, "status": "inactive", "password": None,
+    })
+    assert resp.status_code == 200, resp.text
+    assert api.get(f"{API}/employees/{lea.id}", headers=auth(tokens)).status_code == 401
+    assert refresh(api, tokens).status_code == 401
+    assert api.post(f"{API}/auth/login-json", json={"username": "Lea", "password": "secret1"}).status_code == 403
@@ -0,0 +1,51 @@
+# backend/tests/test_day_snapshots.py
+"""A closed day's report is frozen at close_day and re-frozen after a late change."""
+from datetime import date
+
+import models
+from conftest import API
+
+
+def daily(api, shop) -> dict:
+    resp = api.get(f"{API}/reports/daily", headers=shop.headers)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_closed_day_is_served_from_its_snapshot(api, shop, db):
+    def sale(product, quantity, is_credit=False):
+        resp = api.post(f"{API}/sales/", headers=shop.headers, json={
+            "employee_id": shop.ann.id, "is_credit": is_credit,
+            "items": [{"product_id": product.id, "quantity": quantity}],
+        })
+        assert resp.status_code == 201, resp.text
+        return resp.json()["id"]
+
+    cash = sale(shop.bread, 2)
+    credit = sale(shop.milk, 1, is_credit=True)
+    credit_id = next(c["id"] for c in api.get(f"{API}/credits/", headers=shop.headers).json() if c["sale_id"] == credit)
+    assert api.put(f"{API}/credits/{credit_id}", headers=shop.headers, json={"status": "cleared"}).status_code == 200
+
+    resp = api.post(f"{API}/days/close", headers=shop.headers)
+    assert resp.status_code == 200, resp.text
+    report = daily(api, shop)
+    assert report["sales_summary"]["total_sales"] == 160.0
+    assert report["credit_summary"]["cleared_credits"] == 60.0
+    assert report["day_report"]["is_open"] == 0
+    assert report["day_report"]["closed_by"] == "Boss"
+
+    # Drift the live totals: the closed day keeps answering from its snapshot.
+    rollup = db.get(models.DailyRollup, date.today())
+    rollup.total_sales += 1000
+    db.commit()
+    assert daily(api, shop) == report
+    rollup.total_sales -= 1000
+    db.commit()
+
+    # A late change re-freezes the day.
+    assert api.delete(f"{API}/sales/{cash}", headers=shop.headers).status_code == 204
+    report = daily(api, shop)
+    assert report["sales_summary"]["total_sales"] == 60.0
+    assert report["sales_summary"]["number_of_sales"] == 1
+    db.expire_all()
+    assert '"total_sales":60.0' in db.get(models.DaySnapshot, date.today()).report
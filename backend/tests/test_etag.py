@@ -0,0 +1,34 @@
+# backend/tests/test_etag.py
+"""Conditional GET: If-None-Match with the current ETag is a bodiless 304."""
+from conftest import API, bearer
+
+
+def test_unchanged_list_is_not_modified(api, shop):
+    first = api.get(f"{API}/products/", headers=shop.headers)
+    assert first.status_code == 200
+    tag = first.headers["ETag"]
+    assert tag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    resp = api.get(f"{API}/products/", headers={**shop.headers, "If-None-Match": tag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == tag
+
+    # Another caller or other query parameters never share the tag.
+    assert api.get(f"{API}/products/", headers={**bearer(shop.ann), "If-None-Match": tag}).status_code == 200
+    assert api.get(f"{API}/products/?limit=1", headers={**shop.headers, "If-None-Match": tag}).status_code == 200
+
+
+def test_write_changes_the_etag(api, shop):
+    tag = api.get(f"{API}/reports/inventory", headers=shop.headers).headers["ETag"]
+    assert api.get(f"{API}/reports/inventory", headers={**shop.headers, "If-None-Match": tag}).status_code == 304
+
+    resp = api.post(f"{API}/sales/", headers=shop.headers, json={
+        "employee_id": shop.ann.id, "items": [{"product_id": shop.bread.id, "quantity": 1}],
+    })
+    assert resp.status_code == 201, resp.text
+    resp = api.get(f"{API}/reports/inventory", headers={**shop.headers, "If-None-Match": tag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != tag
+    assert {row["sku"]: row["stock"] for row in resp.json()}["BR-001"] == 9
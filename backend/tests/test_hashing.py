@@ -0,0 +1,49 @@
+# backend/tests/test_hashing.py
+"""Bounded hashing pool: at most workers + queue_limit jobs, the rest are shed with a 503."""
+import asyncio
+import threading
+
+import pytest
+
+from auth import hashing
+from auth.hashing import HashPool, HashPoolBusy
+from conftest import API
+
+
+def test_pool_sheds_load_beyond_its_queue():
+    pool = HashPool(workers=1, queue_limit=1, kind="thread")
+    gate = threading.Event()
+
+    async def storm():
+        jobs = [asyncio.ensure_future(pool.run(gate.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HashPoolBusy):
+            await pool.run(gate.wait, 5)
+
+        # A caller that gives up does not free its slot while its hash is still running.
+        jobs[0].cancel()
+        await asyncio.sleep(0.05)
+        with pytest.raises(HashPoolBusy):
+            await pool.run(gate.wait, 5)
+
+        gate.set()
+        assert await jobs[1] is True
+        while pool.in_flight:
+            await asyncio.sleep(0.01)
+        return await pool.run(lambda: "free again")
+
+    try:
+        assert asyncio.run(storm()) == "free again"
+    finally:
+        gate.set()
+        pool.shutdown()
+    stats = pool.stats()
+    assert (stats["rejected"], stats["completed"], stats["in_flight"]) == (2, 3, 0)
+
+
+def test_login_gets_503_when_the_pool_is_full(api, shop, monkeypatch):
+    monkeypatch.setattr(hashing, "hash_pool", HashPool(workers=0, queue_limit=0))
+    resp = api.post(f"{API}/auth/login-json", json={"username": "Boss", "password": "whatever"})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert resp.json()["detail"] == "Too many concurrent logins, please retry"
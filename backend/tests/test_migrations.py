@@ -0,0 +1,40 @@
+# backend/tests/test_migrations.py
+"""
+Migration guard: `alembic upgrade head` on an empty database must build the
+schema models.py describes (indexes included), and the last step must
+downgrade and upgrade again.
+
+Alembic runs in a subprocess: env.py reads DATABASE_URL at import, and this
+needs a database of its own.
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic(database: str, *args) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", *args], cwd=BACKEND, env=env, capture_output=True, text=True,
+    )
+
+
+def indexes(database: str) -> set:
+    with sqlite3.connect(database) as conn:
+        return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_migrations_match_the_models(tmp_path):
+    database = str(tmp_path / "migrated.db")
+    for args in (("upgrade", "head"), ("check",), ("downgrade", "-1"), ("upgrade", "head"), ("check",)):
+        result = alembic(database, *args)
+        assert result.returncode == 0, f"alembic {' '.join(args)}:\n{result.stdout}{result.stderr}"
+
+    # The report / sale hot paths rely on these (tests/test_query_plans.py)
+    assert {
+        "ix_sales_date", "ix_sales_employee_date", "ix_sale_items_sale_product", "ix_sale_items_product_id",
+        "ix_credits_sale_status", "ix_credits_status", "ix_stock_movements_applied_product",
+    } <= indexes(database)
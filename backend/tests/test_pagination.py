@@ -0,0 +1,47 @@
+# backend/tests/test_pagination.py
+"""Keyset pagination: follow X-Next-Cursor until it is absent."""
+import pytest
+
+import models
+from conftest import API
+from pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture(scope="module")
+def catalog(db, shop):
+    """Bread and Milk plus three more products: five in all."""
+    db.add_all([
+        models.Product(name=name, sku=f"{name[:2].upper()}-001", price=10.0, stock=1)
+        for name in ("Eggs", "Flour", "Sugar")
+    ])
+    db.commit()
+    return [product.id for product in db.query(models.Product).order_by(models.Product.id)]
+
+
+def test_cursor_pages_cover_every_row_once(api, shop, catalog):
+    seen, pages, params = [], 0, {"limit": 2}
+    while True:
+        resp = api.get(f"{API}/products/", params=params, headers=shop.headers)
+        assert resp.status_code == 200, resp.text
+        seen += [product["id"] for product in resp.json()]
+        pages += 1
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        params = {"limit": 2, "after": cursor}
+    assert seen == catalog
+    assert pages == 3
+
+    # A full last page still gets a cursor; the page after it is empty.
+    resp = api.get(f"{API}/products/", params={"limit": 5}, headers=shop.headers)
+    resp = api.get(f"{API}/products/", params={"limit": 5, "after": resp.headers[NEXT_CURSOR_HEADER]}, headers=shop.headers)
+    assert resp.json() == []
+    assert NEXT_CURSOR_HEADER not in resp.headers
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eyJ4IjoxfQ", ""])
+def test_malformed_cursor_is_a_400(api, shop, cursor):
+    resp = api.get(f"{API}/products/", params={"after": cursor}, headers=shop.headers)
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Invalid pagination cursor"
+    assert api.get(f"{API}/employees/", params={"after": cursor}, headers=shop.headers).status_code == 400
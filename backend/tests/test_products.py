@@ -0,0 +1,49 @@
+# backend/tests/test_products.py
+"""Product CRUD over the API: stock goes through the ledger, other fields are plain updates."""
+from conftest import API
+
+
+def test_update_sku_and_stock_in_one_request(api, shop):
+    resp = api.put(f"{API}/products/{shop.bread.id}", headers=shop.headers, json={
+        "name": "Bread", "sku": "br-new", "price": 55.0, "stock": 20, "category_id": None, "supplier_id": None,
+    })
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert (body["sku"], body["price"], body["stock"]) == ("BR-NEW", 55.0, 20)
+
+    body = api.get(f"{API}/products/{shop.bread.id}", headers=shop.headers).json()
+    assert (body["sku"], body["price"], body["stock"]) == ("BR-NEW", 55.0, 20)
+
+
+def test_stock_shards_route_switches_modes_and_keeps_stock(api, shop):
+    resp = api.put(f"{API}/products/{shop.milk.id}/stock-shards", params={"shards": 2}, headers=shop.headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == {"ok": True, "stock_shards": 2, "stock": 3}
+
+    resp = api.put(f"{API}/products/{shop.milk.id}/stock-shards", params={"shards": 0}, headers=shop.headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == {"ok": True, "stock_shards": 0, "stock": 3}
+
+    resp = api.put(f"{API}/products/{shop.milk.id}/stock-shards", params={"shards": 1000}, headers=shop.headers)
+    assert resp.status_code == 400
+    assert api.put(f"{API}/products/999/stock-shards", params={"shards": 2}, headers=shop.headers).status_code == 404
+
+
+def test_deleting_a_product_keeps_its_stock_ledger(api, shop):
+    resp = api.post(f"{API}/products/", headers=shop.headers, json={
+        "name": "Jam", "sku": "JM-001", "price": 80.0, "stock": 4, "category_id": None, "supplier_id": None,
+    })
+    assert resp.status_code in (200, 201), resp.text
+    jam = resp.json()["id"]
+    resp = api.put(f"{API}/products/{jam}", headers=shop.headers, json={
+        "name": "Jam", "sku": "JM-001", "price": 80.0, "stock": 6, "category_id": None, "supplier_id": None,
+    })
+    assert resp.status_code == 200, resp.text
+
+    assert api.delete(f"{API}/products/{jam}", headers=shop.headers).status_code == 200
+    assert api.get(f"{API}/products/{jam}", headers=shop.headers).status_code == 404
+
+    resp = api.get(f"{API}/products/{jam}/stock-movements", headers=shop.headers)
+    assert resp.status_code == 200, resp.text
+    assert [(m["kind"], m["quantity"]) for m in resp.json()] == [("adjustment", 2), ("receipt", 4)]
+    assert api.get(f"{API}/products/999/stock-movements", headers=shop.headers).status_code == 404
@@ -0,0 +1,75 @@
+# backend/tests/test_query_counts.py
+"""
+Query-count guard for list endpoints (catches N+1 regressions).
+
+Calls each list endpoint at two page sizes: it must answer 200 both times,
+with the same number of SQL statements.
+"""
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import models
+from app import app
+from db import async_engine
+from auth.jwt_handler import create_access_token
+from auth.revocation import revocation_list
+
+ENDPOINTS = ["/sales/", "/credits/", "/products/", "/employees/", "/suppliers/", "/categories/", "/days/"]
+PAGE_SIZES = (5, 50)
+SALES = 60
+
+
+def seed(db) -> str:
+    boss = models.Employee(name="Boss", role=models.EmployeeRole.employer, phone="0700000000", password_hash="x")
+    db.add_all([boss, models.Day(date=date.today(), is_open=True)])
+    products = [models.Product(name=f"P{i}", sku=f"SKU{i}", price=10 + i, stock=1000) for i in range(5)]
+    db.add_all(products)
+    db.flush()
+    for n in range(SALES):
+        sale = models.Sale(employee_id=boss.id, date=date.today(), total_amount=0)
+        sale.items = [
+            models.SaleItem(product_id=p.id, quantity=1, price=p.price) for p in products[: 1 + n % 3]
+        ]
+        sale.total_amount = sum(i.price for i in sale.items)
+        db.add(sale)
+        if n % 4 == 0:
+            db.add(models.Credit(sale=sale, employee_id=boss.id, amount=sale.total_amount, status="open"))
+    db.commit()
+    return create_access_token({"sub": str(boss.id), "role": "employer"})
+
+
+@pytest.fixture(scope="module")
+def client(db):
+    token = seed(db)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        client.headers["Authorization"] = f"Bearer {token}"
+        client.get("/api/v1/categories/")  # warm the principal cache and revocation list
+        yield client
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    """Counter of SQL statements sent by the API (revocation reloads held off)."""
+    monkeypatch.setattr(revocation_list, "sync_interval", float("inf"))
+    counter = {"n": 0}
+
+    def count(*_):
+        counter["n"] += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_list_statements_do_not_grow_with_page_size(client, statements, path):
+    counts = {}
+    for size in PAGE_SIZES:
+        statements["n"] = 0
+        resp = client.get(f"/api/v1{path}", params={"limit": size})
+        assert resp.status_code == 200, f"{path}?limit={size}: HTTP {resp.status_code} {resp.text[:200]}"
+        counts[size] = statements["n"]
+    assert len(set(counts.values())) == 1, f"{path}: statements grow with page size {counts}"
@@ -0,0 +1,97 @@
+# backend/tests/test_query_plans.py
+"""
+Index guard for the report / sale / login hot paths.
+
+Runs each hot CRUD path, captures the SELECTs it emits and checks
+`EXPLAIN QUERY PLAN` for every one: a full `SCAN` of a table fails the test
+(an FTS5 MATCH lookup is not a scan).
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+import models
+from db import engine
+from crud import day as crud_day, employee as crud_employee, report as crud_report
+from crud import sale as crud_sale, search as crud_search
+from schemas.sale import SaleCreate
+
+TODAY = date.today()
+HOT_PATHS = {
+    "daily_sales_report": lambda db, boss: crud_report.daily_sales_report(db, TODAY),
+    "top_products_report": lambda db, boss: crud_report.top_products_report(db, TODAY - timedelta(days=30), TODAY),
+    "credit_report": lambda db, boss: crud_report.credit_report(db, "cleared"),
+    "login_lookup": lambda db, boss: crud_employee.get_employee_by_login(db, " boss "),
+    "product_search": lambda db, boss: crud_search.search_products(db, "bre"),
+    # Last: closes the day (snapshot + stock compaction)
+    "close_day": lambda db, boss: crud_day.close_day(db, boss.id),
+}
+
+
+def is_full_scan(detail: str) -> bool:
+    if detail == "SCAN CONSTANT ROW":
+        return False
+    if "VIRTUAL TABLE INDEX" in detail:
+        return ":M" not in detail  # FTS5 plan string: M = full-text MATCH
+    return detail.startswith("SCAN ")
+
+
+@pytest.fixture(scope="module")
+def boss(db):
+    """An open day with sales through the real write path; the credit is cleared so close_day can run."""
+    boss = models.Employee(
+        name="Boss", login_name="boss", role=models.EmployeeRole.employer, phone="0700000000", password_hash="x",
+    )
+    bread = models.Product(name="Bread", sku="BR", price=50, stock=100)
+    milk = models.Product(name="Milk", sku="MK", price=60, stock=100)
+    db.add_all([boss, bread, milk, models.Day(date=TODAY, is_open=True)])
+    db.commit()
+    for product in (bread, milk):
+        crud_search.index_product(db, product)
+    db.commit()
+
+    crud_sale.create_sale(db, SaleCreate(employee_id=boss.id, items=[{"product_id": bread.id, "quantity": 2}]))
+    credit_sale = crud_sale.create_sale(db, SaleCreate(
+        employee_id=boss.id, items=[{"product_id": milk.id, "quantity": 1}], is_credit=True,
+    ))
+    credit_sale.credit.status = "cleared"
+    db.commit()
+    return boss
+
+
+@pytest.fixture
+def selects():
+    """SELECT statements (with parameters) sent while the test runs."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+@pytest.mark.parametrize("name", HOT_PATHS)
+def test_hot_path_has_no_full_scan(db, boss, selects, name):
+    db.expire_all()
+    HOT_PATHS[name](db, boss)
+    statements = list(selects)
+    assert statements, f"{name}: no SELECT captured"
+
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            scans += [f"{row[-1]}  <-  {' '.join(statement.split())[:120]}" for row in plan if is_full_scan(row[-1])]
+    assert not scans, f"{name}: full scan\n" + "\n".join(scans)
+
+
+def test_close_day_reached_the_snapshot(db, boss):
+    """Guards the seed: close_day must have run past the open-credit check."""
+    db.expire_all()
+    day = db.query(models.Day).filter(models.Day.date == TODAY).one()
+    assert not day.is_open
+    assert db.get(models.DaySnapshot, TODAY) is not None
@@ -0,0 +1,54 @@
+# backend/tests/test_report_cache.py
+"""Report cache: hits until a write touches a table the report reads; concurrent misses compute once."""
+import asyncio
+
+from cache import ReportCache, report_cache
+from conftest import API
+
+
+def low_stock(api, shop) -> dict:
+    resp = api.get(f"{API}/reports/inventory", headers=shop.headers)
+    assert resp.status_code == 200, resp.text
+    return {row["sku"]: row["stock"] for row in resp.json()}
+
+
+def test_write_invalidates_cached_report(api, shop):
+    assert low_stock(api, shop) == {"BR-001": 10, "MK-001": 3}
+    hits = report_cache.hits
+    assert low_stock(api, shop) == {"BR-001": 10, "MK-001": 3}
+    assert report_cache.hits == hits + 1
+
+    invalidations = report_cache.invalidations
+    resp = api.post(f"{API}/sales/", headers=shop.headers, json={
+        "employee_id": shop.ann.id, "items": [{"product_id": shop.milk.id, "quantity": 1}],
+    })
+    assert resp.status_code == 201, resp.text
+    assert report_cache.invalidations > invalidations
+    assert low_stock(api, shop) == {"BR-001": 10, "MK-001": 2}
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = ReportCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"total": len(calls)}
+
+    async def burst():
+        return await asyncio.gather(*(cache.get_or_compute("daily", {"sales"}, compute) for _ in range(5)))
+
+    assert asyncio.run(burst()) == [{"total": 1}] * 5
+    assert (len(calls), cache.misses, cache.coalesced) == (1, 1, 4)
+
+    # A write landing mid-flight: the result still reaches its callers but is not cached.
+    async def write_during_compute():
+        task = asyncio.ensure_future(cache.get_or_compute("credits", {"credits"}, compute))
+        await asyncio.sleep(0)
+        cache.invalidate({"credits"})
+        return await task
+
+    assert asyncio.run(write_during_compute()) == {"total": 2}
+    assert cache.stats()["size"] == 1  # only "daily"
+    assert asyncio.run(cache.get_or_compute("credits", {"credits"}, compute)) == {"total": 3}
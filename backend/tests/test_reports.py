@@ -0,0 +1,57 @@
+# backend/tests/test_reports.py
+"""Report endpoints: live stock, snapshots of closed days, caching and ETags."""
+import models
+from conftest import API
+
+
+def test_inventory_report_lists_low_live_stock_with_names(api, db, shop):
+    category = models.Category(name="Dairy")
+    supplier = models.Supplier(name="Farm Co")
+    db.add_all([category, supplier])
+    db.flush()
+    shop.milk.category_id, shop.milk.supplier_id = category.id, supplier.id
+    db.commit()
+
+    # A pending sale movement counts: milk 3 -> 2 (on_hand), bread stays at 10
+    resp = api.post(f"{API}/sales/", headers=shop.headers, json={
+        "employee_id": shop.ann.id, "items": [{"product_id": shop.milk.id, "quantity": 1}],
+    })
+    assert resp.status_code == 201, resp.text
+
+    resp = api.get(f"{API}/reports/inventory", params={"threshold": 5}, headers=shop.headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == [{"product": "Milk", "sku": "MK-001", "stock": 2, "category": "Dairy", "supplier": "Farm Co"}]
+
+
+def test_sales_grouped_by_employee_and_category(api, db, shop):
+    bakery = models.Category(name="Bakery")
+    db.add(bakery)
+    db.flush()
+    shop.bread.category_id = bakery.id
+    db.commit()
+
+    for employee, items, is_credit in (
+        (shop.boss, [(shop.bread, 2)], True),
+        (shop.ann, [(shop.bread, 1), (shop.milk, 1)], False),
+    ):
+        resp = api.post(f"{API}/sales/", headers=shop.headers, json={
+            "employee_id": employee.id, "is_credit": is_credit,
+            "items": [{"product_id": p.id, "quantity": q} for p, q in items],
+        })
+        assert resp.status_code == 201, resp.text
+
+    report = api.get(f"{API}/reports/daily", headers=shop.headers).json()
+    by_employee = {row["employee_name"]: row for row in report["sales_by_employee"]}
+    assert {name: (row["total_sales"], row["total_credits"], row["total_cash"], row["number_of_sales"])
+            for name, row in by_employee.items()} == {
+        "Boss": (100.0, 100.0, 0.0, 1),
+        "Ann": (170.0, 0.0, 170.0, 2),  # with the milk sale above
+    }
+    assert {row["category_name"]: (row["total_sales"], row["number_of_items"])
+            for row in report["sales_by_category"]} == {"Bakery": (150.0, 3), "Dairy": (120.0, 2)}
+
+    today = report["day_report"]["date"]
+    period = api.get(f"{API}/reports/period", params={"start_date": today, "end_date": today}, headers=shop.headers)
+    assert period.status_code == 200, period.text
+    assert period.json()["sales_by_employee"] == report["sales_by_employee"]
+    assert period.json()["sales_by_category"] == report["sales_by_category"]
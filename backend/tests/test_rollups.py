@@ -0,0 +1,74 @@
+# backend/tests/test_rollups.py
+"""Rollups kept up to date on every write must match a rebuild from the source rows."""
+import pytest
+
+import models
+from conftest import API
+from crud.rollup import rebuild_rollups
+
+
+def rows(db, model, *key) -> dict:
+    """Table contents keyed by primary key, all-zero rows dropped (a rebuild never writes them)."""
+    db.expire_all()
+    counters = [c.name for c in model.__table__.columns if c.name not in key and c.name != "updated_at"]
+    table = {}
+    for row in db.query(model):
+        values = tuple(getattr(row, name) for name in counters)
+        if any(values):
+            table[tuple(getattr(row, name) for name in key)] = values
+    return table
+
+
+@pytest.fixture(scope="module")
+def trading(db, api, shop):
+    """
+    A day of sales, credits, edits and deletes, all through the API.
+    Returns the rollup tables as the writes left them (before any rebuild).
+    """
+    def sale(*items, is_credit=False):
+        resp = api.post(f"{API}/sales/", headers=shop.headers, json={
+            "employee_id": shop.ann.id, "is_credit": is_credit,
+            "items": [{"product_id": p.id, "quantity": q} for p, q in items],
+        })
+        assert resp.status_code == 201, resp.text
+        return resp.json()["id"]
+
+    sale((shop.bread, 2), (shop.milk, 1))
+    edited = sale((shop.bread, 1))
+    credit = sale((shop.milk, 1), is_credit=True)
+    sale((shop.bread, 1), is_credit=True)
+    deleted = sale((shop.bread, 3))
+    resp = api.post(f"{API}/sales/batch", headers=shop.headers, json=[
+        {"employee_id": shop.ann.id, "items": [{"product_id": shop.bread.id, "quantity": 1}], "is_credit": True},
+        {"employee_id": shop.ann.id, "items": [{"product_id": shop.milk.id, "quantity": 5}]},  # fails
+    ])
+    assert resp.json()["created"] == 1
+
+    resp = api.put(f"{API}/sales/{edited}", headers=shop.headers, json={"items": [
+        {"product_id": shop.bread.id, "quantity": 2}, {"product_id": shop.milk.id, "quantity": 1},
+    ]})
+    assert resp.status_code == 200, resp.text
+    credits = api.get(f"{API}/credits/", headers=shop.headers).json()
+    credit_id = next(c["id"] for c in credits if c["sale_id"] == credit)
+    resp = api.put(f"{API}/credits/{credit_id}", headers=shop.headers, json={"status": "cleared"})
+    assert resp.status_code == 200, resp.text
+    assert api.delete(f"{API}/sales/{deleted}", headers=shop.headers).status_code == 204
+
+    return {
+        "daily": rows(db, models.DailyRollup, "date"),
+        "product_daily": rows(db, models.ProductDailySales, "date", "product_id"),
+        "product_monthly": rows(db, models.ProductMonthlySales, "month", "product_id"),
+    }
+
+
+def test_daily_rollups_match_a_rebuild(db, trading):
+    assert trading["daily"]
+    rebuild_rollups(db)
+    assert rows(db, models.DailyRollup, "date") == trading["daily"]
+
+
+def test_product_counters_match_a_rebuild(db, trading):
+    assert len(trading["product_daily"]) == len(trading["product_monthly"]) == 2
+    rebuild_rollups(db)
+    assert rows(db, models.ProductDailySales, "date", "product_id") == trading["product_daily"]
+    assert rows(db, models.ProductMonthlySales, "month", "product_id") == trading["product_monthly"]
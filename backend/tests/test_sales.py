@@ -0,0 +1,91 @@
+# backend/tests/test_sales.py
+"""Sales over the API: stock is checked for the whole basket before anything is taken."""
+from conftest import API, bearer
+
+
+def stock(api, shop, product) -> int:
+    return api.get(f"{API}/products/{product.id}", headers=shop.headers).json()["stock"]
+
+
+# ===== CREATE =====
+def test_every_shortage_is_reported_at_once(api, shop):
+    resp = api.post(f"{API}/sales/", headers=shop.headers, json={"employee_id": shop.ann.id, "items": [
+        {"product_id": shop.bread.id, "quantity": 11},
+        {"product_id": shop.milk.id, "quantity": 2},
+        {"product_id": shop.milk.id, "quantity": 2},  # 4 in total: repeated lines are merged
+        {"product_id": 999, "quantity": 1},
+    ]})
+    assert resp.status_code == 400
+    assert resp.json()["detail"].split("; ") == [
+        "Not enough stock for product Bread (available: 10, requested: 11)",
+        "Not enough stock for product Milk (available: 3, requested: 4)",
+        "Product with ID 999 not found",
+    ]
+    assert (stock(api, shop, shop.bread), stock(api, shop, shop.milk)) == (10, 3)
+
+    resp = api.post(f"{API}/sales/", headers=shop.headers, json={"employee_id": shop.ann.id, "items": [
+        {"product_id": shop.bread.id, "quantity": 2},
+        {"product_id": shop.milk.id, "quantity": 1},
+    ]})
+    assert resp.status_code == 201, resp.text
+    assert resp.json()["total_amount"] == 160.0
+    assert (stock(api, shop, shop.bread), stock(api, shop, shop.milk)) == (8, 2)
+
+
+# ===== BATCH =====
+def test_batch_keeps_the_sales_that_fit(api, shop):
+    resp = api.post(f"{API}/sales/batch", headers=shop.headers, json=[
+        {"employee_id": shop.ann.id, "items": [{"product_id": shop.bread.id, "quantity": 3}]},
+        {"employee_id": shop.ann.id, "items": [{"product_id": shop.milk.id, "quantity": 3}]},
+        {"employee_id": shop.ann.id, "items": [{"product_id": shop.milk.id, "quantity": 2}], "is_credit": True},
+        {"employee_id": 999, "items": [{"product_id": shop.bread.id, "quantity": 1}]},
+        {"employee_id": shop.ann.id, "items": [{"product_id": shop.milk.id, "quantity": 1}]},  # milk is gone
+    ])
+    assert resp.status_code == 201, resp.text
+    body = resp.json()
+    assert (body["created"], body["failed"]) == (2, 3)
+    assert [r["ok"] for r in body["results"]] == [True, False, True, False, False]
+    assert "Not enough stock for product Milk (available: 2, requested: 3)" in body["results"][1]["error"]
+    assert body["results"][3]["error"] == "Employee not found"
+    assert "Not enough stock for product Milk (available: 0, requested: 1)" in body["results"][4]["error"]
+    assert (stock(api, shop, shop.bread), stock(api, shop, shop.milk)) == (5, 0)
+
+    for result in body["results"]:
+        if result["ok"]:
+            sale = api.get(f"{API}/sales/{result['sale_id']}", headers=shop.headers)
+            assert sale.status_code == 200
+            assert sale.json()["total_amount"] == result["total_amount"]
+    assert [r["total_amount"] for r in body["results"] if r["ok"]] == [150.0, 120.0]
+
+
+# ===== IDEMPOTENCY =====
+def test_idempotent_retry_replays_the_first_sale(api, shop):
+    basket = {"employee_id": shop.ann.id, "items": [{"product_id": shop.bread.id, "quantity": 1}]}
+    headers = {**shop.headers, "Idempotency-Key": "till-1-0001"}
+
+    first = api.post(f"{API}/sales/", headers=headers, json=basket)
+    assert first.status_code == 201, first.text
+    retry = api.post(f"{API}/sales/", headers=headers, json=basket)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert stock(api, shop, shop.bread) == 4
+
+    other = {**basket, "items": [{"product_id": shop.bread.id, "quantity": 2}]}
+    resp = api.post(f"{API}/sales/", headers=headers, json=other)
+    assert resp.status_code == 409
+    assert stock(api, shop, shop.bread) == 4
+
+    # A sale that failed without writing anything frees its key for a real retry.
+    short = {"employee_id": shop.ann.id, "items": [{"product_id": shop.milk.id, "quantity": 1}]}
+    headers = {**shop.headers, "Idempotency-Key": "till-1-0002"}
+    assert api.post(f"{API}/sales/", headers=headers, json=short).status_code == 400
+    retry = api.post(f"{API}/sales/", headers=headers, json=short)
+    assert retry.status_code == 400
+    assert "Idempotent-Replayed" not in retry.headers
+
+    # Keys are scoped to the caller.
+    resp = api.post(f"{API}/sales/", headers={**bearer(shop.ann), "Idempotency-Key": "till-1-0001"}, json=basket)
+    assert resp.status_code == 201
+    assert "Idempotent-Replayed" not in resp.headers
+    assert stock(api, shop, shop.bread) == 3
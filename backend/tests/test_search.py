@@ -0,0 +1,51 @@
+# backend/tests/test_search.py
+"""Product search: every word is a prefix on name / SKU, best match first."""
+import pytest
+
+from conftest import API
+
+
+def search(api, shop, q, **params) -> list:
+    resp = api.get(f"{API}/products/search", params={"q": q, **params}, headers=shop.headers)
+    assert resp.status_code == 200, resp.text
+    return [product["name"] for product in resp.json()]
+
+
+@pytest.fixture(scope="module")
+def aisle(api, shop):
+    """More bread, created through the API so the search index follows."""
+    for name, sku in [("Whole Wheat Bread Family Pack", "WW-010"), ("Brown Bread", "BB-002"), ("Breadsticks", "BS-003")]:
+        resp = api.post(f"{API}/products/", headers=shop.headers, json={
+            "name": name, "sku": sku, "price": 30.0, "stock": 5, "category_id": None, "supplier_id": None,
+        })
+        assert resp.status_code in (200, 201), resp.text
+
+
+def test_prefix_words_match_name_and_sku(api, shop, aisle):
+    assert search(api, shop, "mil") == ["Milk"]
+    assert sorted(search(api, shop, "bre 00")) == ["Bread", "Breadsticks", "Brown Bread"]  # "00": SKU prefix
+    assert search(api, shop, "BROWN br") == ["Brown Bread"]
+    assert search(api, shop, "cheese") == []
+    for q in ('bread"', "bread AND OR", "*", "NEAR(bread)"):  # FTS syntax is never passed through
+        search(api, shop, q)
+
+
+def test_best_match_first(api, shop, aisle):
+    hits = search(api, shop, "bread")
+    assert hits[0] == "Bread"
+    assert hits[-1] == "Whole Wheat Bread Family Pack"  # longest name: lowest bm25
+    assert sorted(hits) == ["Bread", "Breadsticks", "Brown Bread", "Whole Wheat Bread Family Pack"]
+    assert search(api, shop, "bread", limit=2) == hits[:2]
+    assert search(api, shop, "bread", skip=2) == hits[2:]
+
+
+def test_index_follows_updates_and_deletes(api, shop, aisle):
+    resp = api.put(f"{API}/products/{shop.milk.id}", headers=shop.headers, json={
+        "name": "Oat Milk", "sku": "OM-001", "price": 60.0, "stock": 3, "category_id": None, "supplier_id": None,
+    })
+    assert resp.status_code == 200, resp.text
+    assert search(api, shop, "oat") == ["Oat Milk"]
+    assert search(api, shop, "mk") == []
+
+    assert api.delete(f"{API}/products/{shop.milk.id}", headers=shop.headers).status_code == 200
+    assert search(api, shop, "milk") == []
@@ -0,0 +1,62 @@
+# backend/tests/test_stock.py
+"""Live stock (on_hand) = products.stock snapshot + pending ledger movements + shard counters."""
+import models
+from conftest import API
+
+
+def stock(api, shop, product) -> int:
+    return api.get(f"{API}/products/{product.id}", headers=shop.headers).json()["stock"]
+
+
+def sell(api, shop, product, quantity):
+    return api.post(f"{API}/sales/", headers=shop.headers, json={
+        "employee_id": shop.ann.id, "items": [{"product_id": product.id, "quantity": quantity}],
+    })
+
+
+# ===== LEDGER =====
+def test_on_hand_follows_sales_returns_and_compaction(api, shop, db):
+    resp = sell(api, shop, shop.bread, 4)
+    assert resp.status_code == 201, resp.text
+    sale_id = resp.json()["id"]
+    assert stock(api, shop, shop.bread) == 6
+
+    assert api.delete(f"{API}/sales/{sale_id}", headers=shop.headers).status_code == 204
+    assert stock(api, shop, shop.bread) == 10
+    assert sell(api, shop, shop.bread, 3).status_code == 201
+    assert stock(api, shop, shop.bread) == 7
+
+    movements = api.get(f"{API}/products/{shop.bread.id}/stock-movements", headers=shop.headers).json()
+    assert [(m["kind"], m["quantity"], m["applied"]) for m in movements] == [
+        ("sale", -3, False), ("return", 4, False), ("sale", -4, False),
+    ]
+
+    resp = api.post(f"{API}/products/stock/compact", headers=shop.headers)
+    assert resp.json() == {"ok": True, "products_compacted": 1}
+    assert stock(api, shop, shop.bread) == 7
+    db.expire_all()
+    assert db.get(models.Product, shop.bread.id).stock == 7  # folded into the snapshot
+    movements = api.get(f"{API}/products/{shop.bread.id}/stock-movements", headers=shop.headers).json()
+    assert all(m["applied"] for m in movements)
+
+
+# ===== SHARDED COUNTERS =====
+def test_sharded_sale_borrows_across_shards(api, shop, db):
+    resp = api.put(f"{API}/products/{shop.bread.id}/stock-shards", params={"shards": 4}, headers=shop.headers)
+    assert resp.json() == {"ok": True, "stock_shards": 4, "stock": 7}  # counters hold 2/2/2/1
+
+    resp = sell(api, shop, shop.bread, 5)  # more than any one shard holds
+    assert resp.status_code == 201, resp.text
+    sale_id = resp.json()["id"]
+    assert stock(api, shop, shop.bread) == 2
+    counters = db.query(models.ProductStockShard.stock).filter(models.ProductStockShard.product_id == shop.bread.id)
+    assert sum(row.stock for row in counters) == 2
+
+    resp = sell(api, shop, shop.bread, 3)
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Not enough stock for product Bread (available: 2, requested: 3)"
+
+    assert api.delete(f"{API}/sales/{sale_id}", headers=shop.headers).status_code == 204
+    assert stock(api, shop, shop.bread) == 7
+    resp = api.put(f"{API}/products/{shop.bread.id}/stock-shards", params={"shards": 0}, headers=shop.headers)
+    assert resp.json() == {"ok": True, "stock_shards": 0, "stock": 7}
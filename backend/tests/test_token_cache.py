@@ -0,0 +1,52 @@
+# backend/tests/test_token_cache.py
+"""Verified-token cache: a token is checked once, bad or expired tokens are never served from it."""
+import time
+from datetime import timedelta
+
+import pytest
+
+from auth.jwt_handler import TokenCache, create_access_token, decode_access_token, token_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    token_cache.clear()
+
+
+def test_second_decode_is_a_cache_hit():
+    token = create_access_token({"sub": "7", "role": "employee"})
+    hits, misses = token_cache.hits, token_cache.misses
+
+    first = decode_access_token(token)
+    first["role"] = "employer"  # callers get their own copy
+    second = decode_access_token(token)
+    assert second["sub"] == "7" and second["role"] == "employee"
+    assert (token_cache.hits - hits, token_cache.misses - misses) == (1, 1)
+
+
+def test_rejected_tokens_are_not_cached():
+    token = create_access_token({"sub": "7"})
+    tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+    expired = create_access_token({"sub": "7"}, expires_delta=timedelta(seconds=-1))
+    for bad in (tampered, expired, "not-a-jwt"):
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                decode_access_token(bad)
+    assert token_cache.stats()["size"] == 0
+
+
+def test_entries_expire_and_the_size_is_bounded():
+    cache = TokenCache(maxsize=2)
+    cache.put("old", {"sub": "1", "exp": time.time() - 1})
+    assert cache.get("old") is None
+    assert cache.stats()["size"] == 0
+
+    for token in ("a", "b"):
+        cache.put(token, {"sub": token, "exp": time.time() + 60})
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", {"sub": "c", "exp": time.time() + 60})
+    assert [cache.get(token) is not None for token in ("a", "b", "c")] == [True, False, True]
+
+    disabled = TokenCache(maxsize=0)
+    disabled.put("a", {"sub": "a", "exp": time.time() + 60})
+    assert disabled.get("a") is None
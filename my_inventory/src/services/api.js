@@ -16,10 +16,42 @@ function setToken(token) {
 
 function clearToken() {
   localStorage.removeItem("token");
+  localStorage.removeItem("refresh_token");
+}
+
+function setRefreshToken(token) {
+  if (token) localStorage.setItem("refresh_token", token);
+}
+
+// Renew the access token with the (single-use) refresh token: no password,
+// no bcrypt on the server. Concurrent 401s share one refresh request.
+let refreshing = null;
+
+async function refreshAccessToken() {
+  const refreshToken = localStorage.getItem("refresh_token");
+  if (!refreshToken) return false;
+
+  refreshing ??= fetch(`${BASE_URL}/auth/refresh`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  })
+    .then(async (res) => {
+      if (!res.ok) return false;
+      const data = await res.json();
+      setToken(data.access_token);
+      setRefreshToken(data.refresh_token);
+      return true;
+    })
+    .catch(() => false)
+    .finally(() => {
+      refreshing = null;
+    });
+  return refreshing;
 }
 
 // ===== Central Fetch Wrapper =====
-async function apiFetch(endpoint, options = {}) {
+async function apiFetch(endpoint, options = {}, retried = false) {
   const token = getToken();
   const headers = {
     "Content-Type": "application/json",
@@ -34,6 +66,9 @@ async function apiFetch(endpoint, options = {}) {
     });
 
     if (res.status === 401) {
+      if (!retried && (await refreshAccessToken())) {
+        return apiFetch(endpoint, options, true);
+      }
       clearToken();
       throw new Error("Unauthorized, please login again");
     }
@@ -70,6 +105,7 @@ export async function loginApi(username, password) {
     const data = await res.json();
     if (data.access_token) {
       setToken(data.access_token);
+      setRefreshToken(data.refresh_token);
     }
     return data;
   } catch (err) {
@@ -126,6 +162,12 @@ export async function getProducts({ category = "all", search = "" } = {}) {
   return await apiFetch(`/products?category=${category}&search=${search}`);
 }
 
+// Ranked server-side search on name / SKU (no full catalogue download)
+export async function searchProducts(q, { skip = 0, limit = 20 } = {}) {
+  const params = new URLSearchParams({ q, skip, limit });
+  return await apiFetch(`/products/search?${params}`);
+}
+
 export async function createProduct(payload) {
   return await apiFetch("/products", {
     method: "POST",
@@ -214,6 +256,18 @@ export async function getDayHistory() {
 }
 /* ================== AUTH HELPERS ================== */
 export function logoutApi() {
+  // Revoke the tokens server-side too (fire and forget: local logout is immediate)
+  const token = getToken();
+  if (token) {
+    fetch(`${BASE_URL}/auth/logout`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        Authorization: `Bearer ${token}`,
+      },
+      body: JSON.stringify({ refresh_token: localStorage.getItem("refresh_token") }),
+    }).catch(() => {});
+  }
   clearToken();
 }
 